@@ -10,6 +10,80 @@ class Settings:
     ALGORITHM = os.environ.get("ALGORITHM")
     TOKEN_EXPIRY = os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES")
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+    # OpenAI calls: base URL (point at a stub server in tests), model, seconds
+    # before falling back, calls in flight per worker, calls per user per
+    # quota window (seconds), and how long cached responses are reused
+    OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
+    OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+    OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", 20))
+    OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", 4))
+    OPENAI_USER_QUOTA = int(os.environ.get("OPENAI_USER_QUOTA", 30))
+    OPENAI_QUOTA_WINDOW = float(os.environ.get("OPENAI_QUOTA_WINDOW", 3600))
+    OPENAI_CACHE_TTL = int(os.environ.get("OPENAI_CACHE_TTL", 7 * 24 * 3600))
+    # Number of verified tokens kept in memory per worker (0 disables the cache)
+    TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+
+    # Connection pool sizing and lifecycle (timeouts and lifetimes in seconds)
+    DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 2))
+    DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+    DB_POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", 1800))
+    DB_POOL_MAX_IDLE = float(os.environ.get("DB_POOL_MAX_IDLE", 300))
+    # Prepare registered statements on each connection; turn off behind a
+    # pooler that does not keep server sessions (e.g. PgBouncer transaction mode)
+    DB_PREPARE_STATEMENTS = os.environ.get("DB_PREPARE_STATEMENTS", "true").lower() == "true"
+    # Read replicas (comma-separated DSNs) serving GET requests. Replicas more
+    # than REPLICA_MAX_LAG seconds behind, or failing the health check run
+    # every REPLICA_CHECK_INTERVAL seconds, are skipped. After a write, the
+    # client reads from the primary for REPLICA_STICKY_SECONDS, which should
+    # exceed the lag limit plus the check interval.
+    REPLICA_URLS = [
+        url.strip() for url in os.environ.get("REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    REPLICA_MAX_LAG = float(os.environ.get("REPLICA_MAX_LAG", 2))
+    REPLICA_CHECK_INTERVAL = float(os.environ.get("REPLICA_CHECK_INTERVAL", 2))
+    REPLICA_CHECK_TIMEOUT = float(os.environ.get("REPLICA_CHECK_TIMEOUT", 1))
+    REPLICA_STICKY_SECONDS = float(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+    # Seconds role insights are served from memory (and by client caches)
+    ROLE_INSIGHTS_TTL = int(os.environ.get("ROLE_INSIGHTS_TTL", 300))
+    # Rows fetched per round trip when streaming exports
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+    # Largest number of rows, and of body bytes, accepted by one bulk import request
+    IMPORT_MAX_ROWS = int(os.environ.get("IMPORT_MAX_ROWS", 10000))
+    IMPORT_MAX_BYTES = int(os.environ.get("IMPORT_MAX_BYTES", 10 * 1024 * 1024))
+    # Largest number of operations accepted by one batch request
+    BATCH_MAX_OPERATIONS = int(os.environ.get("BATCH_MAX_OPERATIONS", 500))
+    # Responses smaller than this many bytes are sent uncompressed; brotli
+    # is used when installed and accepted by the client, gzip otherwise
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", 6))
+    BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", 5))
+
+    # Password hashing: worker threads, queue limit, and the bcrypt cost is
+    # calibrated at startup to the target latency (never below the floor)
+    HASH_WORKERS = int(os.environ.get("HASH_WORKERS", os.cpu_count() or 1))
+    HASH_MAX_PENDING = int(os.environ.get("HASH_MAX_PENDING", 64))
+    HASH_TARGET_MS = float(os.environ.get("HASH_TARGET_MS", 250))
+    HASH_MIN_ROUNDS = int(os.environ.get("HASH_MIN_ROUNDS", 10))
+
+    # Skill extraction from job descriptions: extractor backend ("keyword" or
+    # "llm"), worker tasks per process (0 runs none), seconds between polls
+    # when idle, attempts before a job fails, base retry delay (doubled per
+    # attempt), and seconds before a running job's worker is presumed dead
+    SKILL_EXTRACTOR = os.environ.get("SKILL_EXTRACTOR", "keyword")
+    SKILL_WORKERS = int(os.environ.get("SKILL_WORKERS", 2))
+    SKILL_JOB_POLL_INTERVAL = float(os.environ.get("SKILL_JOB_POLL_INTERVAL", 1))
+    SKILL_JOB_MAX_ATTEMPTS = int(os.environ.get("SKILL_JOB_MAX_ATTEMPTS", 5))
+    SKILL_JOB_BACKOFF = float(os.environ.get("SKILL_JOB_BACKOFF", 5))
+    SKILL_JOB_LEASE = float(os.environ.get("SKILL_JOB_LEASE", 300))
+
+    # Change stream: seconds between keep-alive comments, and events buffered
+    # per connected client before it is told to resync instead
+    CHANGE_STREAM_HEARTBEAT = float(os.environ.get("CHANGE_STREAM_HEARTBEAT", 15))
+    CHANGE_STREAM_QUEUE_SIZE = int(os.environ.get("CHANGE_STREAM_QUEUE_SIZE", 100))
+
+    # Statements slower than this many milliseconds are logged (0 disables)
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
 
 
 settings = Settings()
@@ -1,11 +1,307 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import psycopg
+from psycopg import AsyncCursor
+from psycopg.conninfo import conninfo_to_dict
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from app.config import settings
-from contextlib import closing
-
-def get_db_connection():
-    """Helper function to create database connection"""
-    return closing(psycopg2.connect(
-        settings.DATABASE_URL,
-        cursor_factory=RealDictCursor,
-    ))
\ No newline at end of file
+from app.queries.replicas import GET_REPLICATION_LAG
+from app.utils.metrics import record_query
+from app.utils.statements import find_statement, get_statements, prepared_max
+
+replica_logger = logging.getLogger("app.replicas")
+
+# Shared async pool, created and closed by the app lifespan in main.py
+pool: Optional[AsyncConnectionPool] = None
+
+
+@dataclass
+class Replica:
+    """A read replica's pool and what its last health check found"""
+
+    name: str
+    pool: AsyncConnectionPool
+    healthy: bool = False
+    lag: Optional[float] = None
+
+
+# Read replicas (REPLICA_URLS), opened and closed with the primary pool
+replicas: List[Replica] = []
+_replica_turn = itertools.count()
+_monitor_task: Optional[asyncio.Task] = None
+
+# Whether connections borrowed in the current context may come from a
+# replica. Set per request by ReadRoutingMiddleware, so background tasks and
+# anything outside a request use the primary.
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+def set_read_routing(allowed: bool) -> Token:
+    return _read_from_replica.set(allowed)
+
+
+def reset_read_routing(token: Token):
+    _read_from_replica.reset(token)
+
+
+# Callables told about every statement the app sends (e.g. tests counting
+# round trips per endpoint)
+_query_listeners: List[Callable[[str], None]] = []
+
+
+def add_query_listener(listener: Callable[[str], None]):
+    _query_listeners.append(listener)
+
+
+def remove_query_listener(listener: Callable[[str], None]):
+    _query_listeners.remove(listener)
+
+
+class InstrumentedCursor(AsyncCursor):
+    """
+    Cursor that reports each statement to the query listeners before sending
+    it, and records its latency, rows and errors in the query metrics.
+
+    Registered statements (app/utils/statements.py) are prepared on their
+    first run on each connection, so later runs skip parsing and planning;
+    those marked REPLAN are planned afresh every time.
+    """
+
+    def _notify(self, query):
+        if not _query_listeners:
+            return
+        if isinstance(query, bytes):
+            query = query.decode()
+        elif not isinstance(query, str):
+            query = query.as_string(self)
+        for listener in _query_listeners:
+            listener(query)
+
+    async def execute(self, query, params=None, *, prepare=None, **kwargs):
+        self._notify(query)
+        if prepare is None:
+            statement = find_statement(query)
+            if statement is not None and statement.replan:
+                prepare = False
+            elif settings.DB_PREPARE_STATEMENTS and statement is not None and statement.preparable:
+                prepare = True
+        start = time.perf_counter()
+        try:
+            result = await super().execute(query, params, prepare=prepare, **kwargs)
+        except Exception:
+            record_query(query, time.perf_counter() - start, error=True)
+            raise
+        record_query(query, time.perf_counter() - start, self.rowcount)
+        return result
+
+    async def executemany(self, query, params_seq, **kwargs):
+        self._notify(query)
+        start = time.perf_counter()
+        try:
+            result = await super().executemany(query, params_seq, **kwargs)
+        except Exception:
+            record_query(query, time.perf_counter() - start, error=True)
+            raise
+        record_query(query, time.perf_counter() - start, self.rowcount)
+        return result
+
+    def copy(self, statement, params=None, **kwargs):
+        self._notify(statement)
+        return super().copy(statement, params, **kwargs)
+
+
+async def _check_connection(conn):
+    """Checkout probe; sent on a plain cursor so listeners only see app queries"""
+    await conn.set_autocommit(True)
+    try:
+        await AsyncCursor(conn).execute("SELECT 1")
+    finally:
+        await conn.set_autocommit(False)
+
+
+async def _configure_connection(conn):
+    """Make room for every registered statement in the connection's prepared cache"""
+    conn.prepared_max = prepared_max()
+    if not settings.DB_PREPARE_STATEMENTS:
+        conn.prepare_threshold = None
+
+
+def _make_pool(conninfo: str, name: str) -> AsyncConnectionPool:
+    return AsyncConnectionPool(
+        conninfo,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        timeout=settings.DB_POOL_TIMEOUT,
+        max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+        max_idle=settings.DB_POOL_MAX_IDLE,
+        configure=_configure_connection,
+        check=_check_connection,
+        kwargs={"row_factory": dict_row, "cursor_factory": InstrumentedCursor},
+        name=name,
+        open=False,
+    )
+
+
+def _replica_name(conninfo: str) -> str:
+    params = conninfo_to_dict(conninfo)
+    return f"{params.get('host', 'localhost')}:{params.get('port', 5432)}"
+
+
+async def open_pool():
+    """
+    Create the primary and replica pools and open them; connections are
+    established in the background, and replicas join the rotation once their
+    first health check passes
+    """
+    global pool, _monitor_task
+    # Collected now so a statement defined twice fails startup
+    get_statements()
+    pool = _make_pool(settings.DATABASE_URL or "", "jobtracker")
+    await pool.open()
+    for number, conninfo in enumerate(settings.REPLICA_URLS, 1):
+        replica = Replica(_replica_name(conninfo), _make_pool(conninfo, f"jobtracker-replica-{number}"))
+        await replica.pool.open()
+        replicas.append(replica)
+    if replicas:
+        _monitor_task = asyncio.create_task(_monitor_replicas(), name="replica-monitor")
+
+
+async def close_pool():
+    """Close the pools and all of their connections"""
+    global pool, _monitor_task
+    if _monitor_task is not None:
+        _monitor_task.cancel()
+        await asyncio.gather(_monitor_task, return_exceptions=True)
+        _monitor_task = None
+    for replica in replicas:
+        await replica.pool.close()
+    replicas.clear()
+    if pool is not None:
+        await pool.close()
+        pool = None
+
+
+def _set_health(replica: Replica, healthy: bool, lag: Optional[float]):
+    if healthy != replica.healthy:
+        if healthy:
+            replica_logger.info("Replica %s back in rotation (lag %.2fs)", replica.name, lag)
+        else:
+            replica_logger.warning("Replica %s out of rotation (lag %s)", replica.name, lag)
+    replica.healthy, replica.lag = healthy, lag
+
+
+async def check_replica(replica: Replica):
+    """Measure a replica's lag; it stays in rotation only if reachable and close enough"""
+    try:
+        async with replica.pool.connection(timeout=settings.REPLICA_CHECK_TIMEOUT) as conn:
+            # A plain cursor, so listeners and query metrics only see app queries
+            cur = AsyncCursor(conn)
+            await asyncio.wait_for(cur.execute(GET_REPLICATION_LAG), settings.REPLICA_CHECK_TIMEOUT)
+            lag = (await cur.fetchone())["lag"]
+    except (psycopg.Error, asyncio.TimeoutError):
+        _set_health(replica, False, None)
+        return
+    _set_health(replica, lag is not None and lag <= settings.REPLICA_MAX_LAG, lag)
+
+
+async def _monitor_replicas():
+    while True:
+        await asyncio.gather(*(check_replica(replica) for replica in replicas))
+        await asyncio.sleep(settings.REPLICA_CHECK_INTERVAL)
+
+
+def _pick_replica() -> Optional[Replica]:
+    """Round-robin over the replicas in rotation"""
+    healthy = [replica for replica in replicas if replica.healthy]
+    if not healthy:
+        return None
+    return healthy[next(_replica_turn) % len(healthy)]
+
+
+@asynccontextmanager
+async def _replica_connection(replica: Replica):
+    try:
+        conn = await replica.pool.getconn(timeout=settings.REPLICA_CHECK_TIMEOUT)
+    except psycopg.OperationalError:
+        # Out of rotation until a health check passes again
+        _set_health(replica, False, None)
+        async with get_pool().connection() as conn:
+            yield conn
+        return
+    try:
+        async with conn:
+            yield conn
+    finally:
+        await replica.pool.putconn(conn)
+
+
+def get_pool() -> AsyncConnectionPool:
+    """Return the open pool, failing loudly if the app lifespan has not run"""
+    if pool is None:
+        raise RuntimeError("Database pool is not open")
+    return pool
+
+
+def get_db_connection(primary: bool = False):
+    """
+    Borrow a connection from the pool.
+
+    Used as an async context manager: the connection is checked (and replaced
+    if it is broken) on checkout, and handed back to the pool on exit, with any
+    open transaction rolled back if the block raised.
+
+    Within a request that may read from replicas (see ReadRoutingMiddleware)
+    the connection comes from a healthy replica when there is one; pass
+    `primary=True` for code that writes regardless of the request method.
+    """
+    if not primary and _read_from_replica.get():
+        replica = _pick_replica()
+        if replica is not None:
+            return _replica_connection(replica)
+    return get_pool().connection()
+
+
+def get_pool_stats() -> dict:
+    """Return a snapshot of pool usage for sizing the pool"""
+    stats = get_pool().get_stats()
+    size = stats.get("pool_size", 0)
+    idle = stats.get("pool_available", 0)
+    queued = stats.get("requests_queued", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "min_size": stats.get("pool_min", settings.DB_POOL_MIN_SIZE),
+        "max_size": stats.get("pool_max", settings.DB_POOL_MAX_SIZE),
+        "size": size,
+        "in_use": size - idle,
+        "idle": idle,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "requests_queued": queued,
+        "requests_timed_out": stats.get("requests_errors", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_avg": round(wait_ms / queued, 2) if queued else 0.0,
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "bad_connections_returned": stats.get("returns_bad", 0),
+        "replicas": [_replica_stats(replica) for replica in replicas],
+    }
+
+
+def _replica_stats(replica: Replica) -> dict:
+    stats = replica.pool.get_stats()
+    size = stats.get("pool_size", 0)
+    return {
+        "name": replica.name,
+        "healthy": replica.healthy,
+        "lag_seconds": replica.lag,
+        "size": size,
+        "in_use": size - stats.get("pool_available", 0),
+        "requests": stats.get("requests_num", 0),
+    }
@@ -2,15 +2,30 @@
 Job Tracker API Backend Service
 This module implements the REST API endpoints for the Job Tracker application using FastAPI.
 """
-from app.routers import auth, contacts, applications
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from app.routers import auth, contacts, applications, skills, analytics, search, batch, changes
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import date, datetime
 # import psycopg2
 # from psycopg2.extras import RealDictCursor
-from app.database import get_db_connection
+from app.database import get_db_connection, get_pool_stats, open_pool, close_pool
+from app.config import settings
+from app.openai.connection import close_client as close_openai_client
+from app.utils.caching import ResponseCache, etag_matches
+from app.utils.change_stream import change_stream
+from app.utils.compression import CompressionMiddleware
+from app.utils.hashing import calibrate_work_factor_async
+from app.utils.jwt_manager import get_current_user, get_token_cache_stats
+from app.utils.metrics import MetricsMiddleware, render_cache_stats, render_metrics
+from app.utils.read_routing import ReadRoutingMiddleware
+from app.utils.skill_jobs import SkillJobWorker
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.queries.role_insights import GET_ROLE_INSIGHTS
+from app.queries.timelines import GET_USER_TIMELINE_FEED_BEFORE, GET_USER_TIMELINE_FEED_SINCE
 
 
 class JobApplication(BaseModel):
@@ -66,8 +81,29 @@ class RoleInsight(BaseModel):
     top_companies: List[str]
 
 
+_role_insights_adapter = TypeAdapter(List[RoleInsight])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the database connection pool, calibrate password hashing, start
+    the skill extraction workers and listen for change events on startup
+    """
+    await open_pool()
+    await calibrate_work_factor_async()
+    skill_workers = SkillJobWorker()
+    skill_workers.start()
+    await change_stream.start()
+    yield
+    await change_stream.stop()
+    await skill_workers.stop()
+    await close_openai_client()
+    await close_pool()
+
+
 # Initialize FastAPI application
-app = FastAPI(title="Job Tracker API")
+app = FastAPI(title="Job Tracker API", lifespan=lifespan)
 
 # Configure CORS middleware
 app.add_middleware(
@@ -76,8 +112,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Poll-Cursor", "ETag"],
+)
+
+# Compress large responses (brotli when available, otherwise gzip)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
 )
 
+# GET requests read from replicas unless the client has just written
+app.add_middleware(ReadRoutingMiddleware)
+
+# Outermost, so recorded latency includes compression
+app.add_middleware(MetricsMiddleware)
+
 
 # def get_db_connection():
 #     """Helper function to create database connection"""
@@ -88,6 +139,11 @@ app.add_middleware(
 app.include_router(auth.router)
 app.include_router(contacts.router)
 app.include_router(applications.router)
+app.include_router(skills.router)
+app.include_router(analytics.router)
+app.include_router(search.router)
+app.include_router(batch.router)
+app.include_router(changes.router)
 
 
 @app.get("/")
@@ -96,38 +152,107 @@ async def read_root():
     return {"status": "online", "message": "Welcome to the Job Tracker API"}
 
 
+@app.get("/api/db/pool")
+async def get_db_pool_stats(current_user: str = Depends(get_current_user)):
+    """Report connection pool usage (in use, idle, wait time) to signed-in users"""
+    return get_pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(current_user: str = Depends(get_current_user)):
+    """Request, query and token cache metrics in the Prometheus text format, for signed-in users"""
+    body = render_metrics() + render_cache_stats("token_cache", get_token_cache_stats())
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/timelines", response_model=List[TimelineEntry])
-async def get_timelines():
-    """Retrieve all timeline entries"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+async def get_timelines(
+    limit: int = Query(100, ge=1, le=500),
+    since: Optional[str] = None,
+    before: Optional[str] = None,
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Retrieve the user's timeline activity across all applications.
 
-            cur.execute(
-                """
-                SELECT id, application_id, status, date, notes 
-                FROM application_timeline 
-                ORDER BY date DESC
-            """
-            )
-            timelines = cur.fetchall()
+    Without a cursor the newest entries come first; pass X-Next-Cursor as
+    `before` to page back. To poll for new activity, pass X-Poll-Cursor as
+    `since`: entries after it are returned oldest first.
+    """
+    if since and before:
+        raise HTTPException(status_code=400, detail="Use either since or before, not both")
+    cursor_date = cursor_id = None
+    if since or before:
+        cursor_date, cursor_id = decode_cursor(since or before, 2)
+        try:
+            cursor_date, cursor_id = datetime.fromisoformat(cursor_date), int(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return timelines
+    params = {
+        "user_email": current_user,
+        "cursor_date": cursor_date,
+        "cursor_id": cursor_id,
+        "limit": limit + 1,
+    }
+    query = GET_USER_TIMELINE_FEED_SINCE if since else GET_USER_TIMELINE_FEED_BEFORE
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
+            await cur.execute(query, params)
+            timelines = await cur.fetchall()
+
+    headers = {}
+    has_more = len(timelines) > limit
+    timelines = timelines[:limit]
+    if has_more:
+        last = timelines[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last["date"], last["id"])
+    if timelines:
+        newest = timelines[-1] if since else timelines[0]
+        headers["X-Poll-Cursor"] = encode_cursor(newest["date"], newest["id"])
+    elif since:
+        headers["X-Poll-Cursor"] = since
+
+    # Rows already match TimelineEntry, so skip re-validation
+    return ORJSONResponse(timelines, headers=headers)
+
+
+role_insights_cache = ResponseCache(ttl=settings.ROLE_INSIGHTS_TTL)
+
+
+def invalidate_role_insights(event: Optional[dict] = None):
+    """Drop the cached role insights; a trigger announces every change to them"""
+    role_insights_cache.invalidate()
+
+
+change_stream.add_handler("role_insights", invalidate_role_insights)
+
+
+async def _load_role_insights() -> bytes:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            await cur.execute(GET_ROLE_INSIGHTS)
+            insights = await cur.fetchall()
+
+    return _role_insights_adapter.dump_json(_role_insights_adapter.validate_python(insights))
 
 
 @app.get("/api/role-insights", response_model=List[RoleInsight])
-async def get_role_insights():
-    """Retrieve all role insights"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-
-            cur.execute(
-                """
-                SELECT role_title, common_skills, average_salary, 
-                    demand_trend, top_companies 
-                FROM role_insights
-            """
-            )
-            insights = cur.fetchall()
-
-    return insights
+async def get_role_insights(request: Request):
+    """
+    Retrieve all role insights.
+
+    The serialized response is cached in memory and carries an ETag, so
+    clients revalidating with If-None-Match get a 304 without a query.
+    """
+    cached = await role_insights_cache.get_or_load(_load_role_insights)
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={settings.ROLE_INSIGHTS_TTL}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(cached.body, media_type="application/json", headers=headers)
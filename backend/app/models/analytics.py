@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+
+class StatusCount(BaseModel):
+    """
+    Number of applications currently in a status
+    """
+    status: str
+    count: int
+
+
+class FunnelStage(BaseModel):
+    """
+    Applications that reached a pipeline stage, and the share of those that
+    reached the previous stage which made it this far
+    """
+    stage: str
+    reached: int
+    conversion_rate: Optional[float] = None
+
+
+class StageDuration(BaseModel):
+    """
+    Median whole hours spent in a status before the next timeline entry
+    """
+    status: str
+    transitions: int
+    median_hours: int
+
+
+class WeeklyVolume(BaseModel):
+    """
+    Applications made in the week starting on `week` (a Monday)
+    """
+    week: date
+    count: int
+
+
+class PipelineAnalytics(BaseModel):
+    """
+    Response model for the pipeline analytics dashboard
+    """
+    total: int
+    status_counts: List[StatusCount]
+    funnel: List[FunnelStage]
+    time_in_stage: List[StageDuration]
+    weekly_volume: List[WeeklyVolume]
@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import date
 from typing import List, Optional
+from app.models.contacts import NetworkContactResponse
+from app.utils.skills import normalize_skills
 
 class JobApplicationBase(BaseModel):
     """
@@ -14,12 +16,26 @@ class JobApplicationBase(BaseModel):
     matched_skills: Optional[List[str]] = []
     required_skills: Optional[List[str]] = []
 
+    @field_validator("matched_skills", "required_skills")
+    @classmethod
+    def canonical_skills(cls, skills: Optional[List[str]]) -> List[str]:
+        """Store skills under their canonical names (e.g. "NodeJS" -> "Node.js")"""
+        return normalize_skills(skills)
+
 
 class JobApplicationCreate(JobApplicationBase):
     """
     Model for creating a new job application.
+
+    A pasted job description is not stored on the application; its required
+    skills are extracted in the background and added to required_skills.
     """
-    pass
+    job_description: Optional[str] = None
+
+    @field_validator("job_description")
+    @classmethod
+    def blank_to_none(cls, description: Optional[str]) -> Optional[str]:
+        return description if description and description.strip() else None
 
 
 class JobApplicationResponse(JobApplicationBase):
@@ -27,3 +43,24 @@ class JobApplicationResponse(JobApplicationBase):
     Response model for job applications (includes id).
     """
     id: int
+
+
+class JobApplicationCreateResponse(JobApplicationResponse):
+    """
+    Response model for a created job application, with the id of its skill
+    extraction job when a job description was given.
+    """
+    skill_job_id: Optional[int] = None
+
+
+class JobApplicationWithContacts(BaseModel):
+    """
+    A job application with the user's contacts at the same company.
+    """
+    id: int
+    company: str
+    position: str
+    status: str
+    date: date
+    priority: str
+    contacts: List[NetworkContactResponse]
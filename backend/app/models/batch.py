@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Any, List, Literal, Optional
+
+
+class BatchOperation(BaseModel):
+    """
+    One operation in a batch.
+
+    `id` names the application, timeline entry or contact to update or
+    delete; timeline operations also need `application_id`. `data` is the
+    body the single-item endpoint would take.
+    """
+    op: Literal["create", "update", "delete"]
+    resource: Literal["application", "timeline", "contact"]
+    id: Optional[int] = None
+    application_id: Optional[int] = None
+    data: Optional[dict] = None
+
+
+class BatchRequest(BaseModel):
+    """
+    Operations to run in order. In "atomic" mode the first failure rolls back
+    every operation; in "best_effort" mode only the failed ones are undone.
+    """
+    mode: Literal["atomic", "best_effort"] = "atomic"
+    operations: List[BatchOperation]
+
+
+class BatchResult(BaseModel):
+    """
+    Outcome of one operation, with the status the single-item endpoint
+    would have returned. 424 marks operations undone or skipped because
+    another operation in an atomic batch failed.
+    """
+    index: int
+    status: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    committed: bool
+    results: List[BatchResult]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class SearchResult(BaseModel):
+    """
+    One match from a search: an application, a timeline entry or a contact
+    """
+    kind: str
+    id: int
+    application_id: Optional[int]
+    title: str
+    detail: Optional[str]
+    rank: float
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class SkillCount(BaseModel):
+    """
+    Number of a user's applications that require a skill
+    """
+    skill: str
+    application_count: int
+    matched: bool
+
+
+class SkillJobResponse(BaseModel):
+    """
+    Status of a skill extraction job for a job application
+    """
+    id: int
+    application_id: int
+    status: str
+    attempts: int
+    extracted_skills: Optional[List[str]]
+    last_error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import List
+from app.utils.skills import normalize_skills
 
 
 class RegisterRequest(BaseModel):
@@ -27,3 +28,9 @@ class UserSkills(BaseModel):
     Pydantic model for updating user skills
     """
     skills: List[str]
+
+    @field_validator("skills")
+    @classmethod
+    def canonical_skills(cls, skills: List[str]) -> List[str]:
+        """Store skills under their canonical names (e.g. "NodeJS" -> "Node.js")"""
+        return normalize_skills(skills)
@@ -1,16 +1,184 @@
-from openai import OpenAI
+"""
+OpenAI access for route handlers and background jobs.
+
+Every call goes through complete(), which never blocks the event loop and:
+
+- answers from ai_response_cache when the same model and normalized prompt
+  were answered within OPENAI_CACHE_TTL (a failing cache read or write is
+  logged and the call goes upstream as usual)
+- shares one upstream call between identical prompts already in flight
+- holds a per-worker semaphore, so at most OPENAI_MAX_CONCURRENCY calls run
+  at once
+- charges each user's quota (OPENAI_USER_QUOTA calls per OPENAI_QUOTA_WINDOW)
+  for prompts that miss the cache and start an upstream call, with a 429
+  once it is used up
+- gives up after OPENAI_TIMEOUT seconds, returning the caller's fallback
+  (or a 503 without one)
+
+Point OPENAI_BASE_URL at a local stub server to run without the real API.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+from fastapi import HTTPException, status
+from openai import AsyncOpenAI, OpenAIError
 from app.config import settings
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-def get_response():
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {
-                "role": "user",
-                "content": "Write a haiku about recursion in programming."
-            }
-        ]
-    )
-    print(completion.choices[0].message)
+from app.database import get_db_connection
+from app.queries.ai import GET_CACHED_AI_RESPONSE, UPSERT_AI_RESPONSE
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+
+logger = logging.getLogger("app.openai")
+
+_client: Optional[AsyncOpenAI] = None
+_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+# prompt hash -> the upstream call answering it
+_in_flight: Dict[str, asyncio.Future] = {}
+# user -> monotonic times of their recent upstream-bound prompts
+_usage: Dict[str, Deque[float]] = defaultdict(deque)
+
+
+def get_client() -> AsyncOpenAI:
+    """The shared async client, created on first use"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT,
+            # The overall deadline below bounds retries too
+            max_retries=1,
+        )
+    return _client
+
+
+async def close_client():
+    """Close the client's connections, e.g. on app shutdown"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+    return semaphore
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so trivially different prompts share a cache entry"""
+    return " ".join(prompt.split())
+
+
+def prompt_hash(prompt: str, system: str, model: str) -> str:
+    key = json.dumps([model, normalize_prompt(system), normalize_prompt(prompt)])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _charge_quota(user: str):
+    """Count one upstream-bound prompt against the user's quota, or raise 429"""
+    now = time.monotonic()
+    recent = _usage[user]
+    while recent and recent[0] <= now - settings.OPENAI_QUOTA_WINDOW:
+        recent.popleft()
+    if len(recent) >= settings.OPENAI_USER_QUOTA:
+        retry_after = int(recent[0] + settings.OPENAI_QUOTA_WINDOW - now) + 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="AI request quota exceeded, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+    recent.append(now)
+
+
+def reset_quotas():
+    _usage.clear()
+
+
+async def _get_cached(key: str) -> Optional[str]:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(GET_CACHED_AI_RESPONSE, (key, settings.OPENAI_CACHE_TTL))
+            row = await cur.fetchone()
+    return row["response"] if row else None
+
+
+async def _store(key: str, model: str, response: str):
+    # Callers may be serving a GET, whose connections come from replicas
+    async with get_db_connection(primary=True) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(UPSERT_AI_RESPONSE, (key, model, response))
+            await conn.commit()
+
+
+async def _call_upstream(key: str, prompt: str, system: str, model: str) -> str:
+    async with _get_semaphore():
+        completion = await asyncio.wait_for(
+            get_client().chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
+                ],
+            ),
+            timeout=settings.OPENAI_TIMEOUT,
+        )
+    response = completion.choices[0].message.content or ""
+    try:
+        await _store(key, model, response)
+    except Exception:
+        # The answer is still good; it just won't be reused
+        logger.exception("Could not cache AI response %s", key)
+    return response
+
+
+async def complete(
+    prompt: str,
+    user: str,
+    system: str = DEFAULT_SYSTEM_PROMPT,
+    model: Optional[str] = None,
+    fallback: Optional[str] = None,
+) -> str:
+    """
+    Return the model's answer to `prompt` on behalf of `user`.
+
+    If the call fails or times out, `fallback` is returned (and not cached);
+    without a fallback the caller gets a 503.
+    """
+    model = model or settings.OPENAI_MODEL
+    key = prompt_hash(prompt, system, model)
+
+    try:
+        cached = await _get_cached(key)
+    except Exception:
+        # Without the cache the call can still be answered upstream
+        logger.exception("Could not read cached AI response %s", key)
+        cached = None
+    if cached is not None:
+        return cached
+
+    call = _in_flight.get(key)
+    if call is None:
+        # Only the caller that starts an upstream call is charged for it
+        _charge_quota(user)
+        call = asyncio.ensure_future(_call_upstream(key, prompt, system, model))
+        _in_flight[key] = call
+        call.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    try:
+        # Shielded so one caller disconnecting does not cancel the others' call
+        return await asyncio.shield(call)
+    except (asyncio.TimeoutError, OpenAIError):
+        if fallback is not None:
+            return fallback
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is unavailable, try again later",
+        )
@@ -0,0 +1,11 @@
+GET_CACHED_AI_RESPONSE = """
+SELECT response FROM ai_response_cache
+WHERE prompt_hash = %s AND created_at > NOW() - make_interval(secs => %s);
+"""
+
+UPSERT_AI_RESPONSE = """
+INSERT INTO ai_response_cache (prompt_hash, model, response)
+VALUES (%s, %s, %s)
+ON CONFLICT (prompt_hash)
+DO UPDATE SET model = EXCLUDED.model, response = EXCLUDED.response, created_at = NOW();
+"""
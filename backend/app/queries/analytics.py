@@ -0,0 +1,35 @@
+# Everything the analytics endpoint needs in one round trip, read from the
+# trigger-maintained pipeline_* tables rather than scanning applications.
+# Medians come from the hour histogram: the first bucket where the running
+# count reaches half the transitions.
+GET_PIPELINE_ANALYTICS = """
+SELECT
+    (SELECT COALESCE(json_agg(json_build_object('status', status, 'count', application_count)
+                              ORDER BY application_count DESC, status), '[]')
+     FROM pipeline_status_counts WHERE user_email = %(user_email)s) AS status_counts,
+    (SELECT COALESCE(json_agg(json_build_object('stage', stage, 'count', application_count)
+                              ORDER BY stage), '[]')
+     FROM pipeline_stage_reach WHERE user_email = %(user_email)s) AS stage_reach,
+    (SELECT COALESCE(json_agg(json_build_object('status', status, 'transitions', total,
+                                                'median_hours', median_hours)
+                              ORDER BY status), '[]')
+     FROM (
+         SELECT status, total, min(hours) AS median_hours
+         FROM (
+             SELECT status, hours,
+                    sum(transitions) OVER (PARTITION BY status ORDER BY hours) AS running,
+                    sum(transitions) OVER (PARTITION BY status) AS total
+             FROM pipeline_stage_durations WHERE user_email = %(user_email)s
+         ) d
+         WHERE running * 2 >= total
+         GROUP BY status, total
+     ) m) AS time_in_stage,
+    (SELECT COALESCE(json_agg(json_build_object('week', week, 'count', application_count)
+                              ORDER BY week), '[]')
+     FROM (
+         SELECT week, application_count FROM pipeline_weekly_volume
+         WHERE user_email = %(user_email)s
+         ORDER BY week DESC
+         LIMIT %(weeks)s
+     ) w) AS weekly_volume;
+"""
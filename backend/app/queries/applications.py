@@ -2,29 +2,182 @@ GET_JOB_APPLICATIONS = """
 SELECT * FROM job_applications WHERE user_email = %s
 """
 
+# Keyset pages over (date, id). Filters and the cursor are optional: pass None
+# to disable them. Backed by the (user_email, ..., date DESC, id DESC) indexes,
+# which a generic plan cannot choose between, so these are never prepared.
+# The page queries select exactly the response columns, already in response
+# shape, so list endpoints can encode rows without re-validating them
+GET_JOB_APPLICATIONS_PAGE_DESC = """
+/* replan */
+SELECT id, company, position, status, date, priority,
+       COALESCE(matched_skills, '{}') AS matched_skills,
+       COALESCE(required_skills, '{}') AS required_skills
+FROM job_applications
+WHERE user_email = %(user_email)s
+  AND (%(status)s::text IS NULL OR status = %(status)s)
+  AND (%(priority)s::text IS NULL OR priority = %(priority)s)
+  AND (%(company)s::text IS NULL OR lower(company) = lower(%(company)s))
+  AND (%(date_from)s::date IS NULL OR date >= %(date_from)s)
+  AND (%(date_to)s::date IS NULL OR date <= %(date_to)s)
+  AND (%(cursor_date)s::date IS NULL OR (date, id) < (%(cursor_date)s, %(cursor_id)s))
+ORDER BY date DESC, id DESC
+LIMIT %(limit)s
+"""
+
+GET_JOB_APPLICATIONS_PAGE_ASC = """
+/* replan */
+SELECT id, company, position, status, date, priority,
+       COALESCE(matched_skills, '{}') AS matched_skills,
+       COALESCE(required_skills, '{}') AS required_skills
+FROM job_applications
+WHERE user_email = %(user_email)s
+  AND (%(status)s::text IS NULL OR status = %(status)s)
+  AND (%(priority)s::text IS NULL OR priority = %(priority)s)
+  AND (%(company)s::text IS NULL OR lower(company) = lower(%(company)s))
+  AND (%(date_from)s::date IS NULL OR date >= %(date_from)s)
+  AND (%(date_to)s::date IS NULL OR date <= %(date_to)s)
+  AND (%(cursor_date)s::date IS NULL OR (date, id) > (%(cursor_date)s, %(cursor_id)s))
+ORDER BY date ASC, id ASC
+LIMIT %(limit)s
+"""
+
+# A keyset page (as above) of applications with the user's contacts at the
+# same company, joined on the normalized company key. Closed applications and
+# applications without contacts can be left out
+GET_JOB_APPLICATIONS_WITH_CONTACTS = """
+SELECT j.id, j.company, j.position, j.status, j.date, j.priority,
+       COALESCE(
+           jsonb_agg(
+               jsonb_build_object(
+                   'id', c.id, 'name', c.name, 'role', c.role, 'company', c.company,
+                   'linkedin', c.linkedin, 'email', c.email, 'phone', c.phone
+               ) ORDER BY c.name, c.id
+           ) FILTER (WHERE c.id IS NOT NULL),
+           '[]'
+       ) AS contacts
+FROM job_applications j
+LEFT JOIN network_contacts c
+       ON c.user_email = j.user_email AND c.company_key = j.company_key
+WHERE j.user_email = %(user_email)s
+  AND (%(include_closed)s OR j.status <> ALL(%(closed_statuses)s))
+  AND (%(cursor_date)s::date IS NULL OR (j.date, j.id) < (%(cursor_date)s, %(cursor_id)s))
+GROUP BY j.id
+HAVING NOT %(only_with_contacts)s OR count(c.id) > 0
+ORDER BY j.date DESC, j.id DESC
+LIMIT %(limit)s
+"""
+
 GET_JOB_APPLICATION_BY_ID = """
 SELECT * FROM job_applications WHERE id = %s AND user_email = %s
 """
 
+# The application and its timeline (oldest first) in one round trip; no row
+# means the application does not exist or belongs to someone else. Generated
+# search and join columns are left out of the JSON.
+GET_JOB_APPLICATION_WITH_TIMELINE = """
+SELECT to_jsonb(j) - '{search_vector,search_text,company_key}'::text[] AS job_application,
+       COALESCE(
+           (SELECT jsonb_agg(to_jsonb(t) - '{search_vector,search_text}'::text[] ORDER BY t.date, t.id)
+            FROM application_timeline t WHERE t.application_id = j.id),
+           '[]'
+       ) AS timeline
+FROM job_applications j
+WHERE j.id = %s AND j.user_email = %s;
+"""
+
 INSERT_JOB_APPLICATION = """
 INSERT INTO job_applications (user_email, company, position, status, date, priority, matched_skills, required_skills)
 VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING *;
 """
 
+# Create an application, matching skills against the user's in SQL, together
+# with its first timeline entry and, when a job description was given, a
+# skill extraction job
+INSERT_JOB_APPLICATION_WITH_TIMELINE = """
+WITH new_job AS (
+    INSERT INTO job_applications (user_email, company, position, status, date, priority, matched_skills, required_skills)
+    SELECT u.email, %(company)s, %(position)s, %(status)s, %(date)s, %(priority)s,
+           match_skills(%(required_skills)s::text[], u.skills), %(required_skills)s
+    FROM users u WHERE u.email = %(user_email)s
+    RETURNING *
+), first_entry AS (
+    INSERT INTO application_timeline (application_id, status, date, notes)
+    SELECT id, status, NOW(), 'applied' FROM new_job
+), skill_job AS (
+    INSERT INTO skill_extraction_jobs (application_id, user_email, description)
+    SELECT id, user_email, %(job_description)s FROM new_job
+    WHERE %(job_description)s::text IS NOT NULL
+    RETURNING id
+)
+SELECT new_job.*, (SELECT id FROM skill_job) AS skill_job_id FROM new_job;
+"""
+
+# Reserve ids up front so bulk-loaded applications and their timeline
+# entries can both be written with COPY
+RESERVE_JOB_APPLICATION_IDS = """
+SELECT nextval(pg_get_serial_sequence('job_applications', 'id')) AS id
+FROM generate_series(1, %s)
+"""
+
+COPY_JOB_APPLICATIONS = """
+COPY job_applications (id, user_email, company, position, status, date, priority, matched_skills, required_skills)
+FROM STDIN
+"""
+
+# matched_skills is always derived from the user's skills, never taken from the client
 UPDATE_JOB_APPLICATION = """
-UPDATE job_applications
-SET company = %s, position = %s, status = %s, date = %s, priority = %s, matched_skills = %s, required_skills = %s
-WHERE id = %s AND user_email = %s RETURNING *;
+UPDATE job_applications j
+SET company = %s, position = %s, status = %s, date = %s, priority = %s,
+    matched_skills = match_skills(%s::text[], u.skills), required_skills = %s
+FROM users u
+WHERE u.email = j.user_email AND j.id = %s AND j.user_email = %s RETURNING j.*;
+"""
+
+# Update several applications in one statement from a JSON array of
+# {id, company, position, status, date, priority, required_skills}
+UPDATE_JOB_APPLICATIONS_BATCH = """
+UPDATE job_applications j
+SET company = b.company, position = b.position, status = b.status, date = b.date,
+    priority = b.priority, matched_skills = match_skills(b.required_skills, u.skills),
+    required_skills = b.required_skills
+FROM jsonb_to_recordset(%s::jsonb) AS b(
+         id INTEGER, company TEXT, position TEXT, status TEXT, date DATE,
+         priority TEXT, required_skills TEXT[]
+     ),
+     users u
+WHERE j.id = b.id AND j.user_email = %s AND u.email = j.user_email
+RETURNING j.id, j.company, j.position, j.status, j.date, j.priority,
+          j.matched_skills, j.required_skills;
+"""
+
+DELETE_JOB_APPLICATIONS_BATCH = """
+DELETE FROM job_applications WHERE id = ANY(%s) AND user_email = %s RETURNING id;
+"""
+
+# Refresh matched_skills, in one statement, for only the applications that
+# require one of the skills the user just gained or lost
+RECOMPUTE_MATCHED_SKILLS = """
+UPDATE job_applications j
+SET matched_skills = match_skills(j.required_skills, u.skills)
+FROM users u
+WHERE u.email = j.user_email
+  AND j.user_email = %s
+  AND skill_keys(j.required_skills) && %s::text[];
 """
 
 DELETE_JOB_APPLICATION = """
 DELETE FROM job_applications WHERE id = %s AND user_email = %s;
 """
 
-GET_APPLICATION_STATUS_SUMMARY = """
-SELECT status, COUNT(*) as count
-FROM job_applications
-WHERE user_email = %s
-GROUP BY status
-ORDER BY count DESC;
+# One row per timeline entry (or per application without any), grouped by
+# application so an export can be streamed from a server-side cursor
+EXPORT_JOB_APPLICATIONS_WITH_TIMELINE = """
+SELECT j.id, j.company, j.position, j.status, j.date, j.priority,
+       j.matched_skills, j.required_skills,
+       t.id AS timeline_id, t.status AS timeline_status,
+       t.date AS timeline_date, t.notes AS timeline_notes
+FROM job_applications j
+LEFT JOIN application_timeline t ON t.application_id = j.id
+WHERE j.user_email = %s
+ORDER BY j.id, t.date, t.id
 """
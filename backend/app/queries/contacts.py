@@ -4,7 +4,8 @@ VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING *;
 """
 
 GET_ALL_CONTACTS = """
-SELECT * FROM network_contacts WHERE user_email = %s;
+SELECT id, name, role, company, linkedin, email, phone
+FROM network_contacts WHERE user_email = %s;
 """
 
 GET_CONTACT_BY_ID = """
@@ -20,3 +21,7 @@ WHERE id = %s AND user_email = %s RETURNING *;
 DELETE_CONTACT = """
 DELETE FROM network_contacts WHERE id = %s AND user_email = %s;
 """
+
+DELETE_CONTACTS_BATCH = """
+DELETE FROM network_contacts WHERE id = ANY(%s) AND user_email = %s RETURNING id;
+"""
@@ -0,0 +1,12 @@
+# Seconds the server is behind its primary: zero when it has replayed all the
+# WAL it received (or is not a standby), otherwise the age of the last
+# replayed transaction. NULL when a standby has lost its WAL receiver, since
+# it can no longer tell how far behind it is.
+GET_REPLICATION_LAG = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver) THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp())
+END::float8 AS lag;
+"""
@@ -0,0 +1,6 @@
+GET_ROLE_INSIGHTS = """
+SELECT role_title, common_skills, average_salary,
+    demand_trend, top_companies
+FROM role_insights
+ORDER BY role_title;
+"""
@@ -0,0 +1,36 @@
+# Ranked search over the user's applications, timeline notes and contacts.
+# A row matches when its tsvector matches the prefix query or its text is a
+# close trigram match for the search text (typos). Pages are keyed on
+# (rank, kind, id), highest rank first; pass None to start at the top.
+SEARCH_USER_RECORDS = """
+WITH q AS (
+    SELECT to_tsquery('simple', %(tsquery)s) AS tsq, lower(%(text)s) AS text
+), results AS (
+    SELECT 'application' AS kind, j.id, j.id AS application_id,
+           j.company AS title, j.position AS detail,
+           ts_rank(j.search_vector, q.tsq) + word_similarity(q.text, j.search_text) AS rank
+    FROM job_applications j, q
+    WHERE j.user_email = %(user_email)s
+      AND (j.search_vector @@ q.tsq OR q.text <%% j.search_text)
+    UNION ALL
+    SELECT 'timeline', t.id, t.application_id, j.company, t.notes,
+           ts_rank(t.search_vector, q.tsq) + word_similarity(q.text, t.search_text)
+    FROM application_timeline t
+    JOIN job_applications j ON j.id = t.application_id, q
+    WHERE j.user_email = %(user_email)s
+      AND (t.search_vector @@ q.tsq OR q.text <%% t.search_text)
+    UNION ALL
+    SELECT 'contact', c.id, NULL, c.name, c.role || ' at ' || c.company,
+           ts_rank(c.search_vector, q.tsq) + word_similarity(q.text, c.search_text)
+    FROM network_contacts c, q
+    WHERE c.user_email = %(user_email)s
+      AND (c.search_vector @@ q.tsq OR q.text <%% c.search_text)
+)
+SELECT kind, id, application_id, title, detail, rank
+FROM results
+WHERE (%(kinds)s::text[] IS NULL OR kind = ANY(%(kinds)s))
+  AND (%(cursor_rank)s::real IS NULL
+       OR (rank, kind, id) < (%(cursor_rank)s::real, %(cursor_kind)s, %(cursor_id)s))
+ORDER BY rank DESC, kind DESC, id DESC
+LIMIT %(limit)s;
+"""
@@ -0,0 +1,67 @@
+# Claim due jobs, plus running jobs whose lease expired, without waiting on
+# jobs other workers hold. A job whose lease expired on its last attempt
+# (its worker keeps dying on it) is failed instead of claimed again.
+CLAIM_SKILL_JOBS = """
+WITH exhausted AS (
+    UPDATE skill_extraction_jobs
+    SET status = 'failed', finished_at = NOW(), locked_at = NULL,
+        last_error = 'Worker lease expired on the last attempt'
+    WHERE status = 'running' AND locked_at < NOW() - make_interval(secs => %(lease)s)
+      AND attempts >= %(max_attempts)s
+), due AS (
+    SELECT id FROM skill_extraction_jobs
+    WHERE (status = 'queued' AND run_at <= NOW())
+       OR (status = 'running' AND locked_at < NOW() - make_interval(secs => %(lease)s)
+           AND attempts < %(max_attempts)s)
+    ORDER BY run_at, id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE skill_extraction_jobs j
+SET status = 'running', attempts = j.attempts + 1, locked_at = NOW()
+FROM due
+WHERE j.id = due.id
+RETURNING j.id, j.application_id, j.user_email, j.description, j.attempts;
+"""
+
+# Mark the job done and add the extracted skills the application does not
+# already require, rematching them against the user's skills
+COMPLETE_SKILL_JOB = """
+WITH done AS (
+    UPDATE skill_extraction_jobs
+    SET status = 'succeeded', extracted_skills = %(skills)s, finished_at = NOW(),
+        locked_at = NULL, last_error = NULL
+    WHERE id = %(job_id)s AND status = 'running'
+    RETURNING application_id
+), merged AS (
+    SELECT j.id, j.required_skills || ARRAY(
+        SELECT s FROM unnest(%(skills)s::text[]) AS s
+        WHERE skill_key(s) <> ALL(skill_keys(j.required_skills))
+    ) AS skills
+    FROM job_applications j JOIN done ON j.id = done.application_id
+)
+UPDATE job_applications j
+SET required_skills = merged.skills, matched_skills = match_skills(merged.skills, u.skills)
+FROM merged, users u
+WHERE j.id = merged.id AND u.email = j.user_email;
+"""
+
+RETRY_SKILL_JOB = """
+UPDATE skill_extraction_jobs
+SET status = 'queued', run_at = NOW() + make_interval(secs => %s),
+    locked_at = NULL, last_error = %s
+WHERE id = %s AND status = 'running';
+"""
+
+FAIL_SKILL_JOB = """
+UPDATE skill_extraction_jobs
+SET status = 'failed', finished_at = NOW(), locked_at = NULL, last_error = %s
+WHERE id = %s AND status = 'running';
+"""
+
+GET_SKILL_JOB = """
+SELECT id, application_id, status, attempts, extracted_skills, last_error,
+       created_at, finished_at
+FROM skill_extraction_jobs
+WHERE id = %s AND user_email = %s;
+"""
@@ -0,0 +1,8 @@
+GET_SKILL_APPLICATION_COUNTS = """
+SELECT c.skill, c.application_count,
+       c.skill_key = ANY(skill_keys(u.skills)) AS matched
+FROM skill_application_counts c
+JOIN users u ON u.email = c.user_email
+WHERE c.user_email = %s
+ORDER BY c.application_count DESC, c.skill;
+"""
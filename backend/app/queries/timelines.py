@@ -10,14 +10,55 @@ VALUES (%s, %s, NOW(), %s)
 RETURNING id, application_id, status, date, notes;
 """
 
+# date is left to its CURRENT_TIMESTAMP default
+COPY_APPLICATION_TIMELINES = """
+COPY application_timeline (application_id, status, notes)
+FROM STDIN
+"""
+
+# Add an entry only if the application belongs to the user; no row means it
+# does not
+INSERT_USER_APPLICATION_TIMELINE = """
+INSERT INTO application_timeline (application_id, status, date, notes)
+SELECT j.id, %s, NOW(), %s
+FROM job_applications j
+WHERE j.id = %s AND j.user_email = %s
+RETURNING id, application_id, status, date, notes;
+"""
+
+# Several entries in one statement from a JSON array of {application_id,
+# status, notes}; entries for applications the user does not own are skipped
+INSERT_USER_APPLICATION_TIMELINES_BATCH = """
+INSERT INTO application_timeline (application_id, status, date, notes)
+SELECT j.id, b.status, NOW(), b.notes
+FROM jsonb_to_recordset(%s::jsonb) AS b(application_id INTEGER, status TEXT, notes TEXT)
+JOIN job_applications j ON j.id = b.application_id AND j.user_email = %s
+RETURNING id, application_id, status, date, notes;
+"""
+
 UPDATE_APPLICATION_TIMELINE = """
-UPDATE application_timeline
+UPDATE application_timeline t
 SET status = %s, date = %s, notes = %s
-WHERE id = %s RETURNING *;
+FROM job_applications j
+WHERE t.id = %s AND t.application_id = %s
+  AND j.id = t.application_id AND j.user_email = %s
+RETURNING t.*;
 """
 
 DELETE_APPLICATION_TIMELINE = """
-DELETE FROM application_timeline WHERE id = %s;
+DELETE FROM application_timeline t
+USING job_applications j
+WHERE t.id = %s AND t.application_id = %s
+  AND j.id = t.application_id AND j.user_email = %s;
+"""
+
+# Delete (id, application_id) pairs the user owns
+DELETE_APPLICATION_TIMELINES_BATCH = """
+DELETE FROM application_timeline t
+USING job_applications j, unnest(%s::int[], %s::int[]) AS b(id, application_id)
+WHERE t.id = b.id AND t.application_id = b.application_id
+  AND j.id = t.application_id AND j.user_email = %s
+RETURNING t.id;
 """
 
 CHECK_TIMELINE_ENTRY_EXISTS = """
@@ -30,3 +71,38 @@ WHERE application_id = %s
 ORDER BY date DESC
 LIMIT 1;
 """
+
+# Activity feed across all of a user's applications. Each application
+# contributes at most one page of entries from the (application_id, date, id)
+# index, so a page costs the same no matter how large the table grows.
+# `before` pages backwards from a cursor, newest first.
+GET_USER_TIMELINE_FEED_BEFORE = """
+SELECT t.id, t.application_id, t.status, t.date, t.notes
+FROM job_applications j
+CROSS JOIN LATERAL (
+    SELECT * FROM application_timeline t
+    WHERE t.application_id = j.id
+      AND (%(cursor_date)s::timestamp IS NULL OR (t.date, t.id) < (%(cursor_date)s, %(cursor_id)s))
+    ORDER BY t.date DESC, t.id DESC
+    LIMIT %(limit)s
+) t
+WHERE j.user_email = %(user_email)s
+ORDER BY t.date DESC, t.id DESC
+LIMIT %(limit)s;
+"""
+
+# `since` polls forwards from a cursor, oldest first
+GET_USER_TIMELINE_FEED_SINCE = """
+SELECT t.id, t.application_id, t.status, t.date, t.notes
+FROM job_applications j
+CROSS JOIN LATERAL (
+    SELECT * FROM application_timeline t
+    WHERE t.application_id = j.id
+      AND (t.date, t.id) > (%(cursor_date)s, %(cursor_id)s)
+    ORDER BY t.date ASC, t.id ASC
+    LIMIT %(limit)s
+) t
+WHERE j.user_email = %(user_email)s
+ORDER BY t.date ASC, t.id ASC
+LIMIT %(limit)s;
+"""
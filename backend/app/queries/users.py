@@ -8,8 +8,12 @@ GET_USER_BY_EMAIL = """
 SELECT * FROM users WHERE email = %s;
 """
 
-FIND_USER = """
-SELECT * FROM users WHERE email = %s;
+GET_ALL_USERS = """
+SELECT * FROM users;
+"""
+
+GET_USER_SKILLS = """
+SELECT skills FROM users WHERE email = %s;
 """
 
 UPDATE_USER_SKILLS = """
@@ -17,3 +21,16 @@ UPDATE users
 SET skills = %s
 WHERE email = %s
 """
+
+
+UPDATE_USER_PASSWORD_HASH = """
+UPDATE users
+SET password_hash = %s
+WHERE email = %s
+"""
+
+GET_USER_DATA_VERSIONS = """
+SELECT applications_version, contacts_version
+FROM user_data_versions
+WHERE user_email = %s;
+"""
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from app.database import get_db_connection
+from app.models.analytics import PipelineAnalytics
+from app.queries.analytics import GET_PIPELINE_ANALYTICS
+from app.utils.analytics import build_funnel
+from app.utils.caching import etag_matches, get_data_versions, make_version_etag
+from app.utils.jwt_manager import get_current_user
+
+router = APIRouter(prefix="/api", tags=["Analytics"])
+
+
+@router.get("/analytics", response_model=PipelineAnalytics)
+async def get_pipeline_analytics(
+    request: Request,
+    response: Response,
+    weeks: int = Query(26, ge=1, le=520),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Retrieve pipeline statistics: applications per status, the stage funnel
+    with conversion rates, median time in each status, and weekly volume for
+    the most recent `weeks` weeks with applications.
+
+    Everything is read from aggregates the database keeps up to date as
+    applications and timelines change. Send the ETag back as If-None-Match
+    to get a 304 if nothing changed.
+    """
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            versions = await get_data_versions(cur, current_user)
+            etag = make_version_etag(
+                "analytics", versions["applications_version"], current_user, request.url.query
+            )
+            cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=cache_headers)
+            response.headers.update(cache_headers)
+
+            await cur.execute(GET_PIPELINE_ANALYTICS, {"user_email": current_user, "weeks": weeks})
+            analytics = await cur.fetchone()
+
+    return {
+        "total": sum(row["count"] for row in analytics["status_counts"]),
+        "status_counts": analytics["status_counts"],
+        "funnel": build_funnel(analytics["stage_reach"]),
+        "time_in_stage": analytics["time_in_stage"],
+        "weekly_volume": analytics["weekly_volume"],
+    }
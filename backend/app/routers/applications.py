@@ -1,97 +1,333 @@
 from app.models.timelines import ApplicationTimelineCreate, ApplicationTimelineResponse
 from app.queries.timelines import (
+    COPY_APPLICATION_TIMELINES,
     DELETE_APPLICATION_TIMELINE,
-    GET_APPLICATION_TIMELINE,
-    INSERT_APPLICATION_TIMELINE,
+    INSERT_USER_APPLICATION_TIMELINE,
     UPDATE_APPLICATION_TIMELINE,
 )
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import List, Optional
+from datetime import date
 from app.database import get_db_connection
 from app.queries.applications import (
+    COPY_JOB_APPLICATIONS,
     DELETE_JOB_APPLICATION,
-    GET_JOB_APPLICATION_BY_ID,
-    GET_JOB_APPLICATIONS,
-    INSERT_JOB_APPLICATION,
+    EXPORT_JOB_APPLICATIONS_WITH_TIMELINE,
+    GET_JOB_APPLICATION_WITH_TIMELINE,
+    GET_JOB_APPLICATIONS_PAGE_ASC,
+    GET_JOB_APPLICATIONS_PAGE_DESC,
+    GET_JOB_APPLICATIONS_WITH_CONTACTS,
+    INSERT_JOB_APPLICATION_WITH_TIMELINE,
+    RESERVE_JOB_APPLICATION_IDS,
     UPDATE_JOB_APPLICATION,
 )
-from app.models.applications import JobApplicationCreate, JobApplicationResponse
+from app.queries.users import GET_USER_SKILLS
+from app.models.applications import (
+    JobApplicationCreate,
+    JobApplicationCreateResponse,
+    JobApplicationResponse,
+    JobApplicationWithContacts,
+)
 from app.config import settings
 from app.utils.jwt_manager import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.caching import etag_matches, get_data_versions, make_version_etag
+from app.utils.export import stream_csv, stream_ndjson
+from app.utils.importer import parse_csv, validate_rows
+from app.utils.skills import match_skills
 
 router = APIRouter(prefix="/api", tags=["Applications"])
 
+# Applications in these statuses are no longer active
+CLOSED_STATUSES = ["Rejected", "Withdrawn"]
+
 
 @router.get("/applications", response_model=List[JobApplicationResponse])
-async def get_applications(current_user: str = Depends(get_current_user)):
-    """Retrieve all job applications from the database"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+async def get_applications(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = Query("-date", pattern="^-?date$"),
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    company: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Retrieve a page of job applications, newest first by default.
+
+    Pages are keyed on (date, id): pass the X-Next-Cursor header of one page
+    as `cursor` to get the next one. The header is absent on the last page.
+    Send the ETag back as If-None-Match to get a 304 if nothing changed.
+
+    Rows are encoded with orjson as they come from the page query; the
+    response model only documents their shape.
+    """
+    cursor_date = cursor_id = None
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor, 2)
+        try:
+            cursor_date, cursor_id = date.fromisoformat(cursor_date), int(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    params = {
+        "user_email": current_user,
+        "status": status,
+        "priority": priority,
+        "company": company,
+        "date_from": date_from,
+        "date_to": date_to,
+        "cursor_date": cursor_date,
+        "cursor_id": cursor_id,
+        # One extra row tells us whether there is a next page
+        "limit": limit + 1,
+    }
+    query = GET_JOB_APPLICATIONS_PAGE_DESC if sort == "-date" else GET_JOB_APPLICATIONS_PAGE_ASC
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            # Answer revalidations from the version counter without loading rows
+            versions = await get_data_versions(cur, current_user)
+            etag = make_version_etag(
+                "applications", versions["applications_version"], current_user, request.url.query
+            )
+            cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=cache_headers)
+
+            await cur.execute(query, params)
+            jobs = await cur.fetchall()
+
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        cache_headers["X-Next-Cursor"] = encode_cursor(jobs[-1]["date"], jobs[-1]["id"])
 
-            cur.execute(GET_JOB_APPLICATIONS, (current_user,))
-            jobs = cur.fetchall()
+    return ORJSONResponse(jobs, headers=cache_headers)
 
-    return jobs
+
+async def _export_batches(current_user: str):
+    """Yield the user's applications and timelines from a server-side cursor, batch by batch"""
+    async with get_db_connection() as conn:
+        async with conn.cursor(name="applications_export") as cur:
+            await cur.execute(EXPORT_JOB_APPLICATIONS_WITH_TIMELINE, (current_user,))
+            while True:
+                rows = await cur.fetchmany(settings.EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                yield rows
+
+
+@router.get("/applications/export")
+async def export_applications(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    current_user: str = Depends(get_current_user),
+):
+    """Stream every job application with its timeline entries as CSV or NDJSON"""
+    batches = _export_batches(current_user)
+    if export_format == "ndjson":
+        body, media_type = stream_ndjson(batches), "application/x-ndjson"
+    else:
+        body, media_type = stream_csv(batches), "text/csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="applications.{export_format}"'
+        },
+    )
+
+
+@router.get("/applications/contacts", response_model=List[JobApplicationWithContacts])
+async def get_applications_with_contacts(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include_closed: bool = False,
+    only_with_contacts: bool = True,
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Retrieve active applications, newest first, each with the user's contacts
+    at that company.
+
+    Companies are matched ignoring case, punctuation and suffixes such as
+    "Inc". Pass the X-Next-Cursor header as `cursor` for the next page.
+    """
+    cursor_date = cursor_id = None
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor, 2)
+        try:
+            cursor_date, cursor_id = date.fromisoformat(cursor_date), int(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    params = {
+        "user_email": current_user,
+        "include_closed": include_closed,
+        "closed_statuses": CLOSED_STATUSES,
+        "only_with_contacts": only_with_contacts,
+        "cursor_date": cursor_date,
+        "cursor_id": cursor_id,
+        "limit": limit + 1,
+    }
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            await cur.execute(GET_JOB_APPLICATIONS_WITH_CONTACTS, params)
+            jobs = await cur.fetchall()
+
+    headers = {}
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(jobs[-1]["date"], jobs[-1]["id"])
+
+    # Rows already match JobApplicationWithContacts, so skip re-validation
+    return ORJSONResponse(jobs, headers=headers)
 
 
 @router.get("/applications/{job_id}", response_model=dict)
 async def get_job_application(
     job_id: int, current_user: str = Depends(get_current_user)
 ):
-    """Retrieve a specific job application"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    """Retrieve a specific job application with its timeline"""
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(GET_JOB_APPLICATION_BY_ID, (job_id, current_user))
-            job = cur.fetchone()
+            await cur.execute(GET_JOB_APPLICATION_WITH_TIMELINE, (job_id, current_user))
+            result = await cur.fetchone()
 
-            if not job:
-                raise HTTPException(
-                    status_code=404, detail="Job application not found or unauthorized"
-                )
-            
-            # Fetch application timeline
-            cur.execute(GET_APPLICATION_TIMELINE, (job_id,))
-            timeline = cur.fetchall()
-
-            
+    if not result:
+        raise HTTPException(
+            status_code=404, detail="Job application not found or unauthorized"
+        )
 
-    return {"job_application": job, "timeline": timeline}
+    return result
 
 
-@router.post("/applications", response_model=JobApplicationResponse)
+@router.post("/applications", response_model=JobApplicationCreateResponse)
 async def create_job_application(
     job: JobApplicationCreate, current_user: str = Depends(get_current_user)
 ):
-    """Create a new job application and automatically insert the first timeline entry"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SELECT skills FROM users WHERE email = %s",
-                        (current_user,))
-            user_record = cur.fetchone()
-            user_skills = user_record["skills"] or []
-            matched_skills = list(set(user_skills) & set(job.required_skills))
-            cur.execute(
-                INSERT_JOB_APPLICATION,
-                (
-                    current_user,
-                    job.company,
-                    job.position,
-                    job.status,
-                    job.date,
-                    job.priority,
-                    matched_skills,
-                    job.required_skills,
-                ),
+    """
+    Create a new job application and automatically insert the first timeline entry.
+
+    If a job description is included, a background job extracts its skills;
+    poll GET /api/skill-jobs/{skill_job_id} to see when they have been added.
+    """
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                INSERT_JOB_APPLICATION_WITH_TIMELINE,
+                {
+                    "user_email": current_user,
+                    "company": job.company,
+                    "position": job.position,
+                    "status": job.status,
+                    "date": job.date,
+                    "priority": job.priority,
+                    "required_skills": job.required_skills,
+                    "job_description": job.job_description,
+                },
             )
-            new_job = cur.fetchone()
-            job_id = new_job["id"]
+            new_job = await cur.fetchone()
+            await conn.commit()
 
-            cur.execute(INSERT_APPLICATION_TIMELINE, (job_id, job.status, "applied"))
+    return new_job
 
-            conn.commit()
 
-    return new_job
+async def _read_import_body(request: Request) -> bytes:
+    """The request body, refused with a 413 as soon as it exceeds IMPORT_MAX_BYTES"""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"At most {settings.IMPORT_MAX_BYTES} bytes can be imported at once",
+    )
+    try:
+        declared = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared > settings.IMPORT_MAX_BYTES:
+        raise too_large
+
+    # Chunked uploads declare no length, so count what actually arrives
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.IMPORT_MAX_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@router.post("/applications/import")
+async def import_job_applications(
+    request: Request, current_user: str = Depends(get_current_user)
+):
+    """
+    Bulk-create job applications from a JSON array or a CSV file (text/csv).
+
+    Invalid rows are reported individually and skipped; the valid rows and
+    their first timeline entries are loaded with COPY in a single transaction.
+    """
+    body = (await _read_import_body(request)).decode("utf-8-sig")
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        rows = parse_csv(body)
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or CSV")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or CSV")
+    if len(rows) > settings.IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.IMPORT_MAX_ROWS} rows can be imported at once",
+        )
+
+    valid, errors = validate_rows(rows)
+    ids = []
+    if valid:
+        async with get_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(GET_USER_SKILLS, (current_user,))
+                user_record = await cur.fetchone()
+                if not user_record:
+                    raise HTTPException(status_code=404, detail="User not found")
+                user_skills = user_record["skills"] or []
+
+                await cur.execute(RESERVE_JOB_APPLICATION_IDS, (len(valid),))
+                ids = [row["id"] for row in await cur.fetchall()]
+
+                async with cur.copy(COPY_JOB_APPLICATIONS) as copy:
+                    for job_id, (_, job) in zip(ids, valid):
+                        await copy.write_row((
+                            job_id,
+                            current_user,
+                            job.company,
+                            job.position,
+                            job.status,
+                            job.date,
+                            job.priority,
+                            match_skills(user_skills, job.required_skills),
+                            job.required_skills,
+                        ))
+                async with cur.copy(COPY_APPLICATION_TIMELINES) as copy:
+                    for job_id, (_, job) in zip(ids, valid):
+                        await copy.write_row((job_id, job.status, "applied"))
+
+                await conn.commit()
+
+    return {
+        "imported": len(ids),
+        "failed": len(errors),
+        "ids": ids,
+        "errors": errors,
+    }
 
 
 @router.put("/applications/{job_id}", response_model=JobApplicationResponse)
@@ -101,21 +337,10 @@ async def update_job_application(
     current_user: str = Depends(get_current_user),
 ):
     """Update a job application"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-
-            cur.execute(
-                "SELECT * FROM job_applications WHERE id = %s AND user_email = %s",
-                (job_id, current_user),
-            )
-            existing_job = cur.fetchone()
-
-            if not existing_job:
-                raise HTTPException(
-                    status_code=404, detail="Job application not found or unauthorized"
-                )
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(
+            await cur.execute(
                 UPDATE_JOB_APPLICATION,
                 (
                     job_update.company,
@@ -123,19 +348,19 @@ async def update_job_application(
                     job_update.status,
                     job_update.date,
                     job_update.priority,
-                    job_update.matched_skills,
+                    job_update.required_skills,
                     job_update.required_skills,
                     job_id,
                     current_user,
                 ),
             )
+            updated_job = await cur.fetchone()
+            await conn.commit()
 
-            conn.commit()
-            cur.execute(
-                "SELECT id, company, position, status, date, priority, matched_skills, required_skills, user_email FROM job_applications WHERE id = %s",
-                (job_id,),
-            )
-            updated_job = cur.fetchone()
+    if not updated_job:
+        raise HTTPException(
+            status_code=404, detail="Job application not found or unauthorized"
+        )
 
     return updated_job
 
@@ -145,22 +370,17 @@ async def delete_job_application(
     job_id: int, current_user: str = Depends(get_current_user)
 ):
     """Delete a job application (also deletes associated timeline entries)"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-
-            cur.execute(
-                "SELECT * FROM job_applications WHERE id = %s AND user_email = %s",
-                (job_id, current_user),
-            )
-            existing_job = cur.fetchone()
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            if not existing_job:
-                raise HTTPException(
-                    status_code=404, detail="Job application not found or unauthorized"
-                )
+            await cur.execute(DELETE_JOB_APPLICATION, (job_id, current_user))
+            deleted = cur.rowcount
+            await conn.commit()
 
-            cur.execute(DELETE_JOB_APPLICATION, (job_id, current_user))
-            conn.commit()
+    if not deleted:
+        raise HTTPException(
+            status_code=404, detail="Job application not found or unauthorized"
+        )
 
     return {"message": "Job application and its timeline entries deleted successfully"}
 
@@ -172,21 +392,18 @@ async def get_application_timeline(
     job_id: int, current_user: str = Depends(get_current_user)
 ):
     """Retrieve timeline entries for a job application"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(GET_JOB_APPLICATION_BY_ID, (job_id, current_user))
-            job = cur.fetchone()
+            await cur.execute(GET_JOB_APPLICATION_WITH_TIMELINE, (job_id, current_user))
+            result = await cur.fetchone()
 
-            if not job:
-                raise HTTPException(
-                    status_code=404, detail="Job application not found or unauthorized"
-                )
-
-            cur.execute(GET_APPLICATION_TIMELINE, (job_id,))
-            timeline_entries = cur.fetchall()
+    if not result:
+        raise HTTPException(
+            status_code=404, detail="Job application not found or unauthorized"
+        )
 
-    return timeline_entries
+    return result["timeline"]
 
 
 @router.post(
@@ -199,22 +416,19 @@ async def add_timeline_entry(
     current_user: str = Depends(get_current_user),
 ):
     """Add a new timeline entry for a job application."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(GET_JOB_APPLICATION_BY_ID, (job_id, current_user))
-            job = cur.fetchone()
-
-            if not job:
-                raise HTTPException(
-                    status_code=404, detail="Job application not found or unauthorized"
-                )
-
-            cur.execute(
-                INSERT_APPLICATION_TIMELINE,
-                (job_id, timeline_entry.status, timeline_entry.notes),
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                INSERT_USER_APPLICATION_TIMELINE,
+                (timeline_entry.status, timeline_entry.notes, job_id, current_user),
             )
-            new_timeline_entry = cur.fetchone()
-            conn.commit()
+            new_timeline_entry = await cur.fetchone()
+            await conn.commit()
+
+    if not new_timeline_entry:
+        raise HTTPException(
+            status_code=404, detail="Job application not found or unauthorized"
+        )
 
     return new_timeline_entry
 
@@ -230,32 +444,27 @@ async def update_timeline_entry(
     current_user: str = Depends(get_current_user),
 ):
     """Update a timeline entry for a job application"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(
-                "SELECT * FROM application_timeline WHERE id = %s AND application_id = %s",
-                (timeline_id, job_id),
-            )
-            existing_timeline = cur.fetchone()
-
-            if not existing_timeline:
-                raise HTTPException(
-                    status_code=404, detail="Timeline entry not found or unauthorized"
-                )
-
-            cur.execute(
+            await cur.execute(
                 UPDATE_APPLICATION_TIMELINE,
                 (
                     timeline_update.status,
                     timeline_update.date,
                     timeline_update.notes,
                     timeline_id,
+                    job_id,
                     current_user,
                 ),
             )
-            updated_timeline = cur.fetchone()
-            conn.commit()
+            updated_timeline = await cur.fetchone()
+            await conn.commit()
+
+    if not updated_timeline:
+        raise HTTPException(
+            status_code=404, detail="Timeline entry not found or unauthorized"
+        )
 
     return updated_timeline
 
@@ -265,27 +474,16 @@ async def delete_timeline_entry(
     job_id: int, timeline_id: int, current_user: str = Depends(get_current_user)
 ):
     """Delete a timeline entry"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-
-            cur.execute(
-                "SELECT * FROM application_timeline WHERE id = %s AND application_id = %s",
-                (timeline_id, job_id),
-            )
-            existing_timeline = cur.fetchone()
-
-            if not existing_timeline:
-                raise HTTPException(
-                    status_code=404, detail="Timeline entry not found or unauthorized"
-                )
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(DELETE_APPLICATION_TIMELINE, (timeline_id, current_user))
-            deleted = cur.fetchone()
-            conn.commit()
+            await cur.execute(DELETE_APPLICATION_TIMELINE, (timeline_id, job_id, current_user))
+            deleted = cur.rowcount
+            await conn.commit()
 
     if not deleted:
         raise HTTPException(
-            status_code=404, detail="Timeline entry not found or already deleted"
+            status_code=404, detail="Timeline entry not found or unauthorized"
         )
 
     return {"message": "Timeline entry deleted successfully"}
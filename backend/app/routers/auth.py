@@ -1,10 +1,18 @@
 from passlib.context import CryptContext
 from fastapi import APIRouter, HTTPException, status, Depends, Response
-from app.utils.hashing import hash_password, verify_password
+from app.utils.hashing import hash_password_async, verify_and_update_password
 from app.utils.jwt_manager import create_access_token, get_current_user
 from app.database import get_db_connection
-from app.queries.users import CREATE_USER, GET_USER_BY_EMAIL, FIND_USER, UPDATE_USER_SKILLS
+from app.queries.users import (
+    CREATE_USER,
+    GET_ALL_USERS,
+    GET_USER_BY_EMAIL,
+    UPDATE_USER_PASSWORD_HASH,
+    UPDATE_USER_SKILLS,
+)
+from app.queries.applications import RECOMPUTE_MATCHED_SKILLS
 from app.models.user import RegisterRequest, UserSkills
+from app.utils.skills import skill_key
 from fastapi.security import OAuth2PasswordRequestForm
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -16,17 +24,17 @@ async def register(response: Response, registration_info: RegisterRequest):
     username = registration_info.username
     password = registration_info.password
     email = registration_info.email
-    hashed_password = hash_password(password)
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    hashed_password = await hash_password_async(password)
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            user_exists = cur.execute(FIND_USER, (email,))
-            if user_exists:
+            await cur.execute(GET_USER_BY_EMAIL, (email,))
+            if await cur.fetchone():
                 raise HTTPException(
                     status_code=400, detail="Email already registered")
 
-            cur.execute(CREATE_USER, (username, email, hashed_password))
-            conn.commit()
+            await cur.execute(CREATE_USER, (username, email, hashed_password))
+            await conn.commit()
 
     token = create_access_token({"sub": email})
 
@@ -45,15 +53,11 @@ async def register(response: Response, registration_info: RegisterRequest):
 @router.get("/users")
 async def get_users(current_user: dict = Depends(get_current_user)):
     """Retrieve users from the database"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(
-                """
-                SELECT * FROM USERS;
-            """
-            )
-            users = cur.fetchall()
+            await cur.execute(GET_ALL_USERS)
+            users = await cur.fetchall()
 
     return users
 
@@ -61,15 +65,28 @@ async def get_users(current_user: dict = Depends(get_current_user)):
 @router.post("/login")
 async def login(response: Response, form_data: OAuth2PasswordRequestForm = Depends()):
     """Login and send bearer token"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
             # form_data.username will be the email that the user provides since we are logging in with email
-            cur.execute(GET_USER_BY_EMAIL, (form_data.username,))
-            user = cur.fetchone()
-            if not user or not verify_password(form_data.password, user["password_hash"]):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-            
+            await cur.execute(GET_USER_BY_EMAIL, (form_data.username,))
+            user = await cur.fetchone()
+
+    # Verify outside the connection block so the connection isn't held while hashing
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password(
+            form_data.password, user["password_hash"])
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    # Transparently upgrade hashes made with outdated parameters
+    if new_hash:
+        async with get_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(UPDATE_USER_PASSWORD_HASH, (new_hash, user["email"]))
+                await conn.commit()
+
     token = create_access_token({"sub": user["email"]})
 
     # Set the token as an HTTP-only cookie
@@ -95,20 +112,36 @@ async def update_user_skills(
     skills_update: UserSkills,
     current_user: str = Depends(get_current_user)
 ):
-    """Update a user's skills in the database."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    """
+    Update a user's skills in the database.
+
+    matched_skills is recomputed for only the applications that require one
+    of the skills that were added or removed.
+    """
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
             # Check if user exists
-            cur.execute("SELECT * FROM users WHERE email = %s",
-                        (current_user,))
-            user = cur.fetchone()
+            await cur.execute(GET_USER_BY_EMAIL, (current_user,))
+            user = await cur.fetchone()
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
 
-            # Update skills in the database
-            cur.execute(UPDATE_USER_SKILLS,
-                        (skills_update.skills, current_user))
-            conn.commit()
-
-    return {"message": "User skills updated successfully", "skills": skills_update.skills}
+            old_keys = {skill_key(skill) for skill in user["skills"] or []}
+            new_keys = {skill_key(skill) for skill in skills_update.skills}
+            changed_keys = sorted(old_keys ^ new_keys)
 
+            # Update skills in the database
+            await cur.execute(UPDATE_USER_SKILLS,
+                              (skills_update.skills, current_user))
+            recomputed = 0
+            if changed_keys:
+                await cur.execute(RECOMPUTE_MATCHED_SKILLS,
+                                  (current_user, changed_keys))
+                recomputed = cur.rowcount
+            await conn.commit()
+
+    return {
+        "message": "User skills updated successfully",
+        "skills": skills_update.skills,
+        "applications_updated": recomputed,
+    }
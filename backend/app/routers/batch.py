@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from app.config import settings
+from app.database import get_db_connection
+from app.models.batch import BatchRequest, BatchResponse, BatchResult
+from app.utils.batch import prepare, run_atomic, run_best_effort
+from app.utils.jwt_manager import get_current_user
+
+router = APIRouter(prefix="/api", tags=["Batch"])
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, current_user: str = Depends(get_current_user)):
+    """
+    Run create, update and delete operations on applications, timeline
+    entries and contacts, in order, in one transaction.
+
+    Each operation gets a result with the status its single-item endpoint
+    would have returned. An atomic batch that fails is rolled back and
+    answered with the failing operation's status; a best-effort batch
+    always commits what succeeded.
+    """
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BATCH_MAX_OPERATIONS} operations can be sent at once",
+        )
+
+    prepared, invalid = [], []
+    for index, op in enumerate(batch.operations):
+        try:
+            prepared.append(prepare(index, op))
+        except ValueError as exc:
+            invalid.append(BatchResult(index=index, status=422, error=str(exc)))
+
+    if invalid and batch.mode == "atomic":
+        failed = {result.index for result in invalid}
+        results = invalid + [
+            BatchResult(index=op.index, status=424, error="Not run")
+            for op in prepared if op.index not in failed
+        ]
+        return _respond(False, results, 422)
+
+    async with get_db_connection() as conn:
+        if batch.mode == "atomic":
+            committed, results = await run_atomic(conn, current_user, prepared)
+        else:
+            committed, results = True, await run_best_effort(conn, current_user, prepared)
+
+    results += invalid
+    status_code = 200
+    if not committed:
+        status_code = next(result.status for result in results if result.status not in (200, 424))
+    return _respond(committed, results, status_code)
+
+
+def _respond(committed: bool, results, status_code: int):
+    results = sorted(results, key=lambda result: result.index)
+    body = BatchResponse(committed=committed, results=results).model_dump(mode="json")
+    return ORJSONResponse(body, status_code=status_code)
@@ -0,0 +1,37 @@
+import asyncio
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.utils.change_stream import change_stream, format_event
+from app.utils.jwt_manager import get_current_user
+
+router = APIRouter(prefix="/api", tags=["Changes"])
+
+
+@router.get("/changes")
+async def stream_changes(request: Request, current_user: str = Depends(get_current_user)):
+    """
+    Stream the user's changes as Server-Sent Events, instead of polling.
+
+    Each `change` event names the resource (application, timeline or
+    contact), the operation and up to 100 affected ids, for changes made by
+    any client. A `resync` event means events may have been missed, so
+    cached lists should be revalidated. Comments keep idle connections open.
+    """
+
+    async def events():
+        async with change_stream.subscribe(current_user) as queue:
+            yield format_event({}, "ready")
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.CHANGE_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event, "resync" if event.get("op") == "resync" else "change")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
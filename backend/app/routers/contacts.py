@@ -1,5 +1,6 @@
 from app.utils.jwt_manager import get_current_user
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import List
 from app.database import get_db_connection
 from app.queries.contacts import (
@@ -10,30 +11,45 @@ from app.queries.contacts import (
     UPDATE_CONTACT,
 )
 from app.models.contacts import NetworkContactCreate, NetworkContactResponse
+from app.utils.caching import etag_matches, get_data_versions, make_version_etag
 
 router = APIRouter(prefix="/api", tags=["Contacts"])
 
 
 @router.get("/contacts", response_model=List[NetworkContactResponse])
-async def get_contacts(current_user: str = Depends(get_current_user)):
-    """Retrieve all contacts"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+async def get_contacts(request: Request, current_user: str = Depends(get_current_user)):
+    """
+    Retrieve all contacts.
+
+    Send the ETag back as If-None-Match to get a 304 if nothing changed.
+    """
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            # Answer revalidations from the version counter without loading rows
+            versions = await get_data_versions(cur, current_user)
+            etag = make_version_etag(
+                "contacts", versions["contacts_version"], current_user, request.url.query
+            )
+            cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=cache_headers)
 
-            cur.execute(GET_ALL_CONTACTS, (current_user,))
-            contacts = cur.fetchall()
+            await cur.execute(GET_ALL_CONTACTS, (current_user,))
+            contacts = await cur.fetchall()
 
-    return contacts
+    # Rows already match NetworkContactResponse, so skip re-validation
+    return ORJSONResponse(contacts, headers=cache_headers)
 
 
 @router.get("/contacts/{contact_id}", response_model=NetworkContactResponse)
 async def get_contact(contact_id: int, current_user: str = Depends(get_current_user)):
     """Retrieve a specific contact"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(GET_CONTACT_BY_ID, (contact_id, current_user))
-            contact = cur.fetchone()
+            await cur.execute(GET_CONTACT_BY_ID, (contact_id, current_user))
+            contact = await cur.fetchone()
 
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found or unauthorized")
@@ -46,10 +62,10 @@ async def create_contact(
     contact: NetworkContactCreate, current_user: str = Depends(get_current_user)
 ):
     """Create a new contact"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            cur.execute(
+            await cur.execute(
                 INSERT_CONTACT,
                 (
                     current_user,
@@ -62,8 +78,8 @@ async def create_contact(
                 ),
             )
 
-            new_contact = cur.fetchone()
-            conn.commit()
+            new_contact = await cur.fetchone()
+            await conn.commit()
 
     return new_contact
 
@@ -75,18 +91,10 @@ async def update_contact(
     current_user: str = Depends(get_current_user),
 ):
     """Update an existing contact"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-
-            cur.execute(GET_CONTACT_BY_ID, (contact_id, current_user))
-            existing_contact = cur.fetchone()
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            if not existing_contact:
-                raise HTTPException(
-                    status_code=404, detail="Contact not found or unauthorized"
-                )
-
-            cur.execute(
+            await cur.execute(
                 UPDATE_CONTACT,
                 (
                     contact_update.name,
@@ -99,8 +107,11 @@ async def update_contact(
                     current_user,
                 ),
             )
-            updated_contact = cur.fetchone()
-            conn.commit()
+            updated_contact = await cur.fetchone()
+            await conn.commit()
+
+    if not updated_contact:
+        raise HTTPException(status_code=404, detail="Contact not found or unauthorized")
 
     return updated_contact
 
@@ -110,18 +121,14 @@ async def delete_contact(
     contact_id: int, current_user: str = Depends(get_current_user)
 ):
     """Delete a contact"""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-
-            cur.execute(GET_CONTACT_BY_ID, (contact_id, current_user))
-            existing_contact = cur.fetchone()
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
 
-            if not existing_contact:
-                raise HTTPException(
-                    status_code=404, detail="Contact not found or unauthorized"
-                )
+            await cur.execute(DELETE_CONTACT, (contact_id, current_user))
+            deleted = cur.rowcount
+            await conn.commit()
 
-            cur.execute(DELETE_CONTACT, (contact_id, current_user))
-            conn.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Contact not found or unauthorized")
 
     return {"message": "Contact deleted successfully"}
@@ -0,0 +1,78 @@
+import re
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+from app.database import get_db_connection
+from app.models.search import SearchResult
+from app.queries.search import SEARCH_USER_RECORDS
+from app.utils.jwt_manager import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+
+router = APIRouter(prefix="/api", tags=["Search"])
+
+SEARCH_KINDS = ("application", "timeline", "contact")
+_WORD = re.compile(r"\w+")
+
+
+def prefix_tsquery(text: str) -> str:
+    """A tsquery matching every word of the text as a prefix ("fin int" -> fin:* & int:*)"""
+    return " & ".join(f"{word}:*" for word in _WORD.findall(text.lower()))
+
+
+@router.get("/search", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Search the user's applications (company, position), timeline notes and
+    contacts (name, company, role), best matches first.
+
+    Words match as prefixes, and near-misses match through trigram
+    similarity, so "fintec intervew" still finds a FinTech interview note.
+    Narrow the results with `kind`, and pass X-Next-Cursor as `cursor` for
+    the next page.
+    """
+    tsquery = prefix_tsquery(q)
+    if not tsquery:
+        raise HTTPException(status_code=400, detail="Search text must contain a word")
+    if kind and not set(kind) <= set(SEARCH_KINDS):
+        raise HTTPException(
+            status_code=400, detail=f"kind must be one of {', '.join(SEARCH_KINDS)}"
+        )
+
+    cursor_rank = cursor_kind = cursor_id = None
+    if cursor:
+        cursor_rank, cursor_kind, cursor_id = decode_cursor(cursor, 3)
+        try:
+            cursor_rank, cursor_id = float(cursor_rank), int(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    params = {
+        "user_email": current_user,
+        "tsquery": tsquery,
+        "text": q,
+        "kinds": kind,
+        "cursor_rank": cursor_rank,
+        "cursor_kind": cursor_kind,
+        "cursor_id": cursor_id,
+        "limit": limit + 1,
+    }
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            await cur.execute(SEARCH_USER_RECORDS, params)
+            results = await cur.fetchall()
+
+    headers = {}
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last["rank"], last["kind"], last["id"])
+
+    # Rows already match SearchResult, so skip re-validation
+    return ORJSONResponse(results, headers=headers)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from app.database import get_db_connection
+from app.models.skills import SkillCount, SkillJobResponse
+from app.queries.skills import GET_SKILL_APPLICATION_COUNTS
+from app.queries.skill_jobs import GET_SKILL_JOB
+from app.utils.jwt_manager import get_current_user
+
+router = APIRouter(prefix="/api", tags=["Skills"])
+
+
+@router.get("/skills", response_model=List[SkillCount])
+async def get_skill_counts(current_user: str = Depends(get_current_user)):
+    """Retrieve how many applications require each skill, and whether the user has it"""
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            await cur.execute(GET_SKILL_APPLICATION_COUNTS, (current_user,))
+            counts = await cur.fetchall()
+
+    return counts
+
+
+@router.get("/skill-jobs/{skill_job_id}", response_model=SkillJobResponse)
+async def get_skill_job(skill_job_id: int, current_user: str = Depends(get_current_user)):
+    """
+    Check a skill extraction job.
+
+    Status goes queued -> running -> succeeded, or back to queued for a retry,
+    or failed once attempts run out. On success the extracted skills have
+    been added to the application's required_skills.
+    """
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+
+            await cur.execute(GET_SKILL_JOB, (skill_job_id, current_user))
+            job = await cur.fetchone()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Skill job not found or unauthorized")
+
+    return job
@@ -0,0 +1,30 @@
+"""
+Pipeline funnel helpers.
+
+Statuses are mapped to funnel stages by the pipeline_stage() SQL function in
+init.sql; PIPELINE_STAGES names its stage numbers in order.
+"""
+from typing import Dict, Iterable, List
+
+PIPELINE_STAGES = ("Applied", "Screen", "Interview", "Offer", "Accepted")
+
+
+def build_funnel(stage_reach: Iterable[Dict]) -> List[Dict]:
+    """
+    Turn counts of applications by furthest stage into a funnel.
+
+    An application that got to an interview also passed every earlier stage,
+    so the number reaching a stage is the count at that stage and beyond.
+    """
+    furthest = {row["stage"]: row["count"] for row in stage_reach}
+    funnel, reached = [], 0
+    for number in range(len(PIPELINE_STAGES), 0, -1):
+        reached += furthest.get(number, 0)
+        funnel.append({"stage": PIPELINE_STAGES[number - 1], "reached": reached})
+    funnel.reverse()
+
+    for previous, stage in zip(funnel, funnel[1:]):
+        stage["conversion_rate"] = (
+            round(stage["reached"] / previous["reached"], 4) if previous["reached"] else None
+        )
+    return funnel
@@ -0,0 +1,333 @@
+"""
+Run a batch of create, update and delete operations on one connection.
+
+Operations run in order. Consecutive operations of the same kind that can
+share a statement (application updates, timeline entry creation, deletes)
+are sent as one multi-row statement; the rest run one statement each. Every
+operation gets the status the single-item endpoint would have returned.
+
+In atomic mode the whole batch is one transaction, rolled back at the first
+failure. In best-effort mode each group runs in a savepoint; if a shared
+statement fails, its operations are retried one by one so only the failing
+ones are undone. Atomic mode retries a failed shared statement the same way,
+so the error is reported against the operations that caused it.
+"""
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import psycopg
+from psycopg.types.json import Jsonb
+from pydantic import BaseModel, ValidationError
+from app.models.applications import (
+    JobApplicationCreate,
+    JobApplicationCreateResponse,
+    JobApplicationResponse,
+)
+from app.models.batch import BatchOperation, BatchResult
+from app.models.contacts import NetworkContactCreate, NetworkContactResponse
+from app.models.timelines import ApplicationTimelineCreate, ApplicationTimelineResponse
+from app.queries.applications import (
+    DELETE_JOB_APPLICATIONS_BATCH,
+    INSERT_JOB_APPLICATION_WITH_TIMELINE,
+    UPDATE_JOB_APPLICATIONS_BATCH,
+)
+from app.queries.contacts import DELETE_CONTACTS_BATCH, INSERT_CONTACT, UPDATE_CONTACT
+from app.queries.timelines import (
+    DELETE_APPLICATION_TIMELINES_BATCH,
+    INSERT_USER_APPLICATION_TIMELINES_BATCH,
+    UPDATE_APPLICATION_TIMELINE,
+)
+
+NOT_FOUND = {
+    "application": "Job application not found or unauthorized",
+    "timeline": "Timeline entry not found or unauthorized",
+    "contact": "Contact not found or unauthorized",
+}
+DATA_MODELS = {
+    "application": JobApplicationCreate,
+    "timeline": ApplicationTimelineCreate,
+    "contact": NetworkContactCreate,
+}
+
+
+@dataclass
+class PreparedOperation:
+    index: int
+    op: BatchOperation
+    data: Optional[BaseModel] = None
+
+    @property
+    def kind(self) -> Tuple[str, str]:
+        return self.op.op, self.op.resource
+
+
+def _ok(model, row, status: int = 200) -> BatchResult:
+    return BatchResult(index=0, status=status, result=model.model_validate(row).model_dump(mode="json"))
+
+
+def _not_found(resource: str) -> BatchResult:
+    return BatchResult(index=0, status=404, error=NOT_FOUND[resource])
+
+
+def prepare(index: int, op: BatchOperation) -> PreparedOperation:
+    """Check an operation has what it needs; raise ValueError if not"""
+    if op.op != "create" and op.id is None:
+        raise ValueError(f"{op.op} needs an id")
+    if op.resource == "timeline" and op.application_id is None:
+        raise ValueError("timeline operations need an application_id")
+    data = None
+    if op.op != "delete":
+        if op.data is None:
+            raise ValueError(f"{op.op} needs data")
+        fields = dict(op.data)
+        if op.resource == "timeline":
+            fields["application_id"] = op.application_id
+        try:
+            data = DATA_MODELS[op.resource](**fields)
+        except ValidationError as exc:
+            raise ValueError("; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in exc.errors()
+            ))
+    return PreparedOperation(index, op, data)
+
+
+# Handlers take a group of operations of one kind and return one result each
+
+async def create_applications(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    results = []
+    for prepared in ops:
+        job = prepared.data
+        await cur.execute(INSERT_JOB_APPLICATION_WITH_TIMELINE, {
+            "user_email": user,
+            "company": job.company,
+            "position": job.position,
+            "status": job.status,
+            "date": job.date,
+            "priority": job.priority,
+            "required_skills": job.required_skills,
+            "job_description": job.job_description,
+        })
+        row = await cur.fetchone()
+        # The insert selects from users, so no row means the user is gone
+        results.append(
+            _ok(JobApplicationCreateResponse, row) if row
+            else BatchResult(index=0, status=404, error="User not found")
+        )
+    return results
+
+
+async def update_applications(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    rows = [
+        {**prepared.data.model_dump(mode="json", include={
+            "company", "position", "status", "date", "priority", "required_skills",
+        }), "id": prepared.op.id}
+        for prepared in ops
+    ]
+    await cur.execute(UPDATE_JOB_APPLICATIONS_BATCH, (Jsonb(rows), user))
+    updated = {row["id"]: row for row in await cur.fetchall()}
+    return [
+        _ok(JobApplicationResponse, updated[prepared.op.id])
+        if prepared.op.id in updated else _not_found("application")
+        for prepared in ops
+    ]
+
+
+async def create_timeline_entries(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    rows = [
+        {"application_id": prepared.op.application_id,
+         "status": prepared.data.status, "notes": prepared.data.notes}
+        for prepared in ops
+    ]
+    await cur.execute(INSERT_USER_APPLICATION_TIMELINES_BATCH, (Jsonb(rows), user))
+    # An application has at most one entry per status, so this names each entry
+    created = {(row["application_id"], row["status"]): row for row in await cur.fetchall()}
+    return [
+        _ok(ApplicationTimelineResponse, created[(row["application_id"], row["status"])])
+        if (row["application_id"], row["status"]) in created else _not_found("application")
+        for row in rows
+    ]
+
+
+async def update_timeline_entries(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    results = []
+    for prepared in ops:
+        entry = prepared.data
+        await cur.execute(UPDATE_APPLICATION_TIMELINE, (
+            entry.status, entry.date, entry.notes,
+            prepared.op.id, prepared.op.application_id, user,
+        ))
+        row = await cur.fetchone()
+        results.append(_ok(ApplicationTimelineResponse, row) if row else _not_found("timeline"))
+    return results
+
+
+async def create_contacts(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    results = []
+    for prepared in ops:
+        contact = prepared.data
+        await cur.execute(INSERT_CONTACT, (
+            user, contact.name, contact.role, contact.company,
+            contact.linkedin, contact.email, contact.phone,
+        ))
+        results.append(_ok(NetworkContactResponse, await cur.fetchone()))
+    return results
+
+
+async def update_contacts(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    results = []
+    for prepared in ops:
+        contact = prepared.data
+        await cur.execute(UPDATE_CONTACT, (
+            contact.name, contact.role, contact.company, contact.linkedin,
+            contact.email, contact.phone, prepared.op.id, user,
+        ))
+        row = await cur.fetchone()
+        results.append(_ok(NetworkContactResponse, row) if row else _not_found("contact"))
+    return results
+
+
+def _delete_results(ops: List[PreparedOperation], deleted: set) -> List[BatchResult]:
+    return [
+        BatchResult(index=0, status=200, result={"id": prepared.op.id})
+        if prepared.op.id in deleted else _not_found(prepared.op.resource)
+        for prepared in ops
+    ]
+
+
+async def delete_applications(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    await cur.execute(DELETE_JOB_APPLICATIONS_BATCH, ([p.op.id for p in ops], user))
+    return _delete_results(ops, {row["id"] for row in await cur.fetchall()})
+
+
+async def delete_timeline_entries(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    await cur.execute(DELETE_APPLICATION_TIMELINES_BATCH, (
+        [p.op.id for p in ops], [p.op.application_id for p in ops], user,
+    ))
+    return _delete_results(ops, {row["id"] for row in await cur.fetchall()})
+
+
+async def delete_contacts(cur, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    await cur.execute(DELETE_CONTACTS_BATCH, ([p.op.id for p in ops], user))
+    return _delete_results(ops, {row["id"] for row in await cur.fetchall()})
+
+
+Handler = Callable[[Any, str, List[PreparedOperation]], Awaitable[List[BatchResult]]]
+
+# (op, resource) -> handler, and whether it runs a group as one statement
+HANDLERS: Dict[Tuple[str, str], Tuple[Handler, bool]] = {
+    ("create", "application"): (create_applications, False),
+    ("update", "application"): (update_applications, True),
+    ("delete", "application"): (delete_applications, True),
+    ("create", "timeline"): (create_timeline_entries, True),
+    ("update", "timeline"): (update_timeline_entries, False),
+    ("delete", "timeline"): (delete_timeline_entries, True),
+    ("create", "contact"): (create_contacts, False),
+    ("update", "contact"): (update_contacts, False),
+    ("delete", "contact"): (delete_contacts, True),
+}
+
+
+def _row_key(prepared: PreparedOperation):
+    """What must not repeat within one multi-row statement"""
+    if prepared.kind == ("create", "timeline"):
+        return prepared.op.application_id, prepared.data.status
+    return prepared.op.id
+
+
+def group_operations(ops: List[PreparedOperation]) -> List[List[PreparedOperation]]:
+    """
+    Split operations into runs that can share a statement: consecutive, of
+    the same kind, batchable, and never touching the same row twice.
+    """
+    groups: List[List[PreparedOperation]] = []
+    keys: set = set()
+    for prepared in ops:
+        current = groups[-1] if groups else None
+        if (
+            current is not None
+            and current[0].kind == prepared.kind
+            and HANDLERS[prepared.kind][1]
+            and _row_key(prepared) not in keys
+        ):
+            current.append(prepared)
+        else:
+            groups.append([prepared])
+            keys = set()
+        keys.add(_row_key(prepared))
+    return groups
+
+
+def _database_error(error: psycopg.Error) -> BatchResult:
+    message = error.diag.message_primary if error.diag else None
+    return BatchResult(index=0, status=409, error=message or str(error))
+
+
+async def _run_group(cur, user: str, group: List[PreparedOperation]) -> List[BatchResult]:
+    handler, _ = HANDLERS[group[0].kind]
+    results = await handler(cur, user, group)
+    for prepared, result in zip(group, results):
+        result.index = prepared.index
+    return results
+
+
+async def run_atomic(conn, user: str, ops: List[PreparedOperation]) -> Tuple[bool, List[BatchResult]]:
+    """Run every operation or none; stops at the first failure"""
+    results: List[BatchResult] = []
+    failed = False
+    async with conn.cursor() as cur:
+        try:
+            async with conn.transaction():
+                for group in group_operations(ops):
+                    if len(group) > 1:
+                        # In a savepoint, so a failed shared statement can be
+                        # retried to find the operations that failed
+                        group_results = await _run_best_effort_group(conn, cur, user, group)
+                    else:
+                        try:
+                            group_results = await _run_group(cur, user, group)
+                        except psycopg.Error as error:
+                            group_results = [_database_error(error)]
+                            group_results[0].index = group[0].index
+                    results.extend(group_results)
+                    if any(result.status >= 400 for result in group_results):
+                        failed = True
+                        raise psycopg.Rollback()
+        except psycopg.Rollback:
+            pass
+
+    if failed:
+        ran = {result.index for result in results}
+        for result in results:
+            if result.status < 400:
+                result.status, result.result, result.error = 424, None, "Rolled back"
+        results.extend(
+            BatchResult(index=prepared.index, status=424, error="Not run")
+            for prepared in ops if prepared.index not in ran
+        )
+    return not failed, results
+
+
+async def run_best_effort(conn, user: str, ops: List[PreparedOperation]) -> List[BatchResult]:
+    """Run every operation, undoing only the ones that fail"""
+    results: List[BatchResult] = []
+    async with conn.cursor() as cur:
+        async with conn.transaction():
+            for group in group_operations(ops):
+                results.extend(await _run_best_effort_group(conn, cur, user, group))
+    return results
+
+
+async def _run_best_effort_group(conn, cur, user: str, group: List[PreparedOperation]) -> List[BatchResult]:
+    try:
+        async with conn.transaction():
+            return await _run_group(cur, user, group)
+    except psycopg.Error as error:
+        if len(group) == 1:
+            result = _database_error(error)
+            result.index = group[0].index
+            return [result]
+    # Find which operations of the shared statement fail on their own
+    results = []
+    for prepared in group:
+        results.extend(await _run_best_effort_group(conn, cur, user, [prepared]))
+    return results
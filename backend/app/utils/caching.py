@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from app.queries.users import GET_USER_DATA_VERSIONS
+
+
+@dataclass
+class CachedBody:
+    """A response body serialized once, with its ETag"""
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Weak ETag derived from the response body.
+
+    Weak because CompressionMiddleware may send the body brotli- or
+    gzip-encoded under the same tag, so the bytes are not always identical.
+    """
+    return 'W/"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def make_version_etag(kind: str, version: int, *scope) -> str:
+    """
+    Weak ETag for a per-user list, from the user's data version for that kind.
+
+    `scope` (the user and the query string) is hashed in, so different users
+    or filters never share a tag.
+    """
+    digest = hashlib.sha256("|".join(str(part) for part in scope).encode()).hexdigest()[:16]
+    return f'W/"{kind}-{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (which may list several tags) against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    """
+    Holds one serialized response for `ttl` seconds.
+
+    Concurrent misses share a single load, so an expiry never sends a burst
+    of identical queries to the database.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entry: Optional[CachedBody] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Drop the cached body; the next request reloads it"""
+        self._entry = None
+
+    def _fresh(self) -> Optional[CachedBody]:
+        entry = self._entry
+        if entry is not None and entry.expires_at > time.monotonic():
+            return entry
+        return None
+
+    async def get_or_load(self, load: Callable[[], Awaitable[bytes]]) -> CachedBody:
+        entry = self._fresh()
+        if entry is not None:
+            return entry
+        async with self._lock:
+            entry = self._fresh()
+            if entry is None:
+                body = await load()
+                entry = CachedBody(body, make_etag(body), time.monotonic() + self.ttl)
+                self._entry = entry
+            return entry
+
+
+async def get_data_versions(cur, user_email: str) -> dict:
+    """Return the user's data versions, which the database bumps on every change"""
+    await cur.execute(GET_USER_DATA_VERSIONS, (user_email,))
+    versions = await cur.fetchone()
+    return versions or {"applications_version": 0, "contacts_version": 0}
@@ -0,0 +1,132 @@
+"""
+Per-user change events, fanned out from Postgres NOTIFY.
+
+Triggers publish one event per statement and affected user on the
+user_changes channel (see init.sql). Each worker holds a single LISTEN
+connection and hands every event to the queues of that user's connected
+clients, so any number of workers and nodes see every change.
+
+Events are not stored: a client whose queue overflows, or any client while
+the listener reconnects, gets a "resync" event and should revalidate its
+lists (cheap, thanks to the ETags).
+
+Changes to shared reference data (events without a user) go to handlers
+registered with add_handler() instead, e.g. to drop an in-memory cache.
+Handlers also get the resync event after a reconnect.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Set
+import psycopg
+from app.config import settings
+
+CHANNEL = "user_changes"
+RESYNC = {"resource": "all", "op": "resync"}
+
+
+class ChangeStream:
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or settings.CHANGE_STREAM_QUEUE_SIZE
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        # resource -> callbacks for its shared (user-less) change events
+        self._handlers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self._task: Optional[asyncio.Task] = None
+        self._connected: Optional[asyncio.Event] = None
+
+    async def start(self):
+        """Start listening; returns once the LISTEN connection is up, or after DB_POOL_TIMEOUT"""
+        self._connected = asyncio.Event()
+        self._task = asyncio.create_task(self._listen(), name="change-stream-listener")
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=settings.DB_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen(self):
+        delay = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    settings.DATABASE_URL or "", autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    if self._connected.is_set():
+                        # Events may have been missed while reconnecting
+                        self._broadcast(RESYNC)
+                        for handlers in self._handlers.values():
+                            for handler in handlers:
+                                handler(RESYNC)
+                    self._connected.set()
+                    delay = 1.0
+                    async for notify in conn.notifies():
+                        self._dispatch(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    def add_handler(self, resource: str, handler: Callable[[dict], None]):
+        """Call `handler` in this worker for every shared change to `resource`"""
+        self._handlers[resource].append(handler)
+
+    def _dispatch(self, payload: str):
+        try:
+            event = json.loads(payload)
+            user = event.pop("user", None)
+            resource = event["resource"]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return
+        if user is None:
+            for handler in self._handlers.get(resource, ()):
+                handler(event)
+            return
+        for queue in self._subscribers.get(user, ()):
+            self._offer(queue, event)
+
+    def _broadcast(self, event: dict):
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._offer(queue, event)
+
+    def _offer(self, queue: asyncio.Queue, event: dict):
+        """Queue an event; a client that has fallen behind gets one resync instead"""
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+    @asynccontextmanager
+    async def subscribe(self, user: str):
+        """A queue receiving the user's change events until the block exits"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user]
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+change_stream = ChangeStream()
+
+
+def format_event(event: dict, event_type: str = "change") -> str:
+    """One Server-Sent Events message"""
+    return f"event: {event_type}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
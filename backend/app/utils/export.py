@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, List
+
+APPLICATION_FIELDS = [
+    "id", "company", "position", "status", "date", "priority",
+    "matched_skills", "required_skills",
+]
+TIMELINE_FIELDS = ["timeline_id", "timeline_status", "timeline_date", "timeline_notes"]
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(value)
+    return value
+
+
+def _csv_chunk(rows: Iterable[List]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_csv(batches: AsyncIterator[List[dict]]) -> AsyncIterator[str]:
+    """
+    Write one CSV line per timeline entry, repeating the application columns.
+    Skill lists are joined with ';'.
+    """
+    fields = APPLICATION_FIELDS + TIMELINE_FIELDS
+    yield _csv_chunk([fields])
+    async for rows in batches:
+        yield _csv_chunk([_csv_value(row[field]) for field in fields] for row in rows)
+
+
+async def stream_ndjson(batches: AsyncIterator[List[dict]]) -> AsyncIterator[str]:
+    """
+    Write one JSON object per application with its timeline entries nested.
+
+    Rows arrive ordered by application, so only the application currently
+    being assembled is held in memory, even across batch boundaries.
+    """
+    current = None
+    async for rows in batches:
+        lines = []
+        for row in rows:
+            if current is None or current["id"] != row["id"]:
+                if current is not None:
+                    lines.append(json.dumps(current, default=str))
+                current = {field: row[field] for field in APPLICATION_FIELDS}
+                current["timeline"] = []
+            if row["timeline_id"] is not None:
+                current["timeline"].append({
+                    "id": row["timeline_id"],
+                    "status": row["timeline_status"],
+                    "date": row["timeline_date"],
+                    "notes": row["timeline_notes"],
+                })
+        if lines:
+            yield "\n".join(lines) + "\n"
+    if current is not None:
+        yield json.dumps(current, default=str) + "\n"
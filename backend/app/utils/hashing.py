@@ -1,7 +1,21 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the
+# event loop free without the overhead of a process pool
+_executor = ThreadPoolExecutor(
+    max_workers=settings.HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_pending = 0
+
+
 def hash_password(password: str) -> str:
     """Hashes a plain-text password."""
 
@@ -9,5 +23,77 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain-text password against a hashed password."""
-    
+
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Run a hashing call on the worker pool.
+
+    Rejects the call with a 503 once HASH_MAX_PENDING calls are queued or
+    running, so a burst of logins sheds load instead of piling up.
+    """
+    global _pending
+    if _pending >= settings.HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hashes a plain-text password without blocking the event loop."""
+
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password without blocking the event loop.
+
+    Returns (valid, new_hash), where new_hash is set when the stored hash uses
+    outdated parameters and should be replaced.
+    """
+
+    return await _run_in_hash_pool(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+def calibrate_work_factor(target_ms: Optional[float] = None) -> int:
+    """
+    Pick the bcrypt cost whose hashing time is closest to, without exceeding,
+    the target latency, and make it the default and minimum for the context.
+
+    Each extra round doubles the work, so one timing at the floor is enough
+    to extrapolate.
+    """
+    target_ms = target_ms if target_ms is not None else settings.HASH_TARGET_MS
+    rounds = settings.HASH_MIN_ROUNDS
+    start = time.perf_counter()
+    pwd_context.handler("bcrypt").using(rounds=rounds).hash("calibration")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    while rounds < 31 and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    return rounds
+
+
+async def calibrate_work_factor_async() -> int:
+    """Run the work factor calibration on the hashing pool."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, calibrate_work_factor)
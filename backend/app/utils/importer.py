@@ -0,0 +1,56 @@
+import csv
+import io
+from typing import List, Tuple
+from pydantic import ValidationError
+from app.models.applications import JobApplicationCreate
+
+PRIORITIES = ("High", "Medium", "Low")
+# Column limits from init.sql, checked up front so one bad row can't abort the COPY
+MAX_LENGTHS = {"company": 200, "position": 200, "status": 50}
+SKILL_FIELDS = ("matched_skills", "required_skills")
+
+
+def parse_csv(text: str) -> List[dict]:
+    """Parse CSV rows, splitting ';'-separated skill columns into lists"""
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        for field in SKILL_FIELDS:
+            if field in row:
+                row[field] = [s.strip() for s in (row[field] or "").split(";") if s.strip()]
+        rows.append(row)
+    return rows
+
+
+def validate_rows(rows: list) -> Tuple[List[Tuple[int, JobApplicationCreate]], List[dict]]:
+    """
+    Validate import rows independently.
+
+    Returns the valid rows with their 1-based row numbers, and one error entry
+    per invalid row so the rest of the batch can still be loaded.
+    """
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({"row": number, "errors": ["row must be an object"]})
+            continue
+        try:
+            job = JobApplicationCreate(**row)
+        except ValidationError as exc:
+            messages = [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in exc.errors()
+            ]
+            errors.append({"row": number, "errors": messages})
+            continue
+
+        messages = []
+        if job.priority not in PRIORITIES:
+            messages.append(f"priority: must be one of {', '.join(PRIORITIES)}")
+        for field, limit in MAX_LENGTHS.items():
+            if len(getattr(job, field)) > limit:
+                messages.append(f"{field}: must be at most {limit} characters")
+        if messages:
+            errors.append({"row": number, "errors": messages})
+        else:
+            valid.append((number, job))
+    return valid, errors
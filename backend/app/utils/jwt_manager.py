@@ -1,4 +1,8 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import HTTPException, status, Depends, Request
 import jwt
 from jwt.exceptions import InvalidTokenError
@@ -6,6 +10,61 @@ from fastapi.security import OAuth2PasswordBearer
 from app.config import settings
 
 
+class VerifiedTokenCache:
+    """
+    LRU cache of tokens whose signature has already been verified.
+
+    Entries are keyed by a SHA-256 digest of the token (so raw tokens are not
+    kept in memory) and are dropped once the token's `exp` has passed.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached subject for a token digest, or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            subject, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return subject
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: bytes, subject: str, expires_at: float):
+        """Cache a verified token until its expiry, evicting the least recently used"""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (subject, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE)
 
 
 def get_current_user(request: Request) -> dict:
@@ -18,7 +77,7 @@ def get_current_user(request: Request) -> dict:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="Missing authentication token")
     try:
-        token = token.replace("Bearer ", "")
+        token = token.removeprefix("Bearer ")
         payload = verify_access_token(token)
         # Return the decoded JWT payload (e.g., {"sub": "username"})
         return payload
@@ -43,18 +102,33 @@ def create_access_token(data: dict) -> str:
 
 
 def verify_access_token(token: str) -> dict:
-    """Validates a JWT token and returns the decoded payload."""
+    """
+    Validates a JWT token and returns the decoded payload.
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    Tokens verified before are served from the in-process cache until they
+    expire, skipping signature verification.
+    """
+
+    key = token_cache.key(token)
+    email = token_cache.get(key)
+    if email:
+        return email
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        if not email:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return email  # Use email as the user identifier
     except InvalidTokenError:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    email = payload.get("sub")
+    if not email:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if "exp" in payload:
+        token_cache.put(key, email, float(payload["exp"]))
+    return email  # Use email as the user identifier
+
+
+def get_token_cache_stats() -> dict:
+    """Return hit/miss counters for the verified-token cache"""
+    return token_cache.stats()
@@ -0,0 +1,244 @@
+"""
+In-process metrics exposed to signed-in users at /metrics in the Prometheus
+text format.
+
+Requests are recorded per route template (so /api/applications/{job_id}
+is one series, not one per id) and queries per registered statement (see
+app/utils/statements.py), with unregistered ones grouped under "other".
+Each worker process keeps its own counts.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Sequence, Tuple
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.utils.statements import find_statement
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+# Latency buckets in seconds, from a cached lookup to a slow export
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # labels -> [per-bucket counts, sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, bucket_counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = 'le="{}"'.format(_format_value(bound))
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {count}"
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route"),
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds", "Database statement latency by query name", ("query",),
+)
+db_query_rows_total = Counter(
+    "db_query_rows_total", "Rows returned or affected by query name", ("query",),
+)
+db_query_errors_total = Counter(
+    "db_query_errors_total", "Failed database statements by query name", ("query",),
+)
+db_slow_queries_total = Counter(
+    "db_slow_queries_total", "Statements slower than SLOW_QUERY_MS by query name", ("query",),
+)
+
+METRICS = (
+    http_requests_total,
+    http_request_duration_seconds,
+    db_query_duration_seconds,
+    db_query_rows_total,
+    db_query_errors_total,
+    db_slow_queries_total,
+)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+def render_cache_stats(name: str, stats: dict) -> str:
+    """An in-process cache's stats() (size, maxsize, hits, misses) in the same format"""
+    lines = []
+    for key, kind, documentation in (
+        ("size", "gauge", "Entries currently cached"),
+        ("maxsize", "gauge", "Most entries the cache holds"),
+        ("hits", "counter", "Lookups answered from the cache"),
+        ("misses", "counter", "Lookups not answered from the cache"),
+    ):
+        metric = f"{name}_{key}_total" if kind == "counter" else f"{name}_{key}"
+        lines += [
+            f"# HELP {metric} {documentation}",
+            f"# TYPE {metric} {kind}",
+            f"{metric} {_format_value(stats[key])}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    for metric in METRICS:
+        metric.clear()
+
+
+def query_name(query) -> str:
+    """The constant a statement was taken from, or "other" for inline SQL"""
+    statement = find_statement(query)
+    return statement.name if statement is not None else "other"
+
+
+def record_query(query, seconds: float, rows: int = -1, error: bool = False):
+    """Record one statement's latency, rows and outcome, and log it if slow"""
+    name = query_name(query)
+    db_query_duration_seconds.observe(seconds, name)
+    if error:
+        db_query_errors_total.inc(name)
+    elif rows > 0:
+        db_query_rows_total.inc(name, amount=rows)
+
+    threshold_ms = settings.SLOW_QUERY_MS
+    if threshold_ms > 0 and seconds * 1000 >= threshold_ms:
+        db_slow_queries_total.inc(name)
+        slow_query_logger.warning(
+            "Slow query %s took %.1f ms: %s",
+            name, seconds * 1000, " ".join(str(query).split())[:500],
+        )
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that handles a request"""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record the count, status and latency of every HTTP request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = route_template(scope)
+            http_requests_total.inc(scope["method"], route, str(status_code))
+            http_request_duration_seconds.observe(elapsed, scope["method"], route)
@@ -0,0 +1,73 @@
+"""
+Send reads to replicas without clients ever missing their own writes.
+
+GET and HEAD requests may read from a replica; every other method uses the
+primary. Responses to those other methods set a short-lived cookie, and
+while it is valid the client's reads stay on the primary too, so they never
+land on a replica that has not replayed the write yet. The cookie travels
+with the client, so this holds whichever worker or node serves the next
+request.
+"""
+import time
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.database import reset_read_routing, set_read_routing
+
+COOKIE_NAME = "db_primary_until"
+READ_METHODS = {"GET", "HEAD"}
+
+
+def reads_from_replica(method: str, cookie_header: str, now: float) -> bool:
+    """Whether a request may read from a replica"""
+    if method not in READ_METHODS:
+        return False
+    primary_until = cookie_parser(cookie_header).get(COOKIE_NAME)
+    try:
+        return primary_until is None or float(primary_until) <= now
+    except ValueError:
+        return True
+
+
+def sticky_cookie(now: float) -> bytes:
+    """Set-Cookie value keeping the client's reads on the primary for a while"""
+    window = settings.REPLICA_STICKY_SECONDS
+    return (
+        f"{COOKIE_NAME}={now + window:.3f}; Max-Age={int(window) + 1}; "
+        "Path=/; HttpOnly; SameSite=Lax"
+    ).encode()
+
+
+class ReadRoutingMiddleware:
+    """Route each request's connections to a replica or the primary"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.REPLICA_URLS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        cookie_header = ""
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookie_header = value.decode("latin-1")
+                break
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", sticky_cookie(time.time())))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = set_read_routing(reads_from_replica(method, cookie_header, time.time()))
+        try:
+            if method in READ_METHODS:
+                await self.app(scope, receive, send)
+            else:
+                await self.app(scope, receive, send_with_cookie)
+        finally:
+            reset_read_routing(token)
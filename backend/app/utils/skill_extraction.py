@@ -0,0 +1,92 @@
+"""
+Extract required skills from a job description.
+
+Extractors are looked up by name (settings.SKILL_EXTRACTOR). "keyword" scans
+the description for spellings in the skill vocabulary and needs nothing but
+this process; "llm" asks the OpenAI integration and keeps whatever skills it
+names, canonicalized.
+"""
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Type
+from app.utils.skills import canonical_skill, normalize_skills
+
+_WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#./-]*")
+# Longest phrase in the vocabulary, in words ("continuous integration")
+_MAX_WORDS = 3
+
+
+class SkillExtractor(ABC):
+    @abstractmethod
+    async def extract(self, description: str, user_email: str) -> List[str]:
+        """The canonical skills a job description asks for"""
+
+
+class KeywordExtractor(SkillExtractor):
+    """Match words and short phrases against the skill vocabulary and its aliases"""
+
+    async def extract(self, description: str, user_email: str) -> List[str]:
+        return extract_keywords(description)
+
+
+def extract_keywords(description: str) -> List[str]:
+    """Known skills mentioned in the text, in order of first mention"""
+    words = []
+    for word in _WORD.findall(description):
+        word = word.rstrip(".-/")
+        # "AWS/GCP" lists two skills, "CI/CD" is one
+        if "/" in word and canonical_skill(word) is None:
+            words.extend(part for part in word.split("/") if part)
+        else:
+            words.append(word)
+    found = []
+    i = 0
+    while i < len(words):
+        for size in range(min(_MAX_WORDS, len(words) - i), 0, -1):
+            phrase = " ".join(words[i:i + size])
+            skill = canonical_skill(phrase)
+            # One- and two-letter spellings ("go", "ml") are only skills when
+            # written with capitals, not as ordinary words
+            if skill and (len(phrase) > 2 or not phrase.islower()):
+                found.append(skill)
+                i += size
+                break
+        else:
+            i += 1
+    return normalize_skills(found)
+
+
+class LLMExtractor(SkillExtractor):
+    """Ask the model for the skills as a JSON array of strings"""
+
+    system_prompt = (
+        "You extract the technical skills a job description requires. Reply with "
+        "only a JSON array of short skill names, e.g. [\"Python\", \"AWS\"]."
+    )
+
+    async def extract(self, description: str, user_email: str) -> List[str]:
+        # Imported here so the keyword extractor works without an OpenAI setup
+        from app.openai.connection import complete
+
+        reply = await complete(description, user_email, system=self.system_prompt)
+        start, end = reply.find("["), reply.rfind("]")
+        if start < 0 or end < start:
+            raise ValueError("Model reply did not contain a JSON array")
+        skills = json.loads(reply[start:end + 1])
+        if not isinstance(skills, list):
+            raise ValueError("Model reply was not a JSON array")
+        return normalize_skills(str(skill) for skill in skills)
+
+
+EXTRACTORS: Dict[str, Type[SkillExtractor]] = {
+    "keyword": KeywordExtractor,
+    "llm": LLMExtractor,
+}
+
+
+def get_extractor(name: str) -> SkillExtractor:
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown skill extractor {name!r}; choose from {sorted(EXTRACTORS)}")
@@ -0,0 +1,105 @@
+"""
+Worker pool for skill extraction jobs.
+
+Jobs live in skill_extraction_jobs, so they survive restarts and any number
+of workers (in any number of processes) can share the queue: each claim
+takes due jobs with FOR UPDATE SKIP LOCKED and commits at once, and the
+extraction itself runs outside any transaction. Failed attempts are retried
+with exponential backoff until SKILL_JOB_MAX_ATTEMPTS, and so are jobs whose
+worker died mid-attempt (its lease expired), up to the same limit.
+"""
+import asyncio
+import random
+from typing import List, Optional
+from app.config import settings
+from app.database import get_db_connection
+from app.queries.skill_jobs import (
+    CLAIM_SKILL_JOBS,
+    COMPLETE_SKILL_JOB,
+    FAIL_SKILL_JOB,
+    RETRY_SKILL_JOB,
+)
+from app.utils.skill_extraction import SkillExtractor, get_extractor
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next attempt: doubled per attempt, with jitter"""
+    return settings.SKILL_JOB_BACKOFF * 2 ** (attempts - 1) * random.uniform(0.5, 1.5)
+
+
+class SkillJobWorker:
+    def __init__(
+        self,
+        extractor: Optional[SkillExtractor] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.extractor = extractor or get_extractor(settings.SKILL_EXTRACTOR)
+        self.concurrency = settings.SKILL_WORKERS if concurrency is None else concurrency
+        self.poll_interval = poll_interval or settings.SKILL_JOB_POLL_INTERVAL
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"skill-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. the database is briefly unreachable; try again later
+                processed = 0
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> int:
+        """Claim and run at most one job; return how many were run"""
+        async with get_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(CLAIM_SKILL_JOBS, {
+                    "lease": settings.SKILL_JOB_LEASE,
+                    "max_attempts": settings.SKILL_JOB_MAX_ATTEMPTS,
+                    "limit": 1,
+                })
+                jobs = await cur.fetchall()
+                await conn.commit()
+
+        for job in jobs:
+            await self._process(job)
+        return len(jobs)
+
+    async def _process(self, job: dict):
+        try:
+            skills = await self.extractor.extract(job["description"], job["user_email"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            await self._record_failure(job, f"{type(error).__name__}: {error}")
+            return
+
+        async with get_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(COMPLETE_SKILL_JOB, {"job_id": job["id"], "skills": skills})
+                await conn.commit()
+
+    async def _record_failure(self, job: dict, error: str):
+        async with get_db_connection() as conn:
+            async with conn.cursor() as cur:
+                if job["attempts"] >= settings.SKILL_JOB_MAX_ATTEMPTS:
+                    await cur.execute(FAIL_SKILL_JOB, (error, job["id"]))
+                else:
+                    await cur.execute(
+                        RETRY_SKILL_JOB, (retry_delay(job["attempts"]), error, job["id"])
+                    )
+                await conn.commit()
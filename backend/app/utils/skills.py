@@ -0,0 +1,112 @@
+"""
+Canonical skill vocabulary and matching.
+
+Skills are compared by key: lower-cased with everything but letters, digits,
+'+' and '#' removed, so "Node.js", "NodeJS" and "node js" are the same skill.
+Known aliases are folded to one canonical spelling before anything is stored.
+The skill_key / match_skills SQL functions in init.sql mirror this module.
+"""
+from typing import Dict, Iterable, List, Optional
+
+# Canonical name -> alternative spellings (beyond case and punctuation)
+SKILL_VOCABULARY: Dict[str, List[str]] = {
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "TypeScript": ["ts"],
+    "Python": ["py", "python3"],
+    "Java": [],
+    "Go": ["golang"],
+    "Rust": [],
+    "C": [],
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "Ruby": [],
+    "PHP": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Scala": [],
+    "SQL": [],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "SVG": [],
+    "React": ["reactjs"],
+    "React Native": [],
+    "Redux": [],
+    "Angular": ["angularjs"],
+    "Vue.js": ["vue", "vue3"],
+    "Next.js": ["next"],
+    "Svelte": [],
+    "D3.js": ["d3"],
+    "Node.js": ["node"],
+    "Express": ["expressjs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring": ["springboot", "spring boot"],
+    ".NET": ["dotnet"],
+    "Ruby on Rails": ["rails", "ror"],
+    "GraphQL": ["gql"],
+    "REST": ["restapi", "restful"],
+    "PostgreSQL": ["postgres", "psql"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic"],
+    "Kafka": ["apache kafka"],
+    "Databases": [],
+    "AWS": ["amazon web services"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Azure": ["microsoft azure"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Jenkins": [],
+    "CI/CD": ["ci", "cd", "continuous integration"],
+    "Linux": [],
+    "Git": [],
+    "TensorFlow": [],
+    "TensorFlow.js": ["tfjs"],
+    "PyTorch": ["torch"],
+    "Machine Learning": ["ml"],
+    "Testing": ["unit testing"],
+    "Design": [],
+    "Mobile Development": ["mobile"],
+}
+
+
+def skill_key(name: str) -> str:
+    """Fold case and punctuation so spellings of the same skill compare equal"""
+    return "".join(ch for ch in name.lower() if ch.isalnum() or ch in "+#")
+
+
+_CANONICAL: Dict[str, str] = {}
+for _name, _aliases in SKILL_VOCABULARY.items():
+    for _spelling in [_name, *_aliases]:
+        _CANONICAL[skill_key(_spelling)] = _name
+
+
+def canonical_skill(name: str) -> Optional[str]:
+    """Return the canonical spelling of a known skill, or None if it is not in the vocabulary"""
+    return _CANONICAL.get(skill_key(name))
+
+
+def normalize_skill(name: str) -> str:
+    """Return the canonical spelling of a skill; unknown skills are only trimmed"""
+    return _CANONICAL.get(skill_key(name), " ".join(name.split()))
+
+
+def normalize_skills(names: Iterable[str]) -> List[str]:
+    """Canonicalize a list of skills, dropping blanks and duplicates but keeping order"""
+    skills, seen = [], set()
+    for name in names or []:
+        skill = normalize_skill(name)
+        key = skill_key(skill)
+        if key and key not in seen:
+            seen.add(key)
+            skills.append(skill)
+    return skills
+
+
+def match_skills(user_skills: Iterable[str], required_skills: Iterable[str]) -> List[str]:
+    """Return the required skills the user has, in the order they were required"""
+    keys = {skill_key(skill) for skill in user_skills or []}
+    return [skill for skill in required_skills or [] if skill_key(skill) in keys]
@@ -0,0 +1,91 @@
+"""
+Registry of every SQL statement the app sends.
+
+Statements are the upper-case string constants of the app.queries modules;
+handlers pass those constants to cur.execute() rather than inline SQL. The
+registry collects them once, keyed by their text, so that:
+
+- pooled cursors prepare a registered statement server-side the first time
+  each connection runs it, and reuse the plan from then on (except for
+  statements marked REPLAN, which are never prepared)
+- query metrics are labelled with the statement's name
+- `python -m app.utils.statements` lists them all for review
+"""
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Statements the server can prepare (COPY, for one, cannot)
+PREPARABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# Statements opening with this comment are planned on every execution: their
+# optional filters ("%(x)s IS NULL OR ...") only pick the right index under a
+# plan made for the parameters actually sent, which a prepared statement's
+# generic plan is not
+REPLAN = "/* replan */"
+
+
+@dataclass(frozen=True)
+class Statement:
+    name: str
+    module: str
+    sql: str
+
+    @property
+    def replan(self) -> bool:
+        return self.sql.lstrip().startswith(REPLAN)
+
+    @property
+    def preparable(self) -> bool:
+        return not self.replan and self.sql.lstrip().upper().startswith(PREPARABLE)
+
+
+_statements: Optional[Dict[str, Statement]] = None
+
+
+def _load_statements() -> Dict[str, Statement]:
+    import app.queries
+
+    statements = {}
+    for module_info in pkgutil.iter_modules(app.queries.__path__):
+        module = importlib.import_module(f"app.queries.{module_info.name}")
+        for attr, value in vars(module).items():
+            if attr.isupper() and isinstance(value, str):
+                duplicate = statements.get(value)
+                if duplicate is not None:
+                    raise RuntimeError(
+                        f"{module.__name__}.{attr} repeats {duplicate.module}.{duplicate.name}"
+                    )
+                statements[value] = Statement(attr, module.__name__, value)
+    return statements
+
+
+def _registry() -> Dict[str, Statement]:
+    global _statements
+    if _statements is None:
+        _statements = _load_statements()
+    return _statements
+
+
+def get_statements() -> List[Statement]:
+    """Every registered statement, ordered by module and name"""
+    return sorted(_registry().values(), key=lambda statement: (statement.module, statement.name))
+
+
+def find_statement(query) -> Optional[Statement]:
+    """The registered statement with this text, if any"""
+    if isinstance(query, str):
+        return _registry().get(query)
+    return None
+
+
+def prepared_max() -> int:
+    """Prepared statements each connection keeps: all registered ones, plus room for others"""
+    return sum(statement.preparable for statement in _registry().values()) + 50
+
+
+if __name__ == "__main__":
+    for statement in get_statements():
+        flag = "" if statement.preparable else "  (not prepared)"
+        print(f"-- {statement.module}.{statement.name}{flag}")
+        print(statement.sql.strip(), end="\n\n")
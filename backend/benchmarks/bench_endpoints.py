@@ -0,0 +1,325 @@
+"""
+Endpoint load test and latency benchmark.
+
+Starts the app with uvicorn against the database from DATABASE_URL, seeds
+users with applications and contacts, then runs a mixed workload (login,
+list applications, add timeline entries, contacts CRUD) from concurrent
+virtual users for a fixed duration. Prints throughput and p50/p95/p99
+latency of successful (2xx) requests per endpoint as JSON, with failed
+requests counted separately.
+
+With --baseline the results are compared against a stored run and the
+command exits non-zero if any endpoint's p95 latency rose, or its
+throughput fell, by more than --tolerance.
+
+Run from the backend directory:
+    python -m benchmarks.bench_endpoints --concurrency 20 --duration 30
+    python -m benchmarks.bench_endpoints --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_endpoints --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+import httpx
+
+PASSWORD = "password"
+
+# An application has at most one timeline entry per status, so each entry
+# added takes a status the application does not have yet
+TIMELINE_STATUSES = (
+    "Applied", "Initial Screen", "Technical Interview", "Final Interview", "Offer", "Accepted",
+)
+
+# Relative frequency of each operation in the mixed workload
+WORKLOAD = {
+    "list_applications": 40,
+    "get_application": 15,
+    "add_timeline_entry": 15,
+    "list_contacts": 10,
+    "contacts_crud": 15,
+    "login": 5,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=os.environ.copy(),
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+def make_application(rng: random.Random) -> dict:
+    return {
+        "company": f"Company {rng.randrange(200)}",
+        "position": rng.choice(["Software Engineer", "Data Scientist", "Frontend Developer"]),
+        "status": rng.choice(["Applied", "Initial Screen", "Technical Interview", "Offer"]),
+        "date": f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+        "priority": rng.choice(["High", "Medium", "Low"]),
+        "required_skills": rng.sample(["React", "TypeScript", "AWS", "PostgreSQL", "Python"], 3),
+    }
+
+
+def make_contact(rng: random.Random) -> dict:
+    return {
+        "name": f"Contact {rng.randrange(10000)}",
+        "role": "Recruiter",
+        "company": f"Company {rng.randrange(200)}",
+        "linkedin": "https://linkedin.com/in/example",
+        "email": "contact@example.com",
+        "phone": "555-0100",
+    }
+
+
+class VirtualUser:
+    """One signed-in user with its own session cookie and seeded data"""
+
+    def __init__(self, base_url: str, seed: int):
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=30)
+        self.rng = random.Random(seed)
+        self.email = f"bench_{uuid.uuid4().hex[:12]}@example.com"
+        self.job_ids: List[int] = []
+        # Application -> statuses it has no timeline entry for yet
+        self.open_statuses: Dict[int, List[str]] = {}
+
+    async def seed(self, applications: int, contacts: int):
+        response = await self.client.post(
+            "/auth/register",
+            json={"username": "Bench", "email": self.email, "password": PASSWORD},
+        )
+        response.raise_for_status()
+        rows = [make_application(self.rng) for _ in range(applications)]
+        response = await self.client.post("/api/applications/import", json=rows)
+        response.raise_for_status()
+        self.job_ids = response.json()["ids"]
+        for job_id, row in zip(self.job_ids, rows):
+            self.track_statuses(job_id, row["status"])
+        for _ in range(contacts):
+            (await self.client.post("/api/contacts", json=make_contact(self.rng))).raise_for_status()
+
+    def track_statuses(self, job_id: int, status: str):
+        statuses = [other for other in TIMELINE_STATUSES if other != status]
+        self.rng.shuffle(statuses)
+        self.open_statuses[job_id] = statuses
+
+    async def prepare_timeline_entry(self):
+        """Untimed setup: make sure some application can take another entry"""
+        if self.open_statuses:
+            return
+        job = make_application(self.rng)
+        response = await self.client.post("/api/applications", json=job)
+        response.raise_for_status()
+        self.track_statuses(response.json()["id"], job["status"])
+
+    async def login(self):
+        return await self.client.post(
+            "/auth/login", data={"username": self.email, "password": PASSWORD}
+        )
+
+    async def list_applications(self):
+        return await self.client.get("/api/applications", params={"limit": 50})
+
+    async def get_application(self):
+        return await self.client.get(f"/api/applications/{self.rng.choice(self.job_ids)}")
+
+    async def add_timeline_entry(self):
+        job_id = self.rng.choice(list(self.open_statuses))
+        statuses = self.open_statuses[job_id]
+        status = statuses.pop()
+        if not statuses:
+            del self.open_statuses[job_id]
+        return await self.client.post(
+            f"/api/applications/{job_id}/timeline",
+            json={"status": status, "application_id": job_id, "notes": "bench"},
+        )
+
+    async def list_contacts(self):
+        return await self.client.get("/api/contacts")
+
+    async def contacts_crud(self):
+        """Create, update and delete a contact; each call is timed on its own"""
+        timings = []
+        start = time.perf_counter()
+        response = await self.client.post("/api/contacts", json=make_contact(self.rng))
+        timings.append(("create_contact", time.perf_counter() - start, response.status_code))
+        if response.status_code != 200:
+            return timings
+        contact_id = response.json()["id"]
+
+        start = time.perf_counter()
+        response = await self.client.put(
+            f"/api/contacts/{contact_id}", json=make_contact(self.rng)
+        )
+        timings.append(("update_contact", time.perf_counter() - start, response.status_code))
+
+        start = time.perf_counter()
+        response = await self.client.delete(f"/api/contacts/{contact_id}")
+        timings.append(("delete_contact", time.perf_counter() - start, response.status_code))
+        return timings
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def summarize(samples: Dict[str, List[tuple]], elapsed: float) -> dict:
+    """Latency and throughput of successful requests; failures only counted"""
+    endpoints = {}
+    for name, entries in sorted(samples.items()):
+        latencies = sorted(seconds * 1000 for seconds, status in entries if 200 <= status < 300)
+        failures: Dict[str, int] = defaultdict(int)
+        for _, status in entries:
+            if not 200 <= status < 300:
+                failures[str(status)] += 1
+        endpoints[name] = {
+            "requests": len(latencies),
+            "failures": sum(failures.values()),
+            "failures_by_status": dict(sorted(failures.items())),
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "duration_s": round(elapsed, 1),
+        "requests": total,
+        "failures": sum(endpoint["failures"] for endpoint in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+async def run_user(user: VirtualUser, deadline: float, samples: Dict[str, List[tuple]]):
+    operations, weights = zip(*WORKLOAD.items())
+    while time.monotonic() < deadline:
+        operation = user.rng.choices(operations, weights)[0]
+        if operation == "contacts_crud":
+            for name, seconds, status in await user.contacts_crud():
+                samples[name].append((seconds, status))
+            continue
+        if operation == "add_timeline_entry":
+            await user.prepare_timeline_entry()
+        start = time.perf_counter()
+        try:
+            response = await getattr(user, operation)()
+            status = response.status_code
+        except httpx.TransportError:
+            status = 599
+        samples[operation].append((time.perf_counter() - start, status))
+
+
+async def run(args) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(port, args.workers)
+    try:
+        await wait_until_ready(base_url)
+        users = [VirtualUser(base_url, seed) for seed in range(args.concurrency)]
+        await asyncio.gather(*(user.seed(args.applications, args.contacts) for user in users))
+
+        samples: Dict[str, List[tuple]] = defaultdict(list)
+        start = time.monotonic()
+        deadline = start + args.duration
+        await asyncio.gather(*(run_user(user, deadline, samples) for user in users))
+        elapsed = time.monotonic() - start
+        await asyncio.gather(*(user.close() for user in users))
+    finally:
+        server.terminate()
+        server.wait()
+
+    results = summarize(samples, elapsed)
+    results["config"] = {
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "applications_per_user": args.applications,
+        "contacts_per_user": args.contacts,
+    }
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Endpoints whose p95 latency or throughput regressed beyond the tolerance"""
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']} ms vs baseline {base['p95_ms']} ms"
+            )
+        if base["throughput_rps"] and current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['throughput_rps']} req/s vs baseline {base['throughput_rps']} req/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--applications", type=int, default=200, help="seeded per user")
+    parser.add_argument("--contacts", type=int, default=20, help="seeded per user")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", help="write the results to this file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative regression (default 0.2)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        results["regressions"] = regressions
+        print(json.dumps(results, indent=2))
+        sys.exit(1 if regressions else 0)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
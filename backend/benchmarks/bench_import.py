@@ -0,0 +1,68 @@
+"""
+Bulk import throughput benchmark.
+
+Loads the same synthetic applications through POST /api/applications, one
+request per row, and through POST /api/applications/import in one request,
+and reports rows per second for each. Needs the database from DATABASE_URL.
+
+Run from the backend directory:
+    python -m benchmarks.bench_import [rows]
+"""
+import json
+import sys
+import time
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def make_rows(count: int) -> list:
+    return [
+        {
+            "company": f"Company {i % 500}",
+            "position": "Software Engineer",
+            "status": "Applied",
+            "date": f"2025-01-{i % 28 + 1:02d}",
+            "priority": ("High", "Medium", "Low")[i % 3],
+            "required_skills": ["React", "TypeScript", "AWS", "PostgreSQL"][: i % 4 + 1],
+        }
+        for i in range(count)
+    ]
+
+
+def register(client: TestClient):
+    email = f"bench_{uuid.uuid4().hex[:12]}@example.com"
+    client.post(
+        "/auth/register",
+        json={"username": "Bench", "email": email, "password": "password"},
+    )
+    client.put("/auth/skills", json={"skills": ["React", "AWS"]})
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rows = make_rows(count)
+
+    with TestClient(app) as client:
+        register(client)
+        start = time.perf_counter()
+        for row in rows:
+            client.post("/api/applications", json=row).raise_for_status()
+        per_row = time.perf_counter() - start
+
+        register(client)
+        start = time.perf_counter()
+        response = client.post("/api/applications/import", json=rows)
+        response.raise_for_status()
+        bulk = time.perf_counter() - start
+
+    print(json.dumps({
+        "rows": count,
+        "per_row_api_rows_per_s": round(count / per_row),
+        "bulk_import_rows_per_s": round(count / bulk),
+        "speedup": round(per_row / bulk, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+List response serialization benchmark.
+
+Encodes a page of synthetic job application rows (as the page query returns
+them) the way FastAPI does for a response_model, validating every row and
+encoding with the standard JSON encoder, and the way the list endpoints do
+now, encoding the rows directly with orjson. Also reports the size of the
+body after gzip and brotli.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization [rows] [repeats]
+"""
+import asyncio
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models.applications import JobApplicationResponse
+from app.utils.skills import SKILL_VOCABULARY
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_rows(count: int) -> List[dict]:
+    rng = random.Random(42)
+    skills = list(SKILL_VOCABULARY)
+    start = date(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        required = rng.sample(skills, 5)
+        rows.append({
+            "id": i + 1,
+            "company": f"Company {rng.randrange(500)}",
+            "position": rng.choice(["Software Engineer", "Data Scientist", "Frontend Developer"]),
+            "status": rng.choice(["Applied", "Interview", "Offer", "Rejected"]),
+            "date": start + timedelta(days=rng.randrange(365)),
+            "priority": rng.choice(["High", "Medium", "Low"]),
+            "matched_skills": required[:rng.randrange(6)],
+            "required_skills": required,
+        })
+    return rows
+
+
+def encode_validated(field, rows: List[dict]) -> bytes:
+    """FastAPI's response_model path: validate, serialize, then json.dumps"""
+    content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def encode_fast(rows: List[dict]) -> bytes:
+    """The list endpoints' path: orjson straight from the rows"""
+    return ORJSONResponse(rows).body
+
+
+def best_ms(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows = make_rows(count)
+    field = create_response_field(name="bench", type_=List[JobApplicationResponse])
+
+    validated = encode_validated(field, rows)
+    fast = encode_fast(rows)
+    assert json.loads(validated) == json.loads(fast)
+
+    validated_ms = best_ms(lambda: encode_validated(field, rows), repeats)
+    fast_ms = best_ms(lambda: encode_fast(rows), repeats)
+    sizes = {"identity": len(fast), "gzip": len(gzip.compress(fast, 6))}
+    if brotli is not None:
+        sizes["br"] = len(brotli.compress(fast, quality=5))
+    print(json.dumps({
+        "rows": count,
+        "validated_json_ms": round(validated_ms, 1),
+        "orjson_ms": round(fast_ms, 1),
+        "speedup": round(validated_ms / fast_ms, 1),
+        "body_bytes": sizes,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
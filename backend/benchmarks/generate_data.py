@@ -0,0 +1,332 @@
+"""
+Synthetic data generator for production-sized databases.
+
+Fills users, job_applications, application_timeline, network_contacts and
+role_insights with COPY, in batches of users committed one at a time, so
+query plans and index choices can be checked at realistic sizes:
+
+- applications per user follow a Pareto distribution (most users have a
+  handful, a few have thousands)
+- companies, positions and required skills are drawn from Zipf distributions
+- each application walks the pipeline (Applied, Initial Screen, Technical
+  Interview, Final Interview, Offer, Accepted) and may end Rejected or
+  Withdrawn; every status appears at most once per application, as
+  unique_status_per_application requires, with increasing timestamps
+
+The same --seed always produces the same data. Triggers stay enabled, so the
+skill counts, data versions and pipeline aggregates are kept consistent.
+Generated users share the password "password".
+
+Run from the backend directory (DATABASE_URL must point at the database):
+    python -m benchmarks.generate_data --users 100000 --applications 2000000
+"""
+import argparse
+import bisect
+import itertools
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Sequence
+import psycopg
+from app.config import settings
+from app.queries.applications import RESERVE_JOB_APPLICATION_IDS
+from app.utils.hashing import hash_password
+from app.utils.skills import SKILL_VOCABULARY, match_skills
+
+COPY_USERS = """
+COPY users (username, email, password_hash, created_at, skills) FROM STDIN
+"""
+
+COPY_APPLICATIONS = """
+COPY job_applications (id, user_email, company, position, status, date, priority, matched_skills, required_skills)
+FROM STDIN
+"""
+
+COPY_TIMELINE = """
+COPY application_timeline (application_id, status, date, notes) FROM STDIN
+"""
+
+COPY_CONTACTS = """
+COPY network_contacts (user_email, name, role, company, linkedin, email, phone) FROM STDIN
+"""
+
+# Role insights go through a staging table so re-runs update rather than collide
+STAGE_ROLE_INSIGHTS = """
+CREATE TEMP TABLE role_insights_stage (LIKE role_insights) ON COMMIT DROP
+"""
+
+COPY_ROLE_INSIGHTS = """
+COPY role_insights_stage (role_title, common_skills, average_salary, demand_trend, top_companies)
+FROM STDIN
+"""
+
+MERGE_ROLE_INSIGHTS = """
+INSERT INTO role_insights SELECT * FROM role_insights_stage
+ON CONFLICT (role_title) DO UPDATE
+SET common_skills = EXCLUDED.common_skills, average_salary = EXCLUDED.average_salary,
+    demand_trend = EXCLUDED.demand_trend, top_companies = EXCLUDED.top_companies
+"""
+
+TRUNCATE_TABLES = """
+TRUNCATE users, job_applications, application_timeline, network_contacts, role_insights,
+    skill_application_counts, user_data_versions, pipeline_status_counts,
+    pipeline_weekly_volume, pipeline_stage_reach, pipeline_stage_durations,
+    application_pipeline, skill_extraction_jobs, ai_response_cache
+RESTART IDENTITY
+"""
+
+# Pipeline statuses in order, with the chance of advancing past each one
+PIPELINE = (
+    ("Applied", 0.35),
+    ("Initial Screen", 0.55),
+    ("Technical Interview", 0.45),
+    ("Final Interview", 0.40),
+    ("Offer", 0.70),
+    ("Accepted", 0.0),
+)
+# Chance that an application which stopped advancing ends with an outcome
+OUTCOMES = (("Rejected", 0.6), ("Withdrawn", 0.1))
+
+POSITIONS = (
+    "Software Engineer", "Frontend Developer", "Backend Developer", "Full Stack Developer",
+    "Data Scientist", "Data Engineer", "DevOps Engineer", "Machine Learning Engineer",
+    "Mobile Developer", "Site Reliability Engineer", "QA Engineer", "Product Engineer",
+    "Security Engineer", "Engineering Manager", "Platform Engineer", "UI Developer",
+)
+LEVELS = ("Junior", "", "Senior", "Staff", "Principal", "Lead")
+COMPANY_WORDS = (
+    "Tech", "Cloud", "Data", "Web", "Fin", "Health", "Cyber", "Quantum", "Blue", "Green",
+    "Bright", "Swift", "Nova", "Apex", "Core", "Pixel", "Logic", "Signal", "Vector", "Orbit",
+)
+COMPANY_SUFFIXES = ("Corp", "Systems", "Labs", "Inc", "Solutions", "Works", "Group", "AI")
+CONTACT_ROLES = ("Recruiter", "Hiring Manager", "Engineer", "Engineering Manager", "Director")
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn")
+LAST_NAMES = ("Smith", "Chen", "Garcia", "Patel", "Kim", "Nguyen", "Brown", "Lopez", "Singh", "Cohen")
+
+# Applications are dated in the two years before this day
+EPOCH = date(2025, 1, 1)
+
+
+class Zipf:
+    """Draws items with probability proportional to 1 / rank ** exponent"""
+
+    def __init__(self, items: Sequence, exponent: float = 1.1):
+        self.items = list(items)
+        weights = (1 / rank ** exponent for rank in range(1, len(self.items) + 1))
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def draw(self, rng: random.Random):
+        index = bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])
+        return self.items[min(index, len(self.items) - 1)]
+
+    def sample(self, rng: random.Random, count: int) -> List:
+        """`count` distinct items, the popular ones most likely"""
+        count = min(count, len(self.items))
+        chosen = []
+        while len(chosen) < count:
+            item = self.draw(rng)
+            if item not in chosen:
+                chosen.append(item)
+        return chosen
+
+
+def make_companies(count: int, rng: random.Random) -> List[str]:
+    names = [f"{a}{b} {s}" for a in COMPANY_WORDS for b in COMPANY_WORDS if a != b
+             for s in COMPANY_SUFFIXES]
+    rng.shuffle(names)
+    extra = (f"Company {i}" for i in itertools.count(1))
+    return (names + [next(extra) for _ in range(max(0, count - len(names)))])[:count]
+
+
+def split_skewed(total: int, parts: int, rng: random.Random, alpha: float) -> List[int]:
+    """Split `total` into `parts` Pareto-distributed counts that sum to it"""
+    weights = [rng.paretovariate(alpha) for _ in range(parts)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    # Hand out what rounding down left over, one each to random parts
+    for index in rng.sample(range(parts), min(parts, total - sum(counts))):
+        counts[index] += 1
+    return counts
+
+
+def progression(rng: random.Random) -> List[str]:
+    statuses = []
+    for status, advance in PIPELINE:
+        statuses.append(status)
+        if rng.random() >= advance:
+            break
+    if statuses[-1] != "Accepted":
+        roll = rng.random()
+        for outcome, chance in OUTCOMES:
+            if roll < chance:
+                statuses.append(outcome)
+                break
+            roll -= chance
+    return statuses
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.companies = Zipf(make_companies(args.companies, self.rng))
+        self.skills = Zipf(sorted(SKILL_VOCABULARY, key=lambda _: self.rng.random()))
+        self.positions = Zipf(POSITIONS, exponent=0.8)
+        self.password_hash = hash_password("password")
+        self.counts = dict.fromkeys(
+            ("users", "job_applications", "application_timeline", "network_contacts"), 0
+        )
+
+    def user_row(self, index: int):
+        email = f"{self.args.email_prefix}{index}@example.com"
+        skills = self.skills.sample(self.rng, self.rng.randint(3, 12))
+        created = datetime.combine(EPOCH, datetime.min.time()) - timedelta(
+            days=self.args.days + self.rng.randrange(365)
+        )
+        return (f"User {index}", email, self.password_hash, created, skills), email, skills
+
+    def application_rows(self, job_id: int, email: str, user_skills: List[str]):
+        rng = self.rng
+        applied_on = EPOCH - timedelta(days=rng.randrange(self.args.days))
+        required = self.skills.sample(rng, rng.randint(3, 8))
+        statuses = progression(rng)
+        position = self.positions.draw(rng)
+        level = rng.choice(LEVELS)
+        application = (
+            job_id, email, self.companies.draw(rng), f"{level} {position}".strip(),
+            statuses[-1], applied_on, rng.choice(("High", "Medium", "Medium", "Low")),
+            match_skills(user_skills, required), required,
+        )
+        moment = datetime.combine(applied_on, datetime.min.time()) + timedelta(
+            hours=rng.randrange(8, 20)
+        )
+        timeline = []
+        for status in statuses:
+            timeline.append((job_id, status, moment, rng.choice((None, "", f"{status} notes"))))
+            # Hours to days between stages, with a long tail
+            moment += timedelta(hours=1 + rng.expovariate(1 / 120))
+        return application, timeline
+
+    def contact_row(self, email: str):
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        handle = f"{first}-{last}-{rng.randrange(100000)}".lower()
+        return (
+            email, f"{first} {last}", rng.choice(CONTACT_ROLES), self.companies.draw(rng),
+            f"https://linkedin.com/in/{handle}", f"{handle}@example.com",
+            f"555-{rng.randrange(10000):04d}",
+        )
+
+    def role_insight_rows(self):
+        rng = self.rng
+        for level in LEVELS:
+            for position in POSITIONS:
+                low = rng.randrange(60, 180)
+                yield (
+                    f"{level} {position}".strip(),
+                    self.skills.sample(rng, 4),
+                    f"${low}K - ${low + rng.randrange(20, 60)}K",
+                    rng.choice(("High", "Medium", "Growing", "Low")),
+                    self.companies.sample(rng, 3),
+                )
+
+    def load_batch(self, cur, start: int, applications_per_user: List[int], contacts_per_user: List[int]):
+        users = [self.user_row(start + i) for i in range(len(applications_per_user))]
+        total = sum(applications_per_user)
+        job_ids = []
+        if total:
+            cur.execute(RESERVE_JOB_APPLICATION_IDS, (total,))
+            job_ids = [row[0] for row in cur.fetchall()]
+
+        with cur.copy(COPY_USERS) as copy:
+            for row, _, _ in users:
+                copy.write_row(row)
+
+        timelines = []
+        next_id = iter(job_ids)
+        with cur.copy(COPY_APPLICATIONS) as copy:
+            for (_, email, skills), count in zip(users, applications_per_user):
+                for _ in range(count):
+                    application, timeline = self.application_rows(next(next_id), email, skills)
+                    copy.write_row(application)
+                    timelines.extend(timeline)
+        with cur.copy(COPY_TIMELINE) as copy:
+            for row in timelines:
+                copy.write_row(row)
+
+        contacts = 0
+        with cur.copy(COPY_CONTACTS) as copy:
+            for (_, email, _), count in zip(users, contacts_per_user):
+                for _ in range(count):
+                    copy.write_row(self.contact_row(email))
+                contacts += count
+
+        self.counts["users"] += len(users)
+        self.counts["job_applications"] += total
+        self.counts["application_timeline"] += len(timelines)
+        self.counts["network_contacts"] += contacts
+
+    def run(self, conn):
+        args = self.args
+        with conn.cursor() as cur:
+            if args.truncate:
+                cur.execute(TRUNCATE_TABLES)
+                conn.commit()
+
+            applications = split_skewed(args.applications, args.users, self.rng, args.skew)
+            contacts = split_skewed(args.contacts, args.users, self.rng, args.skew)
+            for start in range(0, args.users, args.batch_size):
+                end = min(start + args.batch_size, args.users)
+                self.load_batch(cur, start, applications[start:end], contacts[start:end])
+                conn.commit()
+                print(f"{end}/{args.users} users", file=sys.stderr)
+
+            cur.execute(STAGE_ROLE_INSIGHTS)
+            with cur.copy(COPY_ROLE_INSIGHTS) as copy:
+                for row in self.role_insight_rows():
+                    copy.write_row(row)
+            cur.execute(MERGE_ROLE_INSIGHTS)
+            self.counts["role_insights"] = cur.rowcount
+            conn.commit()
+
+            if args.analyze:
+                conn.autocommit = True
+                cur.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--applications", type=int, default=200000, help="total across users")
+    parser.add_argument("--contacts", type=int, default=50000, help="total across users")
+    parser.add_argument("--companies", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=730, help="span of application dates")
+    parser.add_argument("--skew", type=float, default=1.5,
+                        help="Pareto shape for rows per user (lower is more skewed)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000, help="users per transaction")
+    parser.add_argument("--email-prefix", default="gen_user_",
+                        help="generated users are <prefix><n>@example.com")
+    parser.add_argument("--truncate", action="store_true",
+                        help="empty every table (including the seed data) first")
+    parser.add_argument("--no-analyze", dest="analyze", action="store_false",
+                        help="skip ANALYZE after loading")
+    args = parser.parse_args()
+
+    generator = Generator(args)
+    start = time.perf_counter()
+    with psycopg.connect(settings.DATABASE_URL) as conn:
+        generator.run(conn)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "seed": args.seed,
+        "rows": generator.counts,
+        "seconds": round(elapsed, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,28 @@
 import os
 import sys
+import uuid
 import pytest
-import psycopg2
+import psycopg
 from pathlib import Path
 
 # Add the root directory to Python path
 root_dir = str(Path(__file__).parent.parent)
 sys.path.insert(0, root_dir)
 
-def init_database():
-    """Initialize test database with schema"""
-    conn = psycopg2.connect(
+def connect():
+    """Open an autocommit connection to the test database"""
+    return psycopg.connect(
         dbname="jobtracker",
         user="jobtracker",
         password="jobtracker",
         host="localhost",
-        port="5432"
+        port="5432",
+        autocommit=True,
     )
-    
-    conn.autocommit = True
+
+def init_database():
+    """Initialize test database with schema"""
+    conn = connect()
     with conn.cursor() as cur:
         # Read and execute initialization SQL
         sql_file = os.path.join(root_dir, '..', 'infrastructure', 'docker', 'init.sql')
@@ -31,4 +35,53 @@ def init_database():
 def setup_test_db():
     """Fixture to set up test database before any tests run"""
     init_database()
-    yield
\ No newline at end of file
+    yield
+
+@pytest.fixture
+def db_cursor():
+    """Cursor for arranging or checking database state directly"""
+    conn = connect()
+    with conn.cursor() as cur:
+        yield cur
+    conn.close()
+
+@pytest.fixture
+def auth_client():
+    """Test client with the app lifespan running, signed in as a fresh user"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        email = f"user_{uuid.uuid4().hex[:12]}@example.com"
+        response = client.post(
+            "/auth/register",
+            json={"username": "Test", "email": email, "password": "password"},
+        )
+        assert response.status_code == 200
+        client.email = email
+        yield client
+
+@pytest.fixture
+def max_queries():
+    """
+    Fail if the block sends more statements than allowed, e.g.
+
+        with max_queries(1):
+            client.get("/api/applications/1")
+    """
+    from contextlib import contextmanager
+    from app.database import add_query_listener, remove_query_listener
+
+    @contextmanager
+    def guard(limit):
+        queries = []
+        add_query_listener(queries.append)
+        try:
+            yield queries
+        finally:
+            remove_query_listener(queries.append)
+        assert len(queries) <= limit, (
+            f"Expected at most {limit} queries, got {len(queries)}:\n" + "\n".join(queries)
+        )
+
+    return guard
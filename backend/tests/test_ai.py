@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from fastapi import HTTPException
+from app.config import settings
+from app.database import close_pool, open_pool
+from app.openai import connection
+
+
+class StubOpenAI(BaseHTTPRequestHandler):
+    """Answers chat completions with the prompt reversed, after `delay` seconds"""
+    calls = 0
+    delay = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).calls += 1
+        time.sleep(self.delay)
+        content = body["messages"][-1]["content"][::-1]
+        payload = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_openai(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubOpenAI.calls, StubOpenAI.delay = 0, 0.0
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    connection._client = None
+    connection.reset_quotas()
+    yield StubOpenAI
+    connection._client = None
+    server.shutdown()
+
+
+def run(scenario):
+    async def with_pool():
+        await open_pool()
+        try:
+            return await scenario()
+        finally:
+            await connection.close_client()
+            await close_pool()
+    return asyncio.run(with_pool())
+
+
+def test_identical_prompts_are_coalesced_and_cached(stub_openai):
+    """Concurrent identical prompts make one call; later ones hit the cache"""
+    stub_openai.delay = 0.2
+    prompt = f"hello {uuid.uuid4().hex}"
+
+    async def scenario():
+        first = await asyncio.gather(*(connection.complete(prompt, "a@example.com") for _ in range(5)))
+        again = await connection.complete(f"  {prompt}\n", "b@example.com")
+        return first, again
+
+    first, again = run(scenario)
+    assert first == [prompt[::-1]] * 5
+    assert again == prompt[::-1]
+    assert stub_openai.calls == 1
+
+
+def test_timeout_returns_fallback(stub_openai, monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_TIMEOUT", 0.1)
+    stub_openai.delay = 1.0
+    prompt = f"slow {uuid.uuid4().hex}"
+
+    result = run(lambda: connection.complete(prompt, "a@example.com", fallback="later"))
+    assert result == "later"
+
+
+def test_user_quota(stub_openai, monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_USER_QUOTA", 2)
+
+    async def scenario():
+        for i in range(2):
+            await connection.complete(f"quota {i} {uuid.uuid4().hex}", "a@example.com")
+        with pytest.raises(HTTPException) as error:
+            await connection.complete(f"quota {uuid.uuid4().hex}", "a@example.com")
+        assert error.value.status_code == 429
+        # Other users have their own quota
+        await connection.complete(f"quota {uuid.uuid4().hex}", "b@example.com")
+
+    run(scenario)
+
+
+def test_cache_write_failure_still_answers(stub_openai, monkeypatch):
+    """A failed cache write is logged; every waiter still gets the answer"""
+    async def broken_store(*args):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(connection, "_store", broken_store)
+    stub_openai.delay = 0.2
+    prompt = f"uncached {uuid.uuid4().hex}"
+
+    async def scenario():
+        return await asyncio.gather(*(connection.complete(prompt, "a@example.com") for _ in range(3)))
+
+    assert run(scenario) == [prompt[::-1]] * 3
+
+
+
+def test_cache_read_failure_goes_upstream(stub_openai, monkeypatch):
+    """A failed cache read is treated as a miss rather than a 500"""
+    async def broken_get_cached(*args):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(connection, "_get_cached", broken_get_cached)
+    prompt = f"unreadable {uuid.uuid4().hex}"
+
+    assert run(lambda: connection.complete(prompt, "a@example.com")) == prompt[::-1]
+    assert stub_openai.calls == 1
+
+def test_joining_an_in_flight_call_is_free(stub_openai, monkeypatch):
+    """Only the caller that starts an upstream call is charged for it"""
+    monkeypatch.setattr(settings, "OPENAI_USER_QUOTA", 1)
+    stub_openai.delay = 0.2
+    prompt = f"shared {uuid.uuid4().hex}"
+
+    async def scenario():
+        started = asyncio.ensure_future(connection.complete(prompt, "a@example.com"))
+        await asyncio.sleep(0.05)
+        # b's quota is used up, but b only joins a's call
+        connection._usage["b@example.com"].append(time.monotonic())
+        return await asyncio.gather(started, connection.complete(prompt, "b@example.com"))
+
+    assert run(scenario) == [prompt[::-1]] * 2
+    assert stub_openai.calls == 1
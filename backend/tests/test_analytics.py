@@ -0,0 +1,64 @@
+def create_application(client, **job):
+    job = {"company": "Acme", "position": "Engineer", "priority": "Medium",
+           "required_skills": [], **job}
+    response = client.post("/api/applications", json=job)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_pipeline_analytics_follow_changes(auth_client, db_cursor):
+    """Aggregates track inserts, updates and deletes, and match a full rebuild"""
+    interviewing = create_application(auth_client, status="Applied", date="2025-01-01")
+    offer = create_application(auth_client, status="Offer", date="2025-01-08")
+    create_application(auth_client, status="Rejected", date="2025-01-09")
+    for status in ("Initial Screen", "Technical Interview"):
+        auth_client.post(
+            f"/api/applications/{interviewing}/timeline",
+            json={"status": status, "application_id": interviewing},
+        )
+    # Spread the timeline out: 48 hours applied, 36 hours in screening
+    db_cursor.execute(
+        """UPDATE application_timeline SET date = CASE status
+               WHEN 'Applied' THEN TIMESTAMP '2025-01-01 00:00'
+               WHEN 'Initial Screen' THEN TIMESTAMP '2025-01-03 00:00'
+               ELSE TIMESTAMP '2025-01-04 12:00' END
+           WHERE application_id = %s""",
+        (interviewing,),
+    )
+
+    analytics = auth_client.get("/api/analytics").json()
+    assert analytics["total"] == 3
+    assert {row["status"]: row["count"] for row in analytics["status_counts"]} == {
+        "Applied": 1, "Offer": 1, "Rejected": 1
+    }
+    assert [(s["stage"], s["reached"], s["conversion_rate"]) for s in analytics["funnel"]] == [
+        ("Applied", 3, None),
+        ("Screen", 2, 0.6667),
+        ("Interview", 2, 1.0),
+        ("Offer", 1, 0.5),
+        ("Accepted", 0, 0.0),
+    ]
+    assert analytics["time_in_stage"] == [
+        {"status": "Applied", "transitions": 1, "median_hours": 48},
+        {"status": "Initial Screen", "transitions": 1, "median_hours": 36},
+    ]
+    assert analytics["weekly_volume"] == [
+        {"week": "2024-12-30", "count": 1},
+        {"week": "2025-01-06", "count": 2},
+    ]
+
+    auth_client.put(
+        f"/api/applications/{offer}",
+        json={"company": "Acme", "position": "Engineer", "status": "Accepted",
+              "date": "2025-01-08", "priority": "Medium", "required_skills": []},
+    )
+    auth_client.delete(f"/api/applications/{interviewing}")
+
+    analytics = auth_client.get("/api/analytics").json()
+    assert analytics["total"] == 2
+    assert [s["reached"] for s in analytics["funnel"]] == [2, 1, 1, 1, 1]
+    assert analytics["time_in_stage"] == []
+    assert analytics["weekly_volume"] == [{"week": "2025-01-06", "count": 2}]
+
+    db_cursor.execute("SELECT rebuild_pipeline_analytics()")
+    assert auth_client.get("/api/analytics").json() == analytics
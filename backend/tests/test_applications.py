@@ -0,0 +1,262 @@
+import csv
+import io
+import json
+from app.config import settings
+from app.models.applications import JobApplicationResponse
+
+
+def create_application(client, **overrides):
+    job = {
+        "company": "Acme",
+        "position": "Engineer",
+        "status": "Applied",
+        "date": "2025-01-01",
+        "priority": "Medium",
+        "required_skills": [],
+    }
+    job.update(overrides)
+    response = client.post("/api/applications", json=job)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_applications_keyset_pagination(auth_client):
+    """Following X-Next-Cursor walks every application exactly once, newest first"""
+    for day in range(1, 6):
+        create_application(auth_client, date=f"2025-01-0{day}")
+    # Two applications on the same date are ordered by id
+    create_application(auth_client, date="2025-01-05")
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = auth_client.get("/api/applications", params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 6
+    assert len({job["id"] for job in seen}) == 6
+    keys = [(job["date"], job["id"]) for job in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_applications_filters_and_sort(auth_client):
+    """Filters narrow the page and sort=date returns oldest first"""
+    create_application(auth_client, company="Tech Corp", status="Offer", date="2025-02-01")
+    create_application(auth_client, company="Other", status="Applied", date="2025-01-01")
+    create_application(auth_client, company="tech corp", status="Applied", date="2025-03-01")
+
+    response = auth_client.get("/api/applications", params={"company": "TECH CORP"})
+    assert [job["date"] for job in response.json()] == ["2025-03-01", "2025-02-01"]
+
+    response = auth_client.get("/api/applications", params={"status": "Offer"})
+    assert [job["company"] for job in response.json()] == ["Tech Corp"]
+
+    response = auth_client.get(
+        "/api/applications", params={"sort": "date", "date_from": "2025-01-15"}
+    )
+    assert [job["date"] for job in response.json()] == ["2025-02-01", "2025-03-01"]
+
+    response = auth_client.get("/api/applications", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_export_streams_applications_with_timelines(auth_client):
+    """NDJSON nests timeline entries per application; CSV has one line per entry"""
+    first = create_application(auth_client, company="First")
+    create_application(auth_client, company="Second")
+    auth_client.post(
+        f"/api/applications/{first['id']}/timeline",
+        json={"status": "Initial Screen", "application_id": first["id"], "notes": "call"},
+    )
+
+    response = auth_client.get("/api/applications/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["company"] for line in lines] == ["First", "Second"]
+    assert [entry["status"] for entry in lines[0]["timeline"]] == ["Applied", "Initial Screen"]
+
+    response = auth_client.get("/api/applications/export")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert rows[-1]["company"] == "Second"
+
+
+def test_bulk_import_reports_row_errors(auth_client):
+    """Valid rows are loaded with a timeline entry; invalid rows are reported"""
+    auth_client.put("/auth/skills", json={"skills": ["React", "AWS"]})
+    rows = [
+        {"company": "A", "position": "Dev", "status": "Applied", "date": "2025-01-01",
+         "priority": "High", "required_skills": ["React", "Go"]},
+        {"company": "B", "position": "Dev", "status": "Applied", "date": "not a date",
+         "priority": "High"},
+        {"company": "C", "position": "Dev", "status": "Applied", "date": "2025-01-02",
+         "priority": "Urgent"},
+    ]
+    response = auth_client.post("/api/applications/import", json=rows)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 1
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+
+    job = auth_client.get(f"/api/applications/{result['ids'][0]}").json()
+    assert job["job_application"]["matched_skills"] == ["React"]
+    assert [entry["status"] for entry in job["timeline"]] == ["Applied"]
+
+    csv_body = (
+        "company,position,status,date,priority,required_skills\n"
+        "D,Dev,Offer,2025-01-03,Low,AWS;Kubernetes\n"
+    )
+    response = auth_client.post(
+        "/api/applications/import",
+        content=csv_body,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.json()["imported"] == 1
+    response = auth_client.get("/api/applications", params={"company": "D"})
+    assert response.json()[0]["required_skills"] == ["AWS", "Kubernetes"]
+
+
+def test_bulk_import_for_missing_user(auth_client, db_cursor):
+    db_cursor.execute("DELETE FROM users WHERE email = %s", (auth_client.email,))
+    rows = [{"company": "A", "position": "Dev", "status": "Applied", "date": "2025-01-01",
+             "priority": "High"}]
+
+    response = auth_client.post("/api/applications/import", json=rows)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User not found"
+
+
+
+def test_bulk_import_rejects_oversized_bodies(auth_client, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 100)
+    rows = [{"company": "A" * 200, "position": "Dev", "status": "Applied",
+             "date": "2025-01-01", "priority": "High"}]
+
+    response = auth_client.post("/api/applications/import", json=rows)
+
+    assert response.status_code == 413
+
+def test_list_endpoints_answer_conditional_gets(auth_client):
+    """Unchanged lists revalidate with 304; any write changes the ETag"""
+    job = create_application(auth_client)
+    response = auth_client.get("/api/applications")
+    etag = response.headers["ETag"]
+
+    response = auth_client.get("/api/applications", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    # Different filters are different representations
+    response = auth_client.get(
+        "/api/applications", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    auth_client.post(
+        f"/api/applications/{job['id']}/timeline",
+        json={"status": "Offer", "application_id": job["id"]},
+    )
+    response = auth_client.get("/api/applications", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    response = auth_client.get("/api/contacts")
+    etag = response.headers["ETag"]
+    assert auth_client.get("/api/contacts", headers={"If-None-Match": etag}).status_code == 304
+    auth_client.post(
+        "/api/contacts",
+        json={"name": "A", "role": "Recruiter", "company": "Acme", "linkedin": "a"},
+    )
+    assert auth_client.get("/api/contacts", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_fast_path_matches_response_model(auth_client):
+    """Rows encoded straight from the page query look like validated responses"""
+    created = create_application(auth_client, required_skills=["python", "SQL"])
+
+    response = auth_client.get("/api/applications")
+    assert response.status_code == 200
+    [job] = response.json()
+    assert job == JobApplicationResponse(**job).model_dump(mode="json")
+    # Only the create response reports the skill extraction job
+    created.pop("skill_job_id")
+    assert job == created
+
+
+def test_single_statement_handlers(auth_client, max_queries):
+    """Item handlers cost one statement each and still 404 on missing rows"""
+    with max_queries(1):
+        job = create_application(auth_client, status="Applied")
+    job_id = job["id"]
+
+    with max_queries(1):
+        response = auth_client.get(f"/api/applications/{job_id}")
+    body = response.json()
+    assert body["job_application"]["id"] == job_id
+    assert [entry["status"] for entry in body["timeline"]] == ["Applied"]
+
+    with max_queries(1):
+        response = auth_client.put(
+            f"/api/applications/{job_id}",
+            json={**{k: job[k] for k in ("company", "position", "date", "priority")},
+                  "status": "Offer", "required_skills": []},
+        )
+    assert response.json()["status"] == "Offer"
+
+    with max_queries(1):
+        response = auth_client.post(
+            f"/api/applications/{job_id}/timeline",
+            json={"status": "Offer", "application_id": job_id},
+        )
+    entry_id = response.json()["id"]
+    with max_queries(1):
+        response = auth_client.delete(f"/api/applications/{job_id}/timeline/{entry_id}")
+    assert response.status_code == 200
+
+    with max_queries(1):
+        response = auth_client.delete(f"/api/applications/{job_id}")
+    assert response.status_code == 200
+    with max_queries(1):
+        assert auth_client.get(f"/api/applications/{job_id}").status_code == 404
+    with max_queries(1):
+        assert auth_client.delete(f"/api/applications/{job_id}").status_code == 404
+
+
+def test_applications_with_contacts_match_normalized_companies(auth_client):
+    """Contacts are linked across casing, punctuation and legal suffixes"""
+    acme = create_application(auth_client, company="Acme Robotics, Inc.")
+    create_application(auth_client, company="Acme Robotics", status="Rejected")
+    other = create_application(auth_client, company="Globex")
+    for name, company in (("Ann", "acme robotics"), ("Bob", "ACME Robotics LLC"), ("Cy", "Initech")):
+        auth_client.post("/api/contacts", json={
+            "name": name, "role": "Recruiter", "company": company,
+            "linkedin": f"https://linkedin.com/in/{name}",
+        })
+
+    response = auth_client.get("/api/applications/contacts")
+    assert response.status_code == 200
+    body = response.json()
+    assert [job["id"] for job in body] == [acme["id"]]
+    assert [contact["name"] for contact in body[0]["contacts"]] == ["Ann", "Bob"]
+
+    response = auth_client.get(
+        "/api/applications/contacts",
+        params={"include_closed": True, "only_with_contacts": False},
+    )
+    jobs = {job["company"]: job for job in response.json()}
+    assert len(jobs) == 3
+    assert jobs["Globex"]["id"] == other["id"] and jobs["Globex"]["contacts"] == []
+    assert len(jobs["Acme Robotics"]["contacts"]) == 2
+
+
+def test_single_application_omits_generated_columns(auth_client):
+    job = create_application(auth_client, company="Acme Robotics, Inc.")
+
+    body = auth_client.get(f"/api/applications/{job['id']}").json()
+
+    for column in ("company_key", "search_vector", "search_text"):
+        assert column not in body["job_application"]
+        assert all(column not in entry for entry in body["timeline"])
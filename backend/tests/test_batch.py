@@ -0,0 +1,101 @@
+def create_application(client, **overrides):
+    job = {"company": "Acme", "position": "Engineer", "status": "Applied",
+           "date": "2025-01-01", "priority": "Medium", "required_skills": [], **overrides}
+    response = client.post("/api/applications", json=job)
+    assert response.status_code == 200
+    return response.json()
+
+
+def move(job, status):
+    """The two operations a kanban card move makes"""
+    fields = {k: job[k] for k in ("company", "position", "date", "priority", "required_skills")}
+    return [
+        {"op": "update", "resource": "application", "id": job["id"],
+         "data": {**fields, "status": status}},
+        {"op": "create", "resource": "timeline", "application_id": job["id"],
+         "data": {"status": status}},
+    ]
+
+
+def test_batch_moves_share_statements(auth_client, max_queries):
+    """Consecutive updates and timeline inserts each run as one statement"""
+    jobs = [create_application(auth_client, company=f"Co {i}") for i in range(3)]
+    operations = [move(job, "Offer")[0] for job in jobs] + [move(job, "Offer")[1] for job in jobs]
+
+    with max_queries(2):
+        response = auth_client.post("/api/batch", json={"operations": operations})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"]
+    assert [result["status"] for result in body["results"]] == [200] * 6
+    assert body["results"][0]["result"]["status"] == "Offer"
+    timeline = auth_client.get(f"/api/applications/{jobs[0]['id']}/timeline").json()
+    assert [entry["status"] for entry in timeline] == ["Applied", "Offer"]
+
+
+def test_atomic_batch_rolls_back_on_failure(auth_client):
+    job = create_application(auth_client)
+    operations = move(job, "Offer") + [{"op": "delete", "resource": "contact", "id": 0}]
+
+    response = auth_client.post("/api/batch", json={"mode": "atomic", "operations": operations})
+
+    assert response.status_code == 404
+    body = response.json()
+    assert not body["committed"]
+    assert [result["status"] for result in body["results"]] == [424, 424, 404]
+    assert auth_client.get(f"/api/applications/{job['id']}").json()["job_application"]["status"] == "Applied"
+
+
+def test_best_effort_batch_keeps_successes(auth_client):
+    job = create_application(auth_client)
+    operations = [
+        # The second entry repeats a status, so the shared insert fails and
+        # the entries are retried one by one
+        {"op": "create", "resource": "timeline", "application_id": job["id"],
+         "data": {"status": "Initial Screen"}},
+        {"op": "create", "resource": "timeline", "application_id": job["id"],
+         "data": {"status": "Applied"}},
+        {"op": "update", "resource": "contact", "id": 1},
+    ]
+
+    response = auth_client.post("/api/batch", json={"mode": "best_effort", "operations": operations})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"]
+    assert [result["status"] for result in body["results"]] == [200, 409, 422]
+    timeline = auth_client.get(f"/api/applications/{job['id']}/timeline").json()
+    assert [entry["status"] for entry in timeline] == ["Applied", "Initial Screen"]
+
+
+def test_atomic_batch_names_the_failing_operation(auth_client):
+    """Only the operation that broke a shared statement gets its error"""
+    job = create_application(auth_client)
+    operations = [
+        {"op": "create", "resource": "timeline", "application_id": job["id"],
+         "data": {"status": "Initial Screen"}},
+        {"op": "create", "resource": "timeline", "application_id": job["id"],
+         "data": {"status": "Applied"}},
+    ]
+
+    response = auth_client.post("/api/batch", json={"mode": "atomic", "operations": operations})
+
+    assert response.status_code == 409
+    body = response.json()
+    assert not body["committed"]
+    assert [result["status"] for result in body["results"]] == [424, 409]
+    assert body["results"][0]["error"] == "Rolled back"
+
+
+def test_batch_create_for_missing_user(auth_client, db_cursor):
+    db_cursor.execute("DELETE FROM users WHERE email = %s", (auth_client.email,))
+    operations = [{"op": "create", "resource": "application", "data": {
+        "company": "Acme", "position": "Engineer", "status": "Applied",
+        "date": "2025-01-01", "priority": "Medium", "required_skills": [],
+    }}]
+
+    response = auth_client.post("/api/batch", json={"operations": operations})
+
+    assert response.status_code == 404
+    assert response.json()["results"][0]["error"] == "User not found"
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import uuid
+from app.utils.change_stream import RESYNC, ChangeStream
+
+
+def test_events_reach_only_the_users_subscribers(db_cursor):
+    """A committed change is delivered to the owner's streams and nobody else's"""
+    email = f"user_{uuid.uuid4().hex[:12]}@example.com"
+    db_cursor.execute(
+        "INSERT INTO users (username, email, password_hash) VALUES ('ada', %s, 'x')", (email,)
+    )
+
+    async def run():
+        stream = ChangeStream()
+        await stream.start()
+        try:
+            async with stream.subscribe(email) as mine, stream.subscribe("other@example.com") as other:
+                db_cursor.execute(
+                    "INSERT INTO network_contacts (user_email, name, role, company, linkedin) "
+                    "VALUES (%s, 'Ada', 'CTO', 'Acme', 'ada') RETURNING id",
+                    (email,),
+                )
+                contact_id = db_cursor.fetchone()[0]
+                event = await asyncio.wait_for(mine.get(), timeout=5)
+                assert other.empty()
+            assert stream.subscriber_count() == 0
+        finally:
+            await stream.stop()
+        return contact_id, event
+
+    contact_id, event = asyncio.run(run())
+    assert event == {"resource": "contact", "op": "insert", "ids": [contact_id], "count": 1}
+
+
+def test_slow_subscriber_gets_a_resync():
+    """Once a client's queue is full its backlog is replaced by one resync"""
+
+    async def run():
+        stream = ChangeStream(queue_size=2)
+        async with stream.subscribe("a@example.com") as queue:
+            for i in range(3):
+                stream._dispatch(json.dumps({
+                    "user": "a@example.com", "resource": "application",
+                    "op": "update", "ids": [i], "count": 1,
+                }))
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(run()) == [RESYNC]
+
+
+def test_shared_changes_reach_handlers(db_cursor):
+    """A change to reference data calls that resource's handlers in every worker"""
+
+    async def run():
+        stream = ChangeStream()
+        received = asyncio.Queue()
+        stream.add_handler("role_insights", received.put_nowait)
+        await stream.start()
+        try:
+            db_cursor.execute("UPDATE role_insights SET demand_trend = demand_trend")
+            return await asyncio.wait_for(received.get(), timeout=5)
+        finally:
+            await stream.stop()
+
+    assert asyncio.run(run()) == {"resource": "role_insights", "op": "update"}
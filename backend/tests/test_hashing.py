@@ -0,0 +1,26 @@
+import asyncio
+from app.utils import hashing
+from app.utils.hashing import (
+    calibrate_work_factor,
+    pwd_context,
+    verify_and_update_password,
+)
+
+
+def test_calibration_respects_floor_and_target():
+    """Calibration never goes below the configured floor"""
+    rounds = calibrate_work_factor(target_ms=0)
+    assert rounds == hashing.settings.HASH_MIN_ROUNDS
+    assert pwd_context.hash("secret").startswith(f"$2b${rounds:02d}$")
+
+
+def test_outdated_hash_is_upgraded_on_verify():
+    """Hashes below the calibrated cost are flagged for rehashing"""
+    calibrate_work_factor(target_ms=0)
+    old_hash = pwd_context.handler("bcrypt").using(rounds=4).hash("secret")
+
+    valid, new_hash = asyncio.run(verify_and_update_password("secret", old_hash))
+
+    assert valid
+    assert new_hash is not None
+    assert not pwd_context.needs_update(new_hash)
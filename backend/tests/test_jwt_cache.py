@@ -0,0 +1,27 @@
+import time
+from app.utils.jwt_manager import VerifiedTokenCache
+
+
+def test_cache_hits_and_lru_eviction():
+    """Repeat lookups hit the cache and the least recently used entry is evicted"""
+    cache = VerifiedTokenCache(maxsize=2)
+    expires_at = time.time() + 60
+    for token in ("a", "b"):
+        cache.put(cache.key(token), f"{token}@example.com", expires_at)
+
+    assert cache.get(cache.key("a")) == "a@example.com"
+    cache.put(cache.key("c"), "c@example.com", expires_at)
+
+    assert cache.get(cache.key("b")) is None
+    assert cache.get(cache.key("c")) == "c@example.com"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_drops_expired_tokens():
+    """Entries are not served past the token's exp"""
+    cache = VerifiedTokenCache(maxsize=10)
+    cache.put(cache.key("old"), "old@example.com", time.time() - 1)
+
+    assert cache.get(cache.key("old")) is None
+    assert cache.stats()["size"] == 0
@@ -41,3 +41,21 @@ def setup_test_env(monkeypatch):
     }
     for key, value in test_env_vars.items():
         monkeypatch.setenv(key, value)
+
+
+def test_get_timelines_unauthorized():
+    """Test that the timeline feed requires authentication"""
+    response = client.get("/api/timelines")
+    assert response.status_code == 401
+
+
+def test_get_db_pool_stats_unauthorized():
+    """Pool stats are only reported to signed-in users"""
+    response = client.get("/api/db/pool")
+    assert response.status_code == 401
+
+
+def test_get_metrics_unauthorized():
+    """Metrics expose the same pool and cache details, so they need sign-in too"""
+    response = client.get("/metrics")
+    assert response.status_code == 401
@@ -0,0 +1,71 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.queries.applications import GET_JOB_APPLICATION_BY_ID
+from app.utils.metrics import (
+    MetricsMiddleware,
+    db_query_duration_seconds,
+    db_query_errors_total,
+    db_query_rows_total,
+    http_requests_total,
+    query_name,
+    record_query,
+    render_cache_stats,
+    render_metrics,
+    reset_metrics,
+)
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+def test_requests_are_recorded_per_route_template():
+    reset_metrics()
+    client = make_client()
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/nope")
+    client.get("/missing")
+
+    assert http_requests_total.value("GET", "/items/{item_id}", "200") == 2
+    assert http_requests_total.value("GET", "/items/{item_id}", "422") == 1
+    assert http_requests_total.value("GET", "unmatched", "404") == 1
+
+
+def test_queries_are_recorded_by_constant_name():
+    reset_metrics()
+    assert query_name(GET_JOB_APPLICATION_BY_ID) == "GET_JOB_APPLICATION_BY_ID"
+    assert query_name("SELECT 1") == "other"
+
+    record_query(GET_JOB_APPLICATION_BY_ID, 0.002, rows=1)
+    record_query(GET_JOB_APPLICATION_BY_ID, 0.004, error=True)
+
+    assert db_query_duration_seconds.count("GET_JOB_APPLICATION_BY_ID") == 2
+    assert db_query_rows_total.value("GET_JOB_APPLICATION_BY_ID") == 1
+    assert db_query_errors_total.value("GET_JOB_APPLICATION_BY_ID") == 1
+    text = render_metrics()
+    assert "# TYPE db_query_duration_seconds histogram" in text
+    assert 'db_query_duration_seconds_bucket{query="GET_JOB_APPLICATION_BY_ID",le="+Inf"} 2' in text
+
+
+def test_cache_stats_are_rendered_as_gauges_and_counters():
+    text = render_cache_stats("token_cache", {"size": 3, "maxsize": 10, "hits": 7, "misses": 2})
+    assert "# TYPE token_cache_size gauge" in text
+    assert "token_cache_maxsize 10" in text
+    assert "# TYPE token_cache_hits_total counter" in text
+    assert "token_cache_hits_total 7" in text
+    assert "token_cache_misses_total 2" in text
+
+
+def test_metrics_endpoint_reports_token_cache(auth_client):
+    auth_client.get("/api/applications")
+    text = auth_client.get("/metrics").text
+    assert "token_cache_hits_total" in text
+    assert "token_cache_size" in text
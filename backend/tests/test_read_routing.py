@@ -0,0 +1,48 @@
+import time
+import pytest
+from app.config import settings
+from app.utils.read_routing import COOKIE_NAME, reads_from_replica
+
+
+@pytest.fixture
+def replica_settings(monkeypatch):
+    """Use the test database as its own replica; it is never behind"""
+    monkeypatch.setattr(settings, "REPLICA_URLS", [settings.DATABASE_URL])
+    # Only the check at startup, so pool request counts stay put
+    monkeypatch.setattr(settings, "REPLICA_CHECK_INTERVAL", 3600)
+
+
+def replica_requests(client) -> int:
+    deadline = time.monotonic() + 10
+    while True:
+        (replica,) = client.get("/api/db/pool").json()["replicas"]
+        if replica["healthy"] or time.monotonic() > deadline:
+            assert replica["healthy"]
+            return replica["requests"]
+        time.sleep(0.1)
+
+
+def test_reads_use_the_primary_only_after_a_write():
+    now = 1000.0
+    assert reads_from_replica("GET", "", now)
+    assert not reads_from_replica("POST", "", now)
+    assert not reads_from_replica("GET", f"{COOKIE_NAME}={now + 5}", now)
+    assert reads_from_replica("GET", f"{COOKIE_NAME}={now - 1}", now)
+
+
+def test_clients_read_their_own_writes(replica_settings, auth_client):
+    """GETs go to the replica until the client writes, then to the primary"""
+    auth_client.cookies.delete(COOKIE_NAME)
+    before = replica_requests(auth_client)
+    assert auth_client.get("/api/contacts").status_code == 200
+    assert replica_requests(auth_client) == before + 1
+
+    response = auth_client.post("/api/contacts", json={
+        "name": "Ada", "role": "CTO", "company": "Acme", "linkedin": "ada",
+    })
+    assert response.status_code == 200
+    assert COOKIE_NAME in response.headers["set-cookie"]
+
+    contacts = auth_client.get("/api/contacts").json()
+    assert [contact["name"] for contact in contacts] == ["Ada"]
+    assert replica_requests(auth_client) == before + 1
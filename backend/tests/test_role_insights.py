@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+from app.main import app, role_insights_cache
+
+
+def test_role_insights_revalidate_with_etag():
+    """A matching If-None-Match gets a 304 with the same caching headers"""
+    role_insights_cache.invalidate()
+    with TestClient(app) as client:
+        response = client.get("/api/role-insights")
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        assert "max-age" in response.headers["Cache-Control"]
+
+        response = client.get("/api/role-insights", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        response = client.get("/api/role-insights", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
@@ -0,0 +1,45 @@
+from app.routers.search import prefix_tsquery
+
+
+def test_prefix_tsquery_ignores_punctuation():
+    assert prefix_tsquery("FinTech: 'interview' & co!") == "fintech:* & interview:* & co:*"
+    assert prefix_tsquery("!?") == ""
+
+
+def test_search_ranks_across_records(auth_client):
+    """Prefixes and typos both match, across applications, notes and contacts"""
+    job = {"company": "FinTech Solutions", "position": "Backend Engineer", "status": "Applied",
+           "date": "2025-01-01", "priority": "High", "required_skills": []}
+    job_id = auth_client.post("/api/applications", json=job).json()["id"]
+    auth_client.post("/api/applications", json={**job, "company": "Design Co"})
+    auth_client.post(
+        f"/api/applications/{job_id}/timeline",
+        json={"status": "Technical Interview", "application_id": job_id,
+              "notes": "Fintech system design interview went well"},
+    )
+    auth_client.post("/api/contacts", json={
+        "name": "Dana Reyes", "role": "Recruiter", "company": "FinTech Solutions",
+        "linkedin": "https://linkedin.com/in/dana",
+    })
+
+    results = auth_client.get("/api/search", params={"q": "fintech"}).json()
+    assert {(r["kind"], r["title"]) for r in results} == {
+        ("application", "FinTech Solutions"),
+        ("timeline", "FinTech Solutions"),
+        ("contact", "Dana Reyes"),
+    }
+    ranks = [r["rank"] for r in results]
+    assert ranks == sorted(ranks, reverse=True)
+
+    results = auth_client.get("/api/search", params={"q": "fin intervi"}).json()
+    assert [r["kind"] for r in results] == ["timeline"]
+
+    results = auth_client.get("/api/search", params={"q": "fintehc", "kind": "application"}).json()
+    assert [r["id"] for r in results] == [job_id]
+
+    first = auth_client.get("/api/search", params={"q": "fintech", "limit": 2})
+    second = auth_client.get(
+        "/api/search", params={"q": "fintech", "cursor": first.headers["X-Next-Cursor"]}
+    )
+    assert len(first.json()) == 2 and len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
@@ -0,0 +1,64 @@
+import time
+from app.config import settings
+from app.utils.skill_extraction import extract_keywords
+
+
+def test_keyword_extractor_finds_vocabulary_skills():
+    """Aliases are canonicalized, and short spellings only count when capitalized"""
+    description = (
+        "Build services in Go with k8s and CI/CD. Experience with AWS/GCP, "
+        "Node.js and postgres is a plus. You will go far and learn a lot."
+    )
+    assert extract_keywords(description) == [
+        "Go", "Kubernetes", "CI/CD", "AWS", "GCP", "Node.js", "PostgreSQL"
+    ]
+
+
+def test_description_skills_are_extracted_in_the_background(auth_client):
+    """Creating an application queues a job that adds the description's skills"""
+    response = auth_client.post("/api/applications", json={
+        "company": "Acme", "position": "Engineer", "status": "Applied",
+        "date": "2025-01-01", "priority": "High", "required_skills": ["React"],
+        "job_description": "We use React, TypeScript and Docker on AWS.",
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["required_skills"] == ["React"]
+    skill_job_id = body["skill_job_id"]
+
+    deadline = time.monotonic() + 10
+    while True:
+        job = auth_client.get(f"/api/skill-jobs/{skill_job_id}").json()
+        if job["status"] == "succeeded" or time.monotonic() > deadline:
+            break
+        time.sleep(0.2)
+
+    assert job["status"] == "succeeded"
+    application = auth_client.get(f"/api/applications/{body['id']}").json()["job_application"]
+    assert application["required_skills"] == ["React", "TypeScript", "Docker", "AWS"]
+
+
+def test_job_that_keeps_killing_workers_is_failed(auth_client, db_cursor):
+    """An expired lease on the last attempt fails the job instead of reclaiming it"""
+    application = auth_client.post("/api/applications", json={
+        "company": "Acme", "position": "Engineer", "status": "Applied",
+        "date": "2025-01-01", "priority": "High", "required_skills": [],
+    }).json()
+    db_cursor.execute(
+        """INSERT INTO skill_extraction_jobs
+               (application_id, user_email, description, status, attempts, locked_at)
+           VALUES (%s, %s, 'Python', 'running', %s, NOW() - INTERVAL '1 day')
+           RETURNING id""",
+        (application["id"], auth_client.email, settings.SKILL_JOB_MAX_ATTEMPTS),
+    )
+    skill_job_id = db_cursor.fetchone()[0]
+
+    deadline = time.monotonic() + 10
+    while True:
+        job = auth_client.get(f"/api/skill-jobs/{skill_job_id}").json()
+        if job["status"] != "running" or time.monotonic() > deadline:
+            break
+        time.sleep(0.2)
+
+    assert job["status"] == "failed"
+    assert job["attempts"] == settings.SKILL_JOB_MAX_ATTEMPTS
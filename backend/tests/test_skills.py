@@ -0,0 +1,39 @@
+from app.utils.skills import match_skills, normalize_skills
+
+
+def test_skill_names_are_canonicalized():
+    """Case, punctuation and known aliases fold to one spelling"""
+    assert normalize_skills(["NodeJS", "node.js", "k8s", "  Some   Skill "]) == [
+        "Node.js",
+        "Kubernetes",
+        "Some Skill",
+    ]
+    assert match_skills(["react", "Nodejs"], ["React", "Node.js", "Go"]) == ["React", "Node.js"]
+
+
+def test_skill_change_recomputes_matched_skills(auth_client):
+    """Changing user skills updates matched_skills on affected applications only"""
+    auth_client.put("/auth/skills", json={"skills": ["React"]})
+    job = {"company": "A", "position": "Dev", "status": "Applied", "date": "2025-01-01",
+           "priority": "High", "required_skills": ["reactjs", "NodeJS"]}
+    first = auth_client.post("/api/applications", json=job).json()
+    job["required_skills"] = ["Go"]
+    second = auth_client.post("/api/applications", json=job).json()
+    assert first["required_skills"] == ["React", "Node.js"]
+    assert first["matched_skills"] == ["React"]
+
+    response = auth_client.put("/auth/skills", json={"skills": ["React", "node"]})
+    assert response.json()["skills"] == ["React", "Node.js"]
+    assert response.json()["applications_updated"] == 1
+
+    first = auth_client.get(f"/api/applications/{first['id']}").json()["job_application"]
+    assert first["matched_skills"] == ["React", "Node.js"]
+
+    # Client-supplied matched_skills are ignored on update
+    job["matched_skills"] = ["Go"]
+    updated = auth_client.put(f"/api/applications/{second['id']}", json=job).json()
+    assert updated["matched_skills"] == []
+
+    counts = {c["skill"]: c for c in auth_client.get("/api/skills").json()}
+    assert counts["React"] == {"skill": "React", "application_count": 1, "matched": True}
+    assert counts["Go"]["matched"] is False
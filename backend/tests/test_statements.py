@@ -0,0 +1,89 @@
+import asyncio
+from app.database import add_query_listener, close_pool, get_db_connection, open_pool, remove_query_listener
+from app.queries.applications import GET_JOB_APPLICATIONS_PAGE_DESC
+from app.queries.users import GET_USER_BY_EMAIL
+from app.utils.statements import find_statement, get_statements
+
+
+def test_copy_statements_are_registered_but_not_prepared():
+    preparable = {statement.name: statement.preparable for statement in get_statements()}
+    assert preparable["GET_USER_BY_EMAIL"]
+    assert not preparable["COPY_JOB_APPLICATIONS"]
+    assert not preparable["GET_JOB_APPLICATIONS_PAGE_DESC"]
+
+
+def test_handlers_only_send_registered_statements(auth_client):
+    """Every statement of a typical session comes from app/queries"""
+    sent = []
+    add_query_listener(sent.append)
+    try:
+        auth_client.put("/auth/skills", json={"skills": ["Python"]})
+        job = auth_client.post("/api/applications", json={
+            "company": "Acme", "position": "Engineer", "status": "Applied",
+            "date": "2025-01-01", "priority": "High", "required_skills": ["Python"],
+        }).json()
+        auth_client.get("/api/applications")
+        auth_client.get(f"/api/applications/{job['id']}")
+        auth_client.post(f"/api/applications/{job['id']}/timeline", json={
+            "application_id": job["id"], "status": "Interview", "notes": "Onsite",
+        })
+        contact = auth_client.post("/api/contacts", json={
+            "name": "Ada", "role": "CTO", "company": "Acme", "linkedin": "ada",
+        }).json()
+        auth_client.get("/api/contacts")
+        auth_client.delete(f"/api/contacts/{contact['id']}")
+        auth_client.get("/api/timelines")
+        auth_client.get("/api/search", params={"q": "acme"})
+        auth_client.get("/api/analytics")
+    finally:
+        remove_query_listener(sent.append)
+
+    assert sent
+    assert [query for query in sent if find_statement(query) is None] == []
+
+
+def test_registered_statements_are_prepared_once_per_connection():
+    async def run():
+        await open_pool()
+        try:
+            async with get_db_connection() as conn:
+                async with conn.cursor() as cur:
+                    for _ in range(2):
+                        await cur.execute(GET_USER_BY_EMAIL, ("nobody@example.com",))
+                    await cur.execute(
+                        "SELECT count(*) AS prepared FROM pg_prepared_statements "
+                        "WHERE statement = %s",
+                        (GET_USER_BY_EMAIL.replace("%s", "$1"),),
+                    )
+                    return (await cur.fetchone())["prepared"]
+        finally:
+            await close_pool()
+
+    assert asyncio.run(run()) == 1
+
+
+def test_replan_statements_are_never_prepared():
+    """Optional-filter page queries get a plan for the filters actually sent"""
+    params = {
+        "user_email": "nobody@example.com", "status": None, "priority": None,
+        "company": None, "date_from": None, "date_to": None,
+        "cursor_date": None, "cursor_id": None, "limit": 10,
+    }
+
+    async def run():
+        await open_pool()
+        try:
+            async with get_db_connection() as conn:
+                async with conn.cursor() as cur:
+                    # More runs than psycopg's automatic prepare threshold
+                    for _ in range(8):
+                        await cur.execute(GET_JOB_APPLICATIONS_PAGE_DESC, params)
+                    await cur.execute(
+                        "SELECT count(*) AS prepared FROM pg_prepared_statements "
+                        "WHERE statement LIKE '/* replan */%%'"
+                    )
+                    return (await cur.fetchone())["prepared"]
+        finally:
+            await close_pool()
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,30 @@
+def test_timeline_feed_is_scoped_paged_and_pollable(auth_client):
+    """The feed only shows the user's entries, pages back, and polls forward"""
+    job = {"company": "A", "position": "Dev", "status": "Applied", "date": "2025-01-01",
+           "priority": "High", "required_skills": []}
+    job_id = auth_client.post("/api/applications", json=job).json()["id"]
+    for status in ("Initial Screen", "Technical Interview"):
+        auth_client.post(
+            f"/api/applications/{job_id}/timeline",
+            json={"status": status, "application_id": job_id},
+        )
+
+    response = auth_client.get("/api/timelines", params={"limit": 2})
+    first_page = response.json()
+    assert [entry["status"] for entry in first_page] == ["Technical Interview", "Initial Screen"]
+    poll_cursor = response.headers["X-Poll-Cursor"]
+
+    response = auth_client.get(
+        "/api/timelines", params={"limit": 2, "before": response.headers["X-Next-Cursor"]}
+    )
+    assert [entry["status"] for entry in response.json()] == ["Applied"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = auth_client.get("/api/timelines", params={"since": poll_cursor})
+    assert response.json() == []
+    auth_client.post(
+        f"/api/applications/{job_id}/timeline",
+        json={"status": "Offer", "application_id": job_id},
+    )
+    response = auth_client.get("/api/timelines", params={"since": poll_cursor})
+    assert [entry["status"] for entry in response.json()] == ["Offer"]
@@ -39,6 +39,8 @@ import * as motion from "motion/react-client";
 
 // Application functionality
 import {
+  getApplications,
+  getTimelines,
   deleteApplication,
   createApplication,
   updateApplication,
@@ -127,36 +129,19 @@ function App() {
         //   ? { Authorization: `Bearer ${bearerToken}` }
         //   : {}
 
-        const [applicationsRes, timelinesRes, contactsRes] = await Promise.all([
-          fetch("http://localhost:8000/api/applications", {
-            method: "GET",
-            credentials: "include",
-          }),
-          fetch("http://localhost:8000/api/timelines", {
-            method: "GET",
-            credentials: "include",
-          }),
+        const [applicationsData, timelinesData, contactsRes] = await Promise.all([
+          getApplications(),
+          getTimelines(),
           fetch("http://localhost:8000/api/contacts", {
             method: "GET",
             credentials: "include",
           }),
         ]);
 
-        if (!applicationsRes.ok)
-          throw new Error(
-            `Applications fetch failed: ${applicationsRes.status}`,
-          );
-        if (!timelinesRes.ok)
-          throw new Error(`Timelines fetch failed: ${timelinesRes.status}`);
         if (!contactsRes.ok)
           throw new Error(`Contacts fetch failed: ${contactsRes.status}`);
 
-        const [applicationsData, timelinesData, contactsData] =
-          await Promise.all([
-            applicationsRes.json(),
-            timelinesRes.json(),
-            contactsRes.json(),
-          ]);
+        const contactsData = await contactsRes.json();
 
         setApplications(applicationsData);
         setTimelines(timelinesData);
@@ -1,14 +1,29 @@
 const BASE_URL = "http://localhost:8000/api";
 
 
-export const getApplications = async () => {
-    try {
-        const response = await fetch(`${BASE_URL}/applications`, {
+// List endpoints return one page at a time; follow X-Next-Cursor (sent back
+// as `cursorParam`) until the last page, which has no cursor
+const fetchAllPages = async (path, cursorParam, errorMessage) => {
+    const items = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({ limit: "500" });
+        if (cursor) params.set(cursorParam, cursor);
+        const response = await fetch(`${BASE_URL}${path}?${params}`, {
             method: "GET",
             credentials: "include"
         });
-        if (!response.ok) throw new Error("Failed to fetch applications");
-        return response.json();
+        if (!response.ok) throw new Error(`${errorMessage}: ${response.status}`);
+        items.push(...(await response.json()));
+        cursor = response.headers.get("X-Next-Cursor");
+    } while (cursor);
+    return items;
+};
+
+
+export const getApplications = async () => {
+    try {
+        return await fetchAllPages("/applications", "cursor", "Applications fetch failed");
     } catch (err) {
         console.error("Error fetching applications:", err.message);
         throw err;
@@ -16,6 +31,16 @@ export const getApplications = async () => {
 };
 
 
+export const getTimelines = async () => {
+    try {
+        return await fetchAllPages("/timelines", "before", "Timelines fetch failed");
+    } catch (err) {
+        console.error("Error fetching timelines:", err.message);
+        throw err;
+    }
+};
+
+
 export const getApplication = async (jobId) => {
     try {
         const response = await fetch(`${BASE_URL}/applications/${jobId}`, {
@@ -8,6 +8,15 @@ DROP TABLE IF EXISTS application_timeline CASCADE;
 DROP TABLE IF EXISTS network_contacts CASCADE;
 DROP TABLE IF EXISTS role_insights CASCADE;
 DROP TABLE IF EXISTS job_applications CASCADE;
+DROP TABLE IF EXISTS skill_application_counts CASCADE;
+DROP TABLE IF EXISTS user_data_versions CASCADE;
+DROP TABLE IF EXISTS pipeline_status_counts CASCADE;
+DROP TABLE IF EXISTS pipeline_weekly_volume CASCADE;
+DROP TABLE IF EXISTS pipeline_stage_reach CASCADE;
+DROP TABLE IF EXISTS pipeline_stage_durations CASCADE;
+DROP TABLE IF EXISTS application_pipeline CASCADE;
+DROP TABLE IF EXISTS ai_response_cache CASCADE;
+DROP TABLE IF EXISTS skill_extraction_jobs CASCADE;
 
 CREATE TABLE users (
             id SERIAL PRIMARY KEY,
@@ -65,12 +74,571 @@ CREATE TABLE role_insights (
     top_companies TEXT[]
 );
 
+-- OpenAI completions keyed by a hash of the model and normalized prompt, so
+-- identical prompts are answered once across workers and restarts
+CREATE TABLE ai_response_cache (
+    prompt_hash CHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    response TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Skill matching: mirrors app/utils/skills.py. Skills compare by key, with
+-- case and punctuation folded ("Node.js" = "NodeJS")
+CREATE OR REPLACE FUNCTION skill_key(skill TEXT) RETURNS TEXT AS $$
+    SELECT regexp_replace(lower(skill), '[^[:alnum:]+#]', '', 'g')
+$$ LANGUAGE SQL IMMUTABLE STRICT;
+
+CREATE OR REPLACE FUNCTION skill_keys(skills TEXT[]) RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(skill_key(s)), '{}') FROM unnest(skills) AS s
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- The required skills the user has, in the order they were required
+CREATE OR REPLACE FUNCTION match_skills(required TEXT[], skills TEXT[]) RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(r ORDER BY n), '{}')
+    FROM unnest(required) WITH ORDINALITY AS t(r, n)
+    WHERE skill_key(r) = ANY(skill_keys(skills))
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- Number of each user's applications requiring each skill, kept up to date by trigger
+CREATE TABLE skill_application_counts (
+    user_email VARCHAR(150) NOT NULL REFERENCES users(email) ON DELETE CASCADE,
+    skill_key TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    application_count INTEGER NOT NULL,
+    PRIMARY KEY (user_email, skill_key)
+);
+
+CREATE OR REPLACE FUNCTION maintain_skill_application_counts() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE skill_application_counts c
+        SET application_count = c.application_count - 1
+        FROM (SELECT DISTINCT skill_key(s) AS key FROM unnest(OLD.required_skills) AS s) old_skills
+        WHERE c.user_email = OLD.user_email AND c.skill_key = old_skills.key;
+
+        DELETE FROM skill_application_counts
+        WHERE user_email = OLD.user_email AND application_count <= 0;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO skill_application_counts (user_email, skill_key, skill, application_count)
+        SELECT NEW.user_email, skill_key(s), min(s), 1
+        FROM unnest(NEW.required_skills) AS s
+        WHERE skill_key(s) <> ''
+        GROUP BY skill_key(s)
+        ON CONFLICT (user_email, skill_key)
+        DO UPDATE SET application_count = skill_application_counts.application_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER skill_counts_on_insert_delete
+AFTER INSERT OR DELETE ON job_applications
+FOR EACH ROW EXECUTE FUNCTION maintain_skill_application_counts();
+
+CREATE TRIGGER skill_counts_on_update
+AFTER UPDATE OF required_skills, user_email ON job_applications
+FOR EACH ROW
+WHEN (OLD.required_skills IS DISTINCT FROM NEW.required_skills OR OLD.user_email <> NEW.user_email)
+EXECUTE FUNCTION maintain_skill_application_counts();
+
+-- Per-user data versions, bumped once per statement that changes a user's
+-- applications (including their timeline entries) or contacts. List
+-- endpoints derive their ETags from these, so every worker agrees on them.
+CREATE TABLE user_data_versions (
+    user_email VARCHAR(150) PRIMARY KEY REFERENCES users(email) ON DELETE CASCADE,
+    applications_version BIGINT NOT NULL DEFAULT 0,
+    contacts_version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_applications_version() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_data_versions (user_email, applications_version)
+    SELECT DISTINCT u.email, 1
+    FROM changed_rows c JOIN users u ON u.email = c.user_email
+    ON CONFLICT (user_email)
+    DO UPDATE SET applications_version = user_data_versions.applications_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_applications_version_for_timeline() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_data_versions (user_email, applications_version)
+    SELECT DISTINCT j.user_email, 1
+    FROM changed_rows c JOIN job_applications j ON j.id = c.application_id
+    ON CONFLICT (user_email)
+    DO UPDATE SET applications_version = user_data_versions.applications_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_contacts_version() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_data_versions (user_email, contacts_version)
+    SELECT DISTINCT u.email, 1
+    FROM changed_rows c JOIN users u ON u.email = c.user_email
+    ON CONFLICT (user_email)
+    DO UPDATE SET contacts_version = user_data_versions.contacts_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER applications_version_on_insert AFTER INSERT ON job_applications
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_applications_version();
+CREATE TRIGGER applications_version_on_update AFTER UPDATE ON job_applications
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_applications_version();
+CREATE TRIGGER applications_version_on_delete AFTER DELETE ON job_applications
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_applications_version();
+
+CREATE TRIGGER timeline_version_on_insert AFTER INSERT ON application_timeline
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_applications_version_for_timeline();
+CREATE TRIGGER timeline_version_on_update AFTER UPDATE ON application_timeline
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_applications_version_for_timeline();
+CREATE TRIGGER timeline_version_on_delete AFTER DELETE ON application_timeline
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_applications_version_for_timeline();
+
+CREATE TRIGGER contacts_version_on_insert AFTER INSERT ON network_contacts
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_contacts_version();
+CREATE TRIGGER contacts_version_on_update AFTER UPDATE ON network_contacts
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_contacts_version();
+CREATE TRIGGER contacts_version_on_delete AFTER DELETE ON network_contacts
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_contacts_version();
+
+-- Change events for connected clients. Each statement publishes one NOTIFY
+-- per affected user on the user_changes channel, delivered to every listener
+-- (every worker on every node) when the transaction commits. Payloads stay
+-- under the NOTIFY size limit by listing at most 100 ids.
+CREATE OR REPLACE FUNCTION publish_user_changes() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('user_changes', json_build_object(
+        'user', c.user_email,
+        'resource', TG_ARGV[0],
+        'op', lower(TG_OP),
+        'ids', (array_agg(c.id ORDER BY c.id))[1:100],
+        'count', count(*)
+    )::text)
+    FROM changed_rows c
+    GROUP BY c.user_email;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION publish_timeline_changes() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('user_changes', json_build_object(
+        'user', j.user_email,
+        'resource', 'timeline',
+        'op', lower(TG_OP),
+        'ids', (array_agg(c.id ORDER BY c.id))[1:100],
+        'application_ids', (array_agg(DISTINCT c.application_id))[1:100],
+        'count', count(*)
+    )::text)
+    FROM changed_rows c JOIN job_applications j ON j.id = c.application_id
+    GROUP BY j.user_email;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER applications_publish_on_insert AFTER INSERT ON job_applications
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_user_changes('application');
+CREATE TRIGGER applications_publish_on_update AFTER UPDATE ON job_applications
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_user_changes('application');
+CREATE TRIGGER applications_publish_on_delete AFTER DELETE ON job_applications
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_user_changes('application');
+
+CREATE TRIGGER timeline_publish_on_insert AFTER INSERT ON application_timeline
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_timeline_changes();
+CREATE TRIGGER timeline_publish_on_update AFTER UPDATE ON application_timeline
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_timeline_changes();
+CREATE TRIGGER timeline_publish_on_delete AFTER DELETE ON application_timeline
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_timeline_changes();
+
+CREATE TRIGGER contacts_publish_on_insert AFTER INSERT ON network_contacts
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_user_changes('contact');
+CREATE TRIGGER contacts_publish_on_update AFTER UPDATE ON network_contacts
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_user_changes('contact');
+CREATE TRIGGER contacts_publish_on_delete AFTER DELETE ON network_contacts
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION publish_user_changes('contact');
+
+-- Shared reference data belongs to no user: its events carry no 'user' key
+-- and tell every worker to drop its in-memory copy.
+CREATE OR REPLACE FUNCTION publish_shared_changes() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('user_changes', json_build_object(
+        'resource', TG_ARGV[0],
+        'op', lower(TG_OP)
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER role_insights_publish AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON role_insights
+FOR EACH STATEMENT EXECUTE FUNCTION publish_shared_changes('role_insights');
+
+-- Pipeline analytics, kept up to date incrementally so the analytics endpoint
+-- never scans a user's applications. Status counts and weekly volume are
+-- adjusted from each statement's transition tables. Stage reach and the
+-- time-in-stage histogram are derived per application: application_pipeline
+-- remembers what each application contributed, so when an application or its
+-- timeline changes only that application is taken back out and recomputed.
+CREATE TABLE pipeline_status_counts (
+    user_email VARCHAR(150) NOT NULL REFERENCES users(email) ON DELETE CASCADE,
+    status VARCHAR(50) NOT NULL,
+    application_count INTEGER NOT NULL,
+    PRIMARY KEY (user_email, status)
+);
+
+CREATE TABLE pipeline_weekly_volume (
+    user_email VARCHAR(150) NOT NULL REFERENCES users(email) ON DELETE CASCADE,
+    week DATE NOT NULL,  -- Monday of the week the application was made
+    application_count INTEGER NOT NULL,
+    PRIMARY KEY (user_email, week)
+);
+
+-- Number of applications whose furthest stage reached is `stage`
+CREATE TABLE pipeline_stage_reach (
+    user_email VARCHAR(150) NOT NULL REFERENCES users(email) ON DELETE CASCADE,
+    stage SMALLINT NOT NULL,
+    application_count INTEGER NOT NULL,
+    PRIMARY KEY (user_email, stage)
+);
+
+-- Histogram of whole hours spent in a status before the next timeline entry
+CREATE TABLE pipeline_stage_durations (
+    user_email VARCHAR(150) NOT NULL REFERENCES users(email) ON DELETE CASCADE,
+    status VARCHAR(50) NOT NULL,
+    hours INTEGER NOT NULL,
+    transitions INTEGER NOT NULL,
+    PRIMARY KEY (user_email, status, hours)
+);
+
+-- Each application's contribution to the two tables above. No foreign key to
+-- job_applications: the row must outlive a deleted application until the
+-- trigger has taken its contribution back out.
+CREATE TABLE application_pipeline (
+    application_id INTEGER PRIMARY KEY,
+    user_email VARCHAR(150) NOT NULL,
+    furthest_stage SMALLINT NOT NULL,
+    stage_statuses TEXT[] NOT NULL,
+    stage_hours INTEGER[] NOT NULL
+);
+
+-- Funnel position of a status: 1 Applied, 2 Screen, 3 Interview, 4 Offer,
+-- 5 Accepted. Outcomes such as Rejected or Withdrawn are not stages. Mirrors
+-- PIPELINE_STAGES in app/utils/analytics.py.
+CREATE OR REPLACE FUNCTION pipeline_stage(status TEXT) RETURNS SMALLINT AS $$
+    SELECT (CASE lower(trim(status))
+        WHEN 'applied' THEN 1
+        WHEN 'under review' THEN 2
+        WHEN 'initial screen' THEN 2
+        WHEN 'phone screen' THEN 2
+        WHEN 'interview' THEN 3
+        WHEN 'technical interview' THEN 3
+        WHEN 'final interview' THEN 3
+        WHEN 'offer' THEN 4
+        WHEN 'accepted' THEN 5
+    END)::SMALLINT
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION refresh_application_pipeline(app_ids INTEGER[]) RETURNS VOID AS $$
+DECLARE
+    previous_users TEXT[];
+BEGIN
+    IF cardinality(app_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Take back what these applications contributed until now (nothing yet
+    -- for new applications)
+    previous_users := ARRAY(
+        SELECT DISTINCT user_email FROM application_pipeline WHERE application_id = ANY(app_ids)
+    );
+    IF cardinality(previous_users) > 0 THEN
+        WITH old AS (
+            DELETE FROM application_pipeline WHERE application_id = ANY(app_ids)
+            RETURNING *
+        ), reach AS (
+            UPDATE pipeline_stage_reach r
+            SET application_count = r.application_count - o.applications
+            FROM (SELECT user_email, furthest_stage, count(*) AS applications FROM old GROUP BY 1, 2) o
+            WHERE r.user_email = o.user_email AND r.stage = o.furthest_stage
+        )
+        UPDATE pipeline_stage_durations d
+        SET transitions = d.transitions - o.transitions
+        FROM (
+            SELECT old.user_email, s.status, s.hours, count(*) AS transitions
+            FROM old CROSS JOIN LATERAL unnest(old.stage_statuses, old.stage_hours) AS s(status, hours)
+            GROUP BY 1, 2, 3
+        ) o
+        WHERE d.user_email = o.user_email AND d.status = o.status AND d.hours = o.hours;
+
+        DELETE FROM pipeline_stage_reach
+        WHERE user_email = ANY(previous_users) AND application_count <= 0;
+        DELETE FROM pipeline_stage_durations
+        WHERE user_email = ANY(previous_users) AND transitions <= 0;
+    END IF;
+
+    -- Recompute them from the current application and timeline rows
+    WITH fresh AS (
+        INSERT INTO application_pipeline (application_id, user_email, furthest_stage, stage_statuses, stage_hours)
+        SELECT j.id, j.user_email,
+               GREATEST(1, pipeline_stage(j.status), d.furthest_stage),
+               COALESCE(d.statuses, '{}'), COALESCE(d.hours, '{}')
+        FROM job_applications j
+        LEFT JOIN LATERAL (
+            SELECT max(pipeline_stage(e.status)) AS furthest_stage,
+                   array_agg(e.status ORDER BY e.date, e.id) FILTER (WHERE e.hours IS NOT NULL) AS statuses,
+                   array_agg(e.hours ORDER BY e.date, e.id) FILTER (WHERE e.hours IS NOT NULL) AS hours
+            FROM (
+                SELECT t.id, t.status, t.date,
+                       floor(extract(epoch FROM lead(t.date) OVER (ORDER BY t.date, t.id) - t.date) / 3600)::INTEGER AS hours
+                FROM application_timeline t
+                WHERE t.application_id = j.id
+            ) e
+        ) d ON true
+        WHERE j.id = ANY(app_ids)
+        RETURNING *
+    ), reach AS (
+        INSERT INTO pipeline_stage_reach (user_email, stage, application_count)
+        SELECT user_email, furthest_stage, count(*) FROM fresh GROUP BY 1, 2
+        ON CONFLICT (user_email, stage)
+        DO UPDATE SET application_count = pipeline_stage_reach.application_count + EXCLUDED.application_count
+    )
+    INSERT INTO pipeline_stage_durations (user_email, status, hours, transitions)
+    SELECT fresh.user_email, s.status, s.hours, count(*)
+    FROM fresh CROSS JOIN LATERAL unnest(fresh.stage_statuses, fresh.stage_hours) AS s(status, hours)
+    GROUP BY 1, 2, 3
+    ON CONFLICT (user_email, status, hours)
+    DO UPDATE SET transitions = pipeline_stage_durations.transitions + EXCLUDED.transitions;
+END;
+$$ LANGUAGE plpgsql
+-- The statements are the same for every call; without this the planner keeps
+-- choosing custom plans and re-plans them on each single-row change
+SET plan_cache_mode = force_generic_plan;
+
+CREATE OR REPLACE FUNCTION maintain_pipeline_analytics() RETURNS TRIGGER AS $$
+BEGIN
+    -- Most updates (e.g. skill recomputation) touch nothing aggregated here
+    IF TG_OP = 'UPDATE' THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.status, o.date, o.user_email) IS DISTINCT FROM (n.status, n.date, n.user_email)
+        ) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE pipeline_status_counts c
+        SET application_count = c.application_count - o.applications
+        FROM (SELECT user_email, status, count(*) AS applications FROM old_rows GROUP BY 1, 2) o
+        WHERE c.user_email = o.user_email AND c.status = o.status;
+
+        UPDATE pipeline_weekly_volume v
+        SET application_count = v.application_count - o.applications
+        FROM (
+            SELECT user_email, date_trunc('week', date::TIMESTAMP)::DATE AS week, count(*) AS applications
+            FROM old_rows GROUP BY 1, 2
+        ) o
+        WHERE v.user_email = o.user_email AND v.week = o.week;
+
+        DELETE FROM pipeline_status_counts
+        WHERE user_email IN (SELECT user_email FROM old_rows) AND application_count <= 0;
+        DELETE FROM pipeline_weekly_volume
+        WHERE user_email IN (SELECT user_email FROM old_rows) AND application_count <= 0;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO pipeline_status_counts (user_email, status, application_count)
+        SELECT user_email, status, count(*) FROM new_rows GROUP BY 1, 2
+        ON CONFLICT (user_email, status)
+        DO UPDATE SET application_count = pipeline_status_counts.application_count + EXCLUDED.application_count;
+
+        INSERT INTO pipeline_weekly_volume (user_email, week, application_count)
+        SELECT user_email, date_trunc('week', date::TIMESTAMP)::DATE, count(*) FROM new_rows GROUP BY 1, 2
+        ON CONFLICT (user_email, week)
+        DO UPDATE SET application_count = pipeline_weekly_volume.application_count + EXCLUDED.application_count;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_application_pipeline(ARRAY(SELECT id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_application_pipeline(ARRAY(SELECT id FROM old_rows));
+    ELSE
+        PERFORM refresh_application_pipeline(ARRAY(
+            SELECT n.id FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status OR n.user_email <> o.user_email
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_pipeline_analytics_for_timeline() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_application_pipeline(ARRAY(SELECT DISTINCT application_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_application_pipeline(ARRAY(SELECT DISTINCT application_id FROM old_rows));
+    ELSE
+        PERFORM refresh_application_pipeline(ARRAY(
+            SELECT application_id FROM new_rows UNION SELECT application_id FROM old_rows
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute every pipeline aggregate from scratch, e.g. after bulk loading
+-- with triggers disabled
+CREATE OR REPLACE FUNCTION rebuild_pipeline_analytics() RETURNS VOID AS $$
+BEGIN
+    TRUNCATE pipeline_status_counts, pipeline_weekly_volume, pipeline_stage_reach,
+             pipeline_stage_durations, application_pipeline;
+
+    INSERT INTO pipeline_status_counts (user_email, status, application_count)
+    SELECT user_email, status, count(*) FROM job_applications GROUP BY 1, 2;
+
+    INSERT INTO pipeline_weekly_volume (user_email, week, application_count)
+    SELECT user_email, date_trunc('week', date::TIMESTAMP)::DATE, count(*) FROM job_applications GROUP BY 1, 2;
+
+    PERFORM refresh_application_pipeline(ARRAY(SELECT id FROM job_applications));
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER pipeline_analytics_on_insert AFTER INSERT ON job_applications
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipeline_analytics();
+CREATE TRIGGER pipeline_analytics_on_update AFTER UPDATE ON job_applications
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipeline_analytics();
+CREATE TRIGGER pipeline_analytics_on_delete AFTER DELETE ON job_applications
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipeline_analytics();
+
+CREATE TRIGGER timeline_pipeline_analytics_on_insert AFTER INSERT ON application_timeline
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipeline_analytics_for_timeline();
+CREATE TRIGGER timeline_pipeline_analytics_on_update AFTER UPDATE ON application_timeline
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipeline_analytics_for_timeline();
+CREATE TRIGGER timeline_pipeline_analytics_on_delete AFTER DELETE ON application_timeline
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipeline_analytics_for_timeline();
+
+-- Company matching: a key that ignores case, punctuation and legal suffixes,
+-- so "Tech Corp", "tech corp." and "Tech Corp, Inc." are the same company.
+-- Stored on applications and contacts and indexed per user, so contacts at the
+-- companies a user applied to are found with one index join.
+CREATE OR REPLACE FUNCTION company_key(name TEXT) RETURNS TEXT AS $$
+    SELECT COALESCE(
+        NULLIF(replace(regexp_replace(
+            words,
+            '( (inc|incorporated|llc|ltd|limited|corp|corporation|co|company|gmbh|plc|ag|sa))+$',
+            ''
+        ), ' ', ''), ''),
+        replace(words, ' ', '')
+    )
+    FROM (SELECT trim(regexp_replace(lower(name), '[^[:alnum:]]+', ' ', 'g')) AS words) w
+$$ LANGUAGE SQL IMMUTABLE STRICT;
+
+ALTER TABLE job_applications
+    ADD COLUMN company_key TEXT GENERATED ALWAYS AS (company_key(company)) STORED;
+ALTER TABLE network_contacts
+    ADD COLUMN company_key TEXT GENERATED ALWAYS AS (company_key(company)) STORED;
+
+CREATE INDEX idx_applications_user_company_key ON job_applications(user_email, company_key);
+CREATE INDEX idx_contacts_user_company_key ON network_contacts(user_email, company_key);
+
+-- Search. Each searchable table has a generated tsvector for word and prefix
+-- matches and a generated lower-cased text for typo-tolerant trigram matches.
+-- btree_gin lets each GIN index lead with user_email, so a search only reads
+-- the user's own entries.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+ALTER TABLE job_applications
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', company), 'A') ||
+        setweight(to_tsvector('simple', position), 'B')
+    ) STORED,
+    ADD COLUMN search_text TEXT GENERATED ALWAYS AS (lower(company || ' ' || position)) STORED;
+
+ALTER TABLE application_timeline
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(notes, ''))
+    ) STORED,
+    ADD COLUMN search_text TEXT GENERATED ALWAYS AS (lower(coalesce(notes, ''))) STORED;
+
+ALTER TABLE network_contacts
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', name), 'A') ||
+        setweight(to_tsvector('simple', company), 'B') ||
+        setweight(to_tsvector('simple', role), 'C')
+    ) STORED,
+    ADD COLUMN search_text TEXT GENERATED ALWAYS AS (lower(name || ' ' || company || ' ' || role)) STORED;
+
+CREATE INDEX idx_applications_search ON job_applications USING gin (user_email, search_vector);
+CREATE INDEX idx_applications_search_trgm ON job_applications USING gin (user_email, search_text gin_trgm_ops);
+CREATE INDEX idx_timeline_search ON application_timeline USING gin (search_vector);
+CREATE INDEX idx_timeline_search_trgm ON application_timeline USING gin (search_text gin_trgm_ops);
+CREATE INDEX idx_contacts_search ON network_contacts USING gin (user_email, search_vector);
+CREATE INDEX idx_contacts_search_trgm ON network_contacts USING gin (user_email, search_text gin_trgm_ops);
+
 -- Create index on commonly queried fields
 CREATE INDEX idx_applications_date ON job_applications(date DESC);
 CREATE INDEX idx_applications_status ON job_applications(status);
-CREATE INDEX idx_timeline_application_id ON application_timeline(application_id);
+CREATE INDEX idx_timeline_application_date ON application_timeline(application_id, date DESC, id DESC) INCLUDE (status);
 CREATE INDEX idx_timeline_date ON application_timeline(date DESC);
 
+-- Background extraction of required skills from pasted job descriptions.
+-- Workers claim due jobs with FOR UPDATE SKIP LOCKED; a running job whose
+-- lease has expired (its worker died) is claimed again.
+CREATE TABLE skill_extraction_jobs (
+    id SERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL REFERENCES job_applications(id) ON DELETE CASCADE,
+    user_email VARCHAR(150) NOT NULL REFERENCES users(email) ON DELETE CASCADE,
+    description TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP,
+    last_error TEXT,
+    extracted_skills TEXT[],
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX idx_skill_jobs_due ON skill_extraction_jobs(run_at, id) WHERE status = 'queued';
+CREATE INDEX idx_skill_jobs_running ON skill_extraction_jobs(locked_at) WHERE status = 'running';
+CREATE INDEX idx_skill_jobs_application ON skill_extraction_jobs(application_id);
+
+-- Per-user keyset pagination and filtering of applications
+CREATE INDEX idx_applications_user_date ON job_applications(user_email, date DESC, id DESC);
+CREATE INDEX idx_applications_user_status_date ON job_applications(user_email, status, date DESC, id DESC);
+CREATE INDEX idx_applications_user_priority_date ON job_applications(user_email, priority, date DESC, id DESC);
+CREATE INDEX idx_applications_user_company ON job_applications(user_email, lower(company));
+
 -- Insert a test user (for linking existing data)
 INSERT INTO users (username, email, password_hash, skills)
 VALUES ('Test User', 'test_user@example.com', '$2b$12$A6IW8NkCVAuobcGMEOeXeOBm.t4MR0lH.GR5tvkz72NG3VOg4mV0W', ARRAY['React', 'TypeScript', 'AWS'])
@@ -0,0 +1,5 @@
+#!/bin/sh
+# Let the read replica (db-replica in docker-compose.yml) stream WAL from this
+# server. Runs once, when the primary's data directory is initialized.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"